@@ -0,0 +1,277 @@
+"""
+Booking archive and database maintenance
+
+Created 10/18/2026
+Created for CSI2999 Polyrhythm Skate semester project to keep the live Booking table, and every index the month
+queries and the conflict check walk, down to recent and future bookings. Past bookings are moved into one archive
+database file per year next to SkateDB.db, where app/S2_lib.py still finds them when an old month is read.
+
+Relevant online documentation:
+https://www.sqlite.org/lang_analyze.html
+https://www.sqlite.org/pragma.html#pragma_incremental_vacuum
+https://www.sqlite.org/wal.html
+
+Change Log:
+10/18/2026: Initial Version
+10/18/2026: Archived bookings keep their resource, archive files from before are given the column on first open
+10/18/2026: A batch never replaces an archived booking of another user or slot, the newest booking is archived too
+
+Future Task List:
+-
+
+Usage:
+python Archive.py [--db SkateDB.db] [--days 365] [--batch 500] [--pause 0.05] [--vacuum-pages 512]
+python Archive.py --enable-incremental-vacuum
+
+Bookings that ended more than --days ago (never fewer than MIN_AGE_DAYS) are copied to SkateDB.archive-<year>.db,
+by start year, and deleted from Booking in batches of --batch, each in its own short write transaction with
+--pause seconds between them, so the site keeps booking while it runs. It can be stopped and rerun at any time:
+a batch is copied before it is deleted, and a row edited in between is left for the next batch. Booking ids are
+never reused (DBSchema.py migration 10), so an archived id that holds a booking with another user or start is
+one handed out twice before that, the booking is left live and counted in kept instead of replacing it. Afterwards Booking is re-analyzed and, once --enable-incremental-vacuum has converted the file (a single
+full VACUUM, run it at a quiet time), the freed pages are returned --vacuum-pages at a time.
+
+Archived bookings are read only, /save/ and /delete/ only change the live table. Conflict checks for past slots
+also look in the archive. With BOOKING_SHARDS on (config.py) run it once more per resource file, e.g.
+--db SkateDB.resource-2.db, each one archives into its own yearly files.
+"""
+
+import argparse, datetime, os, sys, time
+import DBConnection, DBSchema
+
+MIN_AGE_DAYS = 30  # reads of ranges starting later than this many days ago never look in the archive
+COLUMNS = '`id`, `start`, `end`, `text`, `color`, `bg`, `user_id`, `revision`, `resource`'
+ARCHIVE_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS Booking
+        (id INTEGER PRIMARY KEY, start DATETIME NOT NULL, end DATETIME NOT NULL, text TEXT NOT NULL, color TEXT NOT NULL,
+        bg TEXT NOT NULL, user_id INTEGER NOT NULL, revision INTEGER NOT NULL DEFAULT 0, resource INTEGER NOT NULL DEFAULT 1);''',
+    'CREATE INDEX IF NOT EXISTS idx_spanBook ON Booking (end, start);',
+    'CREATE INDEX IF NOT EXISTS idx_userSpanBook ON Booking (user_id, end, start);',
+)
+_opened = set()
+
+
+def archivePath(dbPath, year):
+    root, extension = os.path.splitext(dbPath)
+    return f'{root}.archive-{year}{extension or ".db"}'
+
+
+def horizon():
+    """
+    :return: booking string before which ranges may have archived bookings
+    """
+    return (datetime.datetime.now() - datetime.timedelta(days=MIN_AGE_DAYS)).strftime('%Y-%m-%d %H:%M')
+
+
+def yearsFor(cursor, start, end):
+    """
+    :param cursor: cursor on the live database
+    :return: archive years holding bookings that may overlap [start, end), [] for recent ranges without a query
+    """
+    if start >= horizon():
+        return []
+    return [row[0] for row in cursor.execute('SELECT year FROM ArchiveYear WHERE lastEnd > ? AND firstStart < ? ORDER BY year;', (start, end))]
+
+
+# (A) READS
+def rows(dbPath, cursor, userID, start, end, skip=(), resource=None):
+    """
+    Archived bookings of userID overlapping [start, end)
+    :param skip: ids already read from the live table, a batch being archived is briefly in both
+    :param resource: only bookings of this resource, None for all
+    :return: [id, start, end, text, color, bg] rows
+    """
+    found = []
+    for year in yearsFor(cursor, start, end):
+        sql, parameters = 'SELECT `id`, `start`, `end`, `text`, `color`, `bg` FROM `Booking` WHERE `user_id` = ? AND `end` > ? AND `start` < ?', (userID, start, end)
+        if resource is not None:
+            sql, parameters = sql + ' AND `resource` = ?', parameters + (resource,)
+        found += [list(row) for row in openArchive(dbPath, year).execute(sql, parameters) if row[0] not in skip]
+    return found
+
+
+def busy(dbPath, cursor, start, end, resource=1):
+    """
+    :return: (start, end) of every archived booking of resource overlapping [start, end)
+    """
+    return [row for year in yearsFor(cursor, start, end) for row in openArchive(dbPath, year).execute(
+        'SELECT `start`, `end` FROM `Booking` WHERE `resource` = ? AND `end` > ? AND `start` < ?', (resource, start, end))]
+
+
+def hasConflict(dbPath, cursor, start, end, ignoreID=None, resource=1):
+    """
+    True if [start, end) overlaps an archived booking of resource other than ignoreID
+    """
+    ignoreID = None if ignoreID is None else int(ignoreID)
+    return any(openArchive(dbPath, year).execute(
+        'SELECT EXISTS (SELECT 1 FROM `Booking` WHERE `resource` = ? AND `end` > ? AND `start` < ? AND `id` IS NOT ?)',
+        (resource, start, end, ignoreID)).fetchone()[0]
+        for year in yearsFor(cursor, start, end))
+
+
+# (B) ARCHIVING
+def openArchive(dbPath, year):
+    """
+    Connection to the archive file of year, created or brought up to date the first time this process opens it
+    """
+    path = archivePath(dbPath, year)
+    connection = DBConnection.getConnection(path)
+    if path not in _opened:
+        for statement in ARCHIVE_SCHEMA:
+            connection.execute(statement)
+        if 'resource' not in [column[1] for column in connection.execute('PRAGMA table_info(Booking);')]:
+            connection.execute('ALTER TABLE Booking ADD COLUMN resource INTEGER NOT NULL DEFAULT 1;')
+        _opened.add(path)
+    return connection
+
+
+def archiveBatch(dbPath, cutoff, batchSize, kept=None):
+    """
+    Move one batch of bookings that ended at or before cutoff
+    :param kept: set of ids left live because their archive already holds another booking under that id, skipped
+                 and added to
+    :return: number of bookings moved, None when none are left
+    """
+    kept = set() if kept is None else kept
+    live = DBConnection.getConnection(dbPath)
+    skip = f' AND `id` NOT IN ({",".join("?" * len(kept))})' if kept else ''
+    batch = live.execute(f'SELECT {COLUMNS} FROM `Booking` WHERE `end` <= ?{skip} ORDER BY `end` LIMIT ?;',
+                         (cutoff,) + tuple(kept) + (batchSize,)).fetchall()
+    if not batch:
+        return None
+    byYear = {}
+    for row in batch:
+        byYear.setdefault(int(row[1][:4]), []).append(row)
+
+    # copy first, a crash before the delete below leaves rows in both places, which readers skip and a rerun repeats.
+    # a rerun only refreshes its own copy, the same id with another user or start is another booking
+    for year, group in byYear.items():
+        archive = openArchive(dbPath, year)
+        archive.execute('BEGIN IMMEDIATE;')
+        try:
+            for row in group:
+                if not archive.execute(f'''INSERT INTO `Booking` ({COLUMNS}) VALUES (?,?,?,?,?,?,?,?,?)
+                                           ON CONFLICT (`id`) DO UPDATE SET `end` = excluded.`end`, `text` = excluded.`text`, `color` = excluded.`color`,
+                                           `bg` = excluded.`bg`, `revision` = excluded.`revision`, `resource` = excluded.`resource`
+                                           WHERE `user_id` = excluded.`user_id` AND `start` = excluded.`start`;''', row).rowcount:
+                    kept.add(row[0])
+            archive.execute('COMMIT;')
+        except Exception:
+            if archive.in_transaction:
+                archive.execute('ROLLBACK;')
+            raise
+        byYear[year] = [row for row in group if row[0] not in kept]
+    byYear = {year: group for year, group in byYear.items() if group}
+
+    live.execute('BEGIN IMMEDIATE;')
+    try:
+        for year, group in byYear.items():
+            live.execute('''INSERT INTO ArchiveYear (year, firstStart, lastEnd, rows) VALUES (?, ?, ?, 0)
+                            ON CONFLICT (year) DO UPDATE SET firstStart = min(firstStart, excluded.firstStart), lastEnd = max(lastEnd, excluded.lastEnd);''',
+                         (year, min(row[1] for row in group), max(row[2] for row in group)))
+        # a booking saved since it was copied has a new revision and stays live
+        moved, stale = 0, {}
+        for year, group in byYear.items():
+            deleted = 0
+            for row in group:
+                if live.execute('DELETE FROM `Booking` WHERE `id` = ? AND `revision` = ?;', (row[0], row[7])).rowcount:
+                    deleted += 1
+                else:
+                    stale.setdefault(year, []).append((row[0], row[7]))
+            live.execute('UPDATE ArchiveYear SET rows = rows + ? WHERE year = ?;', (deleted, year))
+            moved += deleted
+        live.execute('COMMIT;')
+    except Exception:
+        if live.in_transaction:
+            live.execute('ROLLBACK;')
+        raise
+
+    # its old copy would still show in the month it was moved out of
+    for year, keys in stale.items():
+        DBConnection.getConnection(archivePath(dbPath, year)).executemany('DELETE FROM `Booking` WHERE `id` = ? AND `revision` = ?;', keys)
+    return moved
+
+
+def archive(dbPath, days=365, batchSize=500, pause=0.05, kept=None):
+    """
+    :param kept: set the ids of bookings left live are added to, see archiveBatch
+    :return: number of bookings moved
+    """
+    DBSchema.ensureSchema(dbPath)
+    cutoff = (datetime.datetime.now() - datetime.timedelta(days=max(days, MIN_AGE_DAYS))).strftime('%Y-%m-%d %H:%M')
+    kept = set() if kept is None else kept
+    moved = 0
+    while True:
+        count = archiveBatch(dbPath, cutoff, batchSize, kept)
+        if count is None:
+            return moved
+        moved += count
+        time.sleep(pause)
+
+
+# (C) MAINTENANCE
+def analyze(dbPath):
+    # analysis_limit keeps ANALYZE to a sample of each index instead of a full scan
+    connection = DBConnection.getConnection(dbPath)
+    connection.execute('PRAGMA analysis_limit=1000;')
+    connection.execute('ANALYZE Booking;')
+
+
+def incrementalVacuum(dbPath, pages=512, pause=0.05):
+    """
+    Return free pages to the file system a few at a time, needs auto_vacuum=INCREMENTAL
+    :return: pages freed, None if the file is not in incremental mode
+    """
+    connection = DBConnection.getConnection(dbPath)
+    if connection.execute('PRAGMA auto_vacuum;').fetchone()[0] != 2:
+        return None
+    freed = 0
+    while True:
+        free = connection.execute('PRAGMA freelist_count;').fetchone()[0]
+        if free == 0:
+            return freed
+        connection.execute(f'PRAGMA incremental_vacuum({min(pages, free)});').fetchall()
+        freed += min(pages, free)
+        time.sleep(pause)
+
+
+def enableIncrementalVacuum(dbPath):
+    """
+    One full VACUUM that switches the file to auto_vacuum=INCREMENTAL, it holds the write lock for the whole rewrite
+    """
+    connection = DBConnection.getConnection(dbPath)
+    connection.execute('PRAGMA auto_vacuum=INCREMENTAL;')
+    connection.execute('VACUUM;')
+
+
+def maintain(dbPath, days=365, batchSize=500, pause=0.05, vacuumPages=512):
+    """
+    :return: dict with moved, kept (ids left live, see archiveBatch), freed (None when incremental vacuum is off)
+    """
+    kept = set()
+    moved = archive(dbPath, days, batchSize, pause, kept)
+    if moved:
+        analyze(dbPath)
+    return {'moved': moved, 'kept': sorted(kept), 'freed': incrementalVacuum(dbPath, vacuumPages, pause)}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Archive past bookings and maintain SkateDB.db')
+    parser.add_argument('--db', default='SkateDB.db')
+    parser.add_argument('--days', type=int, default=365, help=f'archive bookings that ended this many days ago, at least {MIN_AGE_DAYS}')
+    parser.add_argument('--batch', type=int, default=500)
+    parser.add_argument('--pause', type=float, default=0.05, help='seconds between batches')
+    parser.add_argument('--vacuum-pages', type=int, default=512)
+    parser.add_argument('--enable-incremental-vacuum', action='store_true', help='convert the file once with a full VACUUM')
+    args = parser.parse_args()
+    if not os.path.isfile(args.db):
+        sys.exit(f'{args.db} not found')
+    if args.enable_incremental_vacuum:
+        enableIncrementalVacuum(args.db)
+        print('auto_vacuum is now INCREMENTAL')
+        sys.exit()
+    result = maintain(args.db, args.days, args.batch, args.pause, args.vacuum_pages)
+    freed = 'incremental vacuum is off, see --enable-incremental-vacuum' if result['freed'] is None else f'freed {result["freed"]} pages'
+    print(f'archived {result["moved"]} bookings, {freed}')
+    if result['kept']:
+        print(f'left live, their id is archived for another booking: {", ".join(map(str, result["kept"]))}')
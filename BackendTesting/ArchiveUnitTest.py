@@ -0,0 +1,148 @@
+"""
+Booking archive unit testing
+
+Created for CSI2999 Polyrhythm Skate semester project to test that Archive.py moves past bookings out of the live
+Booking table without them disappearing from calendars or conflict checks
+
+Relevant online documentation:
+https://www.sqlite.org/lang_analyze.html
+
+Change Log:
+10/18/2026: Initial Version
+10/18/2026: Booking ids are not reused after archiving, an archived booking is never replaced by another one
+
+Future Task List:
+-
+"""
+import datetime
+import glob
+import unittest
+
+import Archive
+import DBConnection
+import DBSchema
+from app import S2_lib as evt
+from BackendHelper import createBookingDatabase, removeDatabase
+
+
+class ArchiveUnitTesting(unittest.TestCase):
+    def setUp(self):
+        self.dbPath = createBookingDatabase()
+        self.oldPath = evt.DBFILE
+        evt.DBFILE = self.dbPath
+        evt.conflicts.reset(useIndex=False)
+        for start, end, user in (('2022-12-31 22:00', '2023-01-01 02:00', 1), ('2023-06-05 10:00', '2023-06-05 11:00', 1),
+                                 ('2023-06-05 12:00', '2023-06-05 13:00', 2)):
+            evt.save(start, end, 'Rink A', '#FFFFFF', '#3b39af', user)
+        # a future booking always stays live
+        upcoming = (datetime.datetime.now() + datetime.timedelta(days=7)).strftime('%Y-%m-%d %H:%M')
+        evt.save(upcoming, upcoming[:11] + '23:59', 'Rink A', '#FFFFFF', '#3b39af', 1)
+
+    def tearDown(self):
+        evt.DBFILE = self.oldPath
+        DBConnection.closeConnections()
+        for path in glob.glob(Archive.archivePath(self.dbPath, '*')):
+            removeDatabase(path)
+        removeDatabase(self.dbPath)
+
+    def live(self):
+        return DBConnection.getConnection(self.dbPath).execute('SELECT count(*) FROM Booking').fetchone()[0]
+
+    def testReadsRouteToArchive(self):
+        before = (evt.get(6, 2023, 1), evt.getColumns(6, 2023, 1), evt.getRange('2022-12-01 00:00', '2023-07-01 00:00', 1))
+        unittest.TestCase.assertEqual(self, first=Archive.maintain(self.dbPath, batchSize=2, pause=0)['moved'], second=3)
+        unittest.TestCase.assertEqual(self, first=self.live(), second=1)
+        unittest.TestCase.assertEqual(self, first=sorted(row[0] for row in DBConnection.getConnection(self.dbPath).execute('SELECT year, rows FROM ArchiveYear')),
+                                      second=[2022, 2023])
+
+        unittest.TestCase.assertEqual(self, first=evt.get(6, 2023, 1), second=before[0])
+        unittest.TestCase.assertEqual(self, first=evt.getColumns(6, 2023, 1), second=before[1])
+        unittest.TestCase.assertCountEqual(self, first=evt.getRange('2022-12-01 00:00', '2023-07-01 00:00', 1)[0], second=before[2][0])
+        # a booking crossing new year is archived by its start year and still shows in January
+        unittest.TestCase.assertEqual(self, first=len(evt.get(1, 2023, 1)), second=1)
+        unittest.TestCase.assertIsNone(self, obj=evt.get(6, 2023, 3))
+
+        # archived slots are still taken
+        unittest.TestCase.assertFalse(self, expr=evt.save('2023-06-05 10:30', '2023-06-05 12:30', 'Rink A', '#FFFFFF', '#3b39af', 3), msg='Booked over an archived booking')
+        unittest.TestCase.assertTrue(self, expr=evt.save('2023-06-05 11:00', '2023-06-05 12:00', 'Rink A', '#FFFFFF', '#3b39af', 3), msg='Failed to book between archived bookings')
+
+        # a rerun moves only the new booking and keeps one copy of each booking
+        unittest.TestCase.assertEqual(self, first=Archive.archive(self.dbPath, pause=0), second=1)
+        unittest.TestCase.assertEqual(self, first=len(evt.get(6, 2023, 1)) + len(evt.get(6, 2023, 2)) + len(evt.get(6, 2023, 3)), second=3)
+
+    def testEditedBookingStaysLive(self):
+        live = DBConnection.getConnection(self.dbPath)
+        bookingID = live.execute("SELECT id FROM Booking WHERE start = '2023-06-05 10:00'").fetchone()[0]
+        # simulate a save landing between the copy and the delete
+        copy = Archive.openArchive
+
+        def editAfterCopy(dbPath, year):
+            connection = copy(dbPath, year)
+            if year == 2023:
+                Archive.openArchive = copy
+                evt.save('2025-03-01 10:00', '2025-03-01 11:00', 'Moved', '#FFFFFF', '#3b39af', 1, bookingID)
+            return connection
+        Archive.openArchive = editAfterCopy
+        try:
+            Archive.archiveBatch(self.dbPath, '2024-01-01 00:00', 10)
+        finally:
+            Archive.openArchive = copy
+        unittest.TestCase.assertEqual(self, first=live.execute('SELECT start FROM Booking WHERE id = ?', (bookingID,)).fetchone()[0], second='2025-03-01 10:00')
+        unittest.TestCase.assertNotIn(self, member=bookingID, container=evt.get(6, 2023, 1) or {}, msg='Stale archived copy shown')
+
+    def testIdsNeverReused(self):
+        live = DBConnection.getConnection(self.dbPath)
+        newest = live.execute('SELECT max(id) FROM Booking').fetchone()[0]
+        unittest.TestCase.assertEqual(self, first=Archive.archive(self.dbPath, pause=0), second=3)
+        evt.delete(newest)
+        for day in ('2023-06-06', '2023-06-07'):
+            evt.save(f'{day} 10:00', f'{day} 11:00', 'Rink A', '#FFFFFF', '#3b39af', 2)
+        unittest.TestCase.assertEqual(self, first=[row[0] for row in live.execute('SELECT id FROM Booking ORDER BY id')], second=[newest + 1, newest + 2])
+        result = Archive.maintain(self.dbPath, pause=0)
+        unittest.TestCase.assertEqual(self, first=(result['moved'], result['kept']), second=(2, []))
+        unittest.TestCase.assertEqual(self, first=len(evt.get(6, 2023, 1)), second=1, msg='Archived booking of user 1 replaced')
+        unittest.TestCase.assertEqual(self, first=len(evt.get(1, 2023, 1)), second=1)
+        unittest.TestCase.assertEqual(self, first=len(evt.get(6, 2023, 2)), second=3)
+
+    def testMigratedIdsNeverReused(self):
+        oldPath = createBookingDatabase(version=9)
+        try:
+            connection = DBConnection.openConnection(oldPath)
+            connection.execute("INSERT INTO Booking (id, start, end, text, color, bg, user_id) VALUES (2, '2023-06-05 10:00', '2023-06-05 11:00', 'Rink A', '#FFFFFF', '#3b39af', 1)")
+            connection.execute('INSERT INTO BookingTombstone (id, user_id, revision) VALUES (7, 1, 1)')
+            connection.commit()
+            connection.close()
+            DBSchema.migrate(oldPath)
+            connection = DBConnection.openConnection(oldPath)
+            unittest.TestCase.assertEqual(self, first=connection.execute("INSERT INTO Booking (start, end, text, color, bg, user_id) VALUES ('2023-06-06 10:00', '2023-06-06 11:00', 'Rink A', '#FFFFFF', '#3b39af', 1) RETURNING id").fetchone()[0],
+                                          second=8, msg='Tombstoned id reused')
+            unittest.TestCase.assertEqual(self, first=connection.execute('SELECT count(*) FROM Booking').fetchone()[0], second=2)
+            unittest.TestCase.assertIn(self, member=('idx_userResourceSpanBook',), container=connection.execute("SELECT name FROM sqlite_master WHERE tbl_name = 'Booking'").fetchall())
+            connection.close()
+        finally:
+            removeDatabase(oldPath)
+
+    def testArchivedBookingNeverReplaced(self):
+        live = DBConnection.getConnection(self.dbPath)
+        bookingID = live.execute("SELECT id FROM Booking WHERE start = '2023-06-05 12:00'").fetchone()[0]
+        # an id handed out twice before ids were AUTOINCREMENT
+        Archive.openArchive(self.dbPath, 2023).execute(f'INSERT INTO Booking ({Archive.COLUMNS}) VALUES (?,?,?,?,?,?,?,?,?)',
+                                                       (bookingID, '2023-02-01 10:00', '2023-02-01 11:00', 'Old', '#FFFFFF', '#3b39af', 3, 1, 1))
+        result = Archive.maintain(self.dbPath, pause=0)
+        unittest.TestCase.assertEqual(self, first=(result['moved'], result['kept']), second=(2, [bookingID]))
+        unittest.TestCase.assertEqual(self, first=live.execute('SELECT user_id FROM Booking WHERE id = ?', (bookingID,)).fetchone()[0], second=2)
+        unittest.TestCase.assertEqual(self, first=Archive.openArchive(self.dbPath, 2023).execute('SELECT user_id, text FROM Booking WHERE id = ?', (bookingID,)).fetchone(),
+                                      second=(3, 'Old'), msg='Archived booking replaced')
+
+    def testMaintenance(self):
+        Archive.enableIncrementalVacuum(self.dbPath)
+        unittest.TestCase.assertEqual(self, first=Archive.maintain(self.dbPath, pause=0)['moved'], second=3)
+        live = DBConnection.getConnection(self.dbPath)
+        unittest.TestCase.assertGreater(self, a=live.execute("SELECT count(*) FROM sqlite_stat1 WHERE tbl = 'Booking'").fetchone()[0], b=0)
+        unittest.TestCase.assertEqual(self, first=live.execute('PRAGMA freelist_count').fetchone()[0], second=0)
+        # recent ranges never look the archive up
+        unittest.TestCase.assertEqual(self, first=Archive.yearsFor(live.cursor(), Archive.horizon(), '9999-01-01 00:00'), second=[])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Synchronous vs ASGI serving benchmark
+
+Created for CSI2999 Polyrhythm Skate semester project to compare many long lived calendar sessions served the way
+the threaded Flask server does it (one thread per connection, blocking sqlite calls) with app/asgi.py (one event
+loop, sqlite calls offloaded to a small pool)
+
+Relevant online documentation:
+https://docs.python.org/3/library/asyncio-eventloop.html#asyncio.loop.run_in_executor
+
+Change Log:
+10/18/2026 Initial Version
+
+Future Task List:
+-
+
+Usage (from BackendTesting):
+python AsgiBenchmark.py [--sessions 500] [--requests 20] [--think 0.05] [--bookings 20000]
+
+Every session polls /get/ --requests times with --think seconds between polls and saves one booking, all sessions at
+once. Both sides run in this process without sockets so only the serving model differs. For the same comparison
+over HTTP, with uvicorn installed:
+python ReplayBenchmark.py --mode server --server wsgi --workers 1
+python ReplayBenchmark.py --mode server --server asgi --workers 1
+"""
+
+import argparse, asyncio, datetime, os, resource, sys, threading, time, urllib.parse
+
+sys.path.insert(0, os.path.abspath('..'))
+import DBConnection
+from app import app
+from app import S2_lib as evt
+from app.asgi import application
+from BackendHelper import createBookingDatabase, removeDatabase, fillBookings, percentile, slotText
+
+
+def sessionRequests(n, requests):
+    # n-th session: polls of its own month, then one free booking far in the future
+    month, year = n % 12 + 1, 2020 + n % 4
+    start = datetime.datetime(2030, 1, 1) + datetime.timedelta(hours=n)
+    save = {'s': slotText(start), 'e': slotText(start + datetime.timedelta(minutes=30)), 't': 'Rink A', 'c': '#FFFFFF', 'b': '#3b39af', 'uid': n % 50 + 1}
+    return [('/get/', {'month': month, 'year': year, 'userID': n % 50 + 1})] * requests + [('/save/', save)]
+
+
+def runThreads(sessions, requests, think):
+    latencies, lock = [], threading.Lock()
+
+    def session(n):
+        client, mine = app.test_client(), []
+        for path, form in sessionRequests(n, requests):
+            started = time.perf_counter()
+            client.post(path, data=form).get_data()
+            mine.append(time.perf_counter() - started)
+            time.sleep(think)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=session, args=(n,)) for n in range(sessions)]
+    begin = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, time.perf_counter() - begin
+
+
+async def asgiSession(n, requests, think, latencies):
+    for path, form in sessionRequests(n, requests):
+        body = urllib.parse.urlencode(form).encode()
+        scope = {'type': 'http', 'http_version': '1.1', 'method': 'POST', 'path': path, 'query_string': b'',
+                 'headers': [(b'content-type', b'application/x-www-form-urlencoded')]}
+        messages = [{'type': 'http.request', 'body': body}]
+
+        async def receive():
+            return messages.pop() if messages else {'type': 'http.disconnect'}
+
+        async def send(message):
+            pass
+
+        started = time.perf_counter()
+        await application(scope, receive, send)
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(think)
+
+
+def runAsgi(sessions, requests, think):
+    latencies = []
+
+    async def main():
+        await asyncio.gather(*(asgiSession(n, requests, think, latencies) for n in range(sessions)))
+
+    begin = time.perf_counter()
+    asyncio.run(main())
+    return latencies, time.perf_counter() - begin
+
+
+def withPeakThreads(run, *args):
+    """
+    :return: run(*args) results plus the most threads alive at once while it ran
+    """
+    peak, done = [threading.active_count()], threading.Event()
+
+    def sample():
+        while not done.wait(0.01):
+            peak[0] = max(peak[0], threading.active_count() - 1)
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    try:
+        return run(*args) + (peak[0],)
+    finally:
+        done.set()
+        sampler.join()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Synchronous vs ASGI serving benchmark')
+    parser.add_argument('--sessions', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=20)
+    parser.add_argument('--think', type=float, default=0.05)
+    parser.add_argument('--bookings', type=int, default=20000)
+    args = parser.parse_args()
+    dbPath = createBookingDatabase()
+    results = {}
+    # the views print every saved booking, keep that out of the numbers
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        fillBookings(dbPath, args.bookings)
+        evt.DBFILE = dbPath
+        for name, run in (('threaded (run.py)', runThreads), ('asgi (app/asgi.py)', runAsgi)):
+            memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            latencies, wall, threads = withPeakThreads(run, args.sessions, args.requests, args.think)
+            results[name] = (latencies, wall, threads, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - memory)
+    finally:
+        sys.stdout = sys.__stdout__
+        DBConnection.closeConnections()
+        removeDatabase(dbPath)
+    print(f'{args.sessions} concurrent sessions, {args.requests + 1} requests each, {args.think * 1000:.0f} ms think time')
+    for name, (latencies, wall, threads, memory) in results.items():
+        times = [seconds * 1000 for seconds in latencies]
+        print(f'  {name:<20} {len(latencies) / wall:8.1f} req/s  p50 {percentile(times, 0.5):7.2f} ms  p99 {percentile(times, 0.99):7.2f} ms'
+              f'  threads {threads:4d}  peak RSS +{memory / 1024:.1f} MB')
@@ -0,0 +1,158 @@
+"""
+ASGI serving mode unit testing
+
+Created for CSI2999 Polyrhythm Skate semester project to test app/asgi.py by calling the ASGI application directly,
+no server needed
+
+Relevant online documentation:
+https://asgi.readthedocs.io/en/latest/specs/www.html
+
+Change Log:
+10/18/2026: Initial Version
+10/18/2026: /get/ of a month mixing bookings and series occurrences
+10/18/2026: JSON endpoint requests that raise are counted as 500s
+
+Future Task List:
+-
+"""
+import asyncio
+import json
+import unittest
+import urllib.parse
+
+from werkzeug.test import encode_multipart
+
+import Instrumentation
+from app import app
+from app import S2_lib as evt
+from app.asgi import application
+from BackendHelper import createBookingDatabase, removeDatabase
+
+
+def call(method, path, form=None, multipart=False, query=b''):
+    """
+    Run one request through the ASGI application
+    :return: (status, {header: value}, body)
+    """
+    headers, body = [], b''
+    if form is not None and multipart:
+        boundary, body = encode_multipart(form)
+        headers.append((b'content-type', f'multipart/form-data; boundary={boundary}'.encode()))
+    elif form is not None:
+        body = urllib.parse.urlencode(form).encode()
+        headers.append((b'content-type', b'application/x-www-form-urlencoded'))
+    scope = {'type': 'http', 'http_version': '1.1', 'method': method, 'path': path, 'root_path': '', 'scheme': 'http',
+             'query_string': query, 'headers': headers, 'server': ('testserver', 80), 'client': ('127.0.0.1', 5000)}
+    # the body arrives in two chunks, like a large upload would
+    messages = [{'type': 'http.request', 'body': body[:10], 'more_body': True}, {'type': 'http.request', 'body': body[10:]}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(application(scope, receive, send))
+    return sent[0]['status'], {k.decode(): v.decode() for k, v in sent[0]['headers']}, b''.join(m.get('body', b'') for m in sent[1:])
+
+
+class AsgiUnitTesting(unittest.TestCase):
+    def setUp(self):
+        self.dbPath = createBookingDatabase()
+        self.oldPath = evt.DBFILE
+        evt.DBFILE = self.dbPath
+        self.booking = {'s': '2023-06-05 10:00', 'e': '2023-06-05 11:00', 't': 'Rink A', 'c': '#FFFFFF', 'b': '#3b39af', 'uid': '1'}
+
+    def tearDown(self):
+        evt.DBFILE = self.oldPath
+        removeDatabase(self.dbPath)
+
+    def testJsonEndpoints(self):
+        unittest.TestCase.assertEqual(self, first=call('POST', '/get/', {'month': 6, 'year': 2023, 'userID': 1})[2], second=b'{}')
+        # the calendar posts FormData, which is multipart
+        unittest.TestCase.assertEqual(self, first=call('POST', '/save/', self.booking, multipart=True)[2], second=b'OK')
+        unittest.TestCase.assertEqual(self, first=call('POST', '/save/', dict(self.booking, uid='2'))[2], second=b'Time Conflict')
+        status, headers, body = call('POST', '/get/', {'month': 6, 'year': 2023, 'userID': 1})
+        unittest.TestCase.assertEqual(self, first=headers['content-type'], second='application/json')
+        flaskBody = app.test_client().post('/get/', data={'month': 6, 'year': 2023, 'userID': 1}).get_data()
+        unittest.TestCase.assertEqual(self, first=body, second=flaskBody, msg='ASGI /get/ differs from the Flask view')
+        columnar = {'month': 6, 'year': 2023, 'userID': 1, 'format': 'columns'}
+        unittest.TestCase.assertEqual(self, first=json.loads(call('POST', '/get/', columnar)[2]), second=app.test_client().post('/get/', data=columnar).json)
+        bookingID = next(iter(json.loads(body)))
+        unittest.TestCase.assertEqual(self, first=call('POST', '/delete/', {'id': bookingID})[2], second=b'OK')
+        unittest.TestCase.assertEqual(self, first=call('POST', '/get/', {'month': 6, 'year': 2023, 'userID': 1})[2], second=b'{}')
+
+    def testMixedMonth(self):
+        call('POST', '/save/', self.booking)
+        evt.saveSeries('2023-06-06 18:00', '2023-06-06 19:00', 'Hockey', '#FFFFFF', '#3b39af', 1, 'WEEKLY', count=2)
+        status, headers, body = call('POST', '/get/', {'month': 6, 'year': 2023, 'userID': 1})
+        unittest.TestCase.assertEqual(self, first=status, second=200)
+        unittest.TestCase.assertEqual(self, first=len(json.loads(body)), second=3)
+        unittest.TestCase.assertEqual(self, first=body, second=app.test_client().post('/get/', data={'month': 6, 'year': 2023, 'userID': 1}).get_data())
+
+    def testBadInput(self):
+        unittest.TestCase.assertEqual(self, first=call('POST', '/get/', {'month': 6})[0], second=400)
+        unittest.TestCase.assertEqual(self, first=call('POST', '/get/', {'month': 'june', 'year': 2023, 'userID': 1})[0], second=400)
+
+    def testRaisingRequestCounted(self):
+        Instrumentation.configure(enabled=True)
+        Instrumentation.reset()
+        save = evt.save
+        def failingSave(*args):
+            raise RuntimeError('save failed')
+        evt.save = failingSave
+        try:
+            with self.assertRaises(RuntimeError):
+                call('POST', '/save/', self.booking)
+        finally:
+            evt.save = save
+            Instrumentation.configure(enabled=False)
+        unittest.TestCase.assertEqual(self, first=Instrumentation.requestCounts, second={('save', 'POST', '500'): 1})
+        Instrumentation.reset()
+
+    def testOtherPathsGoToFlask(self):
+        status, headers, body = call('GET', '/pricing')
+        unittest.TestCase.assertEqual(self, first=status, second=200)
+        unittest.TestCase.assertIn(self, member=b'<html', container=body.lower())
+        unittest.TestCase.assertEqual(self, first=call('GET', '/nothing-here')[0], second=404)
+        status, headers, body = call('GET', '/events/', query=b'userID=1&from=2023-06-01&to=2023-07-01')
+        unittest.TestCase.assertEqual(self, first=json.loads(body)['events'], second=[])
+        unittest.TestCase.assertIn(self, member='etag', container=headers)
+
+    def testStream(self):
+        scope = {'type': 'http', 'http_version': '1.1', 'method': 'GET', 'path': '/stream/', 'query_string': b'from=2023-06-01&to=2023-07-01',
+                 'headers': [], 'server': ('testserver', 80), 'client': ('127.0.0.1', 5000)}
+        sent = []
+
+        async def scenario():
+            disconnect, messages = asyncio.Event(), [{'type': 'http.request', 'body': b''}]
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                await disconnect.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                sent.append(message)
+
+            async def waitFor(count):
+                while len(sent) < count:
+                    await asyncio.sleep(0.01)
+
+            task = asyncio.ensure_future(application(scope, receive, send))
+            await asyncio.wait_for(waitFor(2), 2)
+            # published from another thread, like a save on the DB pool or the Flask side
+            await asyncio.to_thread(evt.save, self.booking['s'], self.booking['e'], 'Rink A', '#FFFFFF', '#3b39af', 1)
+            await asyncio.wait_for(waitFor(3), 2)
+            disconnect.set()
+            await asyncio.wait_for(task, 2)
+
+        asyncio.run(scenario())
+        unittest.TestCase.assertEqual(self, first=dict(sent[0]['headers'])[b'content-type'], second=b'text/event-stream; charset=utf-8')
+        unittest.TestCase.assertIn(self, member=b'event: booking', container=sent[2]['body'])
+
+
+if __name__ == '__main__':
+    unittest.main()
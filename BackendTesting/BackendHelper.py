@@ -0,0 +1,133 @@
+"""
+Shared helpers for the backend unit tests and benchmarks
+
+Created for CSI2999 Polyrhythm Skate semester project to build throwaway databases
+with the same schema as SkateDB.db
+
+Relevant online documentation:
+https://docs.python.org/3/library/sqlite3.html#module-sqlite3
+
+Change Log:
+10/18/2026 Added temporary booking database and synthetic booking generator
+10/18/2026 Clean up WAL journal files with the database
+10/18/2026 Build test databases with the DBSchema.py migrations
+10/18/2026 Synthetic users, username letters and percentile shared by the benchmarks
+10/18/2026 Import time report of a fresh interpreter for the startup test and benchmark
+
+Future Task List:
+-
+"""
+
+import datetime, os, sqlite3, subprocess, sys, tempfile
+import DBSchema
+
+firstSlot = datetime.datetime(2020, 1, 1, 6, 0)
+
+
+def createBookingDatabase(directory=None, version=None):
+    """
+    Create an empty database file with the current SkateDB.db schema
+    :param directory: where to put the file, defaults to the system temp directory
+    :param version: stop at this schema version instead of the latest
+    :return: path to the new database file
+    """
+    handle, path = tempfile.mkstemp(suffix='.db', dir=directory)
+    os.close(handle)
+    DBSchema.migrate(path, version)
+    return path
+
+
+def removeDatabase(path):
+    """
+    Delete a database file together with any WAL journal files left next to it
+    :param path: database file
+    :return: None
+    """
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def slotText(slot):
+    return slot.strftime('%Y-%m-%d %H:%M')
+
+
+def syntheticBookings(count, userCount=50):
+    """
+    Yield non-overlapping one hour bookings, twelve per day starting at 6am on 1/1/2020
+    :param count: number of bookings
+    :param userCount: bookings are spread round robin over this many user ids
+    :return: generator of (start, end, text, color, bg, user_id) tuples
+    """
+    for n in range(count):
+        start = firstSlot + datetime.timedelta(days=n // 12, hours=n % 12)
+        yield (slotText(start), slotText(start + datetime.timedelta(hours=1)), 'Rink A', '#FFFFFF', '#3b39af', n % userCount + 1)
+
+
+def fillBookings(path, count, userCount=50):
+    """
+    Bulk load synthetic bookings into a database file
+    :param path: database file
+    :param count: number of bookings
+    :return: the last slot start that was generated
+    """
+    connection = sqlite3.connect(path)
+    connection.executemany('INSERT INTO Booking (start, end, text, color, bg, user_id) VALUES (?, ?, ?, ?, ?, ?);',
+                           syntheticBookings(count, userCount))
+    connection.commit()
+    connection.close()
+    return firstSlot + datetime.timedelta(days=(count - 1) // 12, hours=(count - 1) % 12)
+
+
+def letters(n):
+    # usernames may not contain digits
+    return ''.join(chr(ord('a') + int(digit)) for digit in str(n))
+
+
+def syntheticUsername(n):
+    return 'skater' + letters(n)
+
+
+def fillUsers(path, count, passHash):
+    """
+    Bulk load synthetic users that all share one password hash, UID n + 1 is syntheticUsername(n)
+    :param path: database file
+    :param count: number of users
+    :param passHash: stored hash for every user, hash the password once instead of count times
+    :return: None
+    """
+    connection = sqlite3.connect(path)
+    connection.executemany('INSERT INTO Users (UID, FirstName, LastName, Username, Email, Password) VALUES (?, ?, ?, ?, ?, ?);',
+                           ((n + 1, 'Skater', 'Test', syntheticUsername(n), syntheticUsername(n) + '@mail.com', passHash) for n in range(count)))
+    connection.commit()
+    connection.close()
+
+
+def percentile(values, fraction):
+    """
+    :param values: samples, need not be sorted
+    :param fraction: 0.5 for the median, 0.99 for p99
+    :return: nearest rank percentile
+    """
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def importTimes(code):
+    """
+    Run code in a fresh interpreter under -X importtime, from an empty directory so createApp() finds no SkateDB.db
+    :param code: python source, e.g. 'import app'
+    :return: {module: cumulative import microseconds} of every module the code imported
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environment = dict(os.environ, PYTHONPATH=root)
+    with tempfile.TemporaryDirectory() as directory:
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=directory, env=environment,
+                                capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if line.startswith('import time:') and not line.endswith('imported package'):
+            _, cumulative, name = line[len('import time:'):].split('|')
+            times[name.strip()] = int(cumulative)
+    return times
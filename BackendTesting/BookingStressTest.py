@@ -0,0 +1,134 @@
+"""
+Concurrent booking stress test
+
+Created for CSI2999 Polyrhythm Skate semester project to make sure that many processes and threads posting
+overlapping slots to /save/ at the same time can never double book the rink, and that reservations posted to
+/reserve/ can never oversell a skate session
+
+Relevant online documentation:
+https://www.sqlite.org/lang_transaction.html
+
+Change Log:
+10/18/2026: Initial Version
+10/18/2026: Reservation overselling test
+
+Future Task List:
+-
+
+Usage (from BackendTesting):
+PYTHONPATH=.. python -m unittest BookingStressTest
+"""
+import multiprocessing
+import os
+import random
+import sqlite3
+import threading
+import time
+import unittest
+
+from app import app
+from app import S2_lib as evt
+from BackendHelper import createBookingDatabase, removeDatabase
+
+processCount = 4
+threadCount = 4
+requestsPerThread = 40
+
+# one hour slots starting every half hour, so each candidate overlaps its neighbours
+candidateSlots = [('2023-06-05 %02d:%02d' % (8 + n // 2, 30 * (n % 2)), '2023-06-05 %02d:%02d' % (9 + n // 2, 30 * (n % 2))) for n in range(20)]
+
+
+def savePost(client, rng, threadSeed):
+    start, end = rng.choice(candidateSlots)
+    return client.post('/save/', data={'s': start, 'e': end, 't': 'Rink A', 'c': '#FFFFFF', 'b': '#3b39af', 'uid': threadSeed})
+
+
+def reservePost(client, rng, threadSeed):
+    return client.post('/reserve/', data={'sessionID': 1, 'uid': threadSeed, 'seats': rng.choice((1, 1, 2))})
+
+
+def hammer(dbPath, seed, results, post=savePost, replies=('OK', 'Time Conflict')):
+    """
+    Make requestsPerThread posts from several threads of one process and count the replies
+    """
+    evt.DBFILE = dbPath
+    counts = dict.fromkeys(replies + ('other',), 0)
+    lock = threading.Lock()
+
+    def poster(threadSeed):
+        rng = random.Random(threadSeed)
+        client = app.test_client()
+        for _ in range(requestsPerThread):
+            text = post(client, rng, threadSeed).get_data(as_text=True)
+            with lock:
+                counts[text if text in counts else 'other'] += 1
+
+    threads = [threading.Thread(target=poster, args=(seed * 100 + n,)) for n in range(threadCount)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put(counts)
+
+
+class BookingStressTesting(unittest.TestCase):
+    def setUp(self):
+        self.dbPath = createBookingDatabase()
+        evt.conflicts.reset(useIndex=False)
+
+    def tearDown(self):
+        removeDatabase(self.dbPath)
+
+    def hammerAll(self, *args):
+        results = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=hammer, args=(self.dbPath, n + 1, results) + args) for n in range(processCount)]
+        begin = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        counts = {}
+        for _ in workers:
+            for key, value in results.get(timeout=120).items():
+                counts[key] = counts.get(key, 0) + value
+        for worker in workers:
+            worker.join()
+        return counts, time.perf_counter() - begin
+
+    def testNoDoubleBooking(self):
+        counts, elapsed = self.hammerAll()
+
+        connection = sqlite3.connect(self.dbPath)
+        rows = connection.execute('SELECT COUNT(*) FROM Booking').fetchone()[0]
+        overlaps = connection.execute('SELECT COUNT(*) FROM Booking a JOIN Booking b ON a.id < b.id AND a.start < b.end AND a.end > b.start').fetchone()[0]
+        connection.close()
+
+        total = processCount * threadCount * requestsPerThread
+        print(f'\n{total} /save/ requests from {processCount} processes x {threadCount} threads in {elapsed:.2f}s '
+              f'({total / elapsed:.0f} req/s): {counts}')
+        unittest.TestCase.assertEqual(self, first=sum(counts.values()), second=total, msg='Not every request got a reply')
+        unittest.TestCase.assertEqual(self, first=overlaps, second=0, msg='Overlapping bookings were saved')
+        unittest.TestCase.assertEqual(self, first=rows, second=counts['OK'], msg='Saved rows do not match OK replies')
+        unittest.TestCase.assertEqual(self, first=counts['other'], second=0, msg='Unexpected /save/ replies')
+
+    def testNoOverselling(self):
+        evt.DBFILE = self.dbPath
+        capacity = 150
+        evt.saveSession('2023-06-05 18:00', '2023-06-05 20:00', 'Public Skate', capacity)
+        counts, elapsed = self.hammerAll(reservePost, ('OK', 'Session Full'))
+
+        connection = sqlite3.connect(self.dbPath)
+        reserved = connection.execute('SELECT reserved FROM SkateSession WHERE id = 1').fetchone()[0]
+        seats = connection.execute('SELECT SUM(seats) FROM Reservation WHERE session_id = 1').fetchone()[0]
+        connection.close()
+
+        total = processCount * threadCount * requestsPerThread
+        print(f'\n{total} /reserve/ requests from {processCount} processes x {threadCount} threads in {elapsed:.2f}s '
+              f'({total / elapsed:.0f} req/s): {counts}')
+        unittest.TestCase.assertEqual(self, first=sum(counts.values()), second=total, msg='Not every request got a reply')
+        unittest.TestCase.assertEqual(self, first=counts['other'], second=0, msg='Unexpected /reserve/ replies')
+        unittest.TestCase.assertLessEqual(self, a=reserved, b=capacity, msg='Session oversold')
+        unittest.TestCase.assertEqual(self, first=seats, second=reserved, msg='Reservation rows do not match the session counter')
+        unittest.TestCase.assertGreaterEqual(self, a=reserved, b=capacity - 1, msg='Session not filled')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,283 @@
+"""
+Booking library unit testing
+
+Created for CSI2999 Polyrhythm Skate semester project to test the calendar booking functions in app/S2_lib.py
+
+Relevant online documentation:
+N/A
+
+Change Log:
+10/18/2026: Initial Version, conflict detection
+10/18/2026: Range queries, revisions and tombstones for /events/
+10/18/2026: Month boundaries and query plan regression tests
+10/18/2026: Recurring series expansion, conflicts and exceptions
+10/18/2026: Skate session capacity and reservations
+10/18/2026: Occupancy heatmap buckets stay equal to a rebuild
+10/18/2026: Columnar /get/ and /events/ layout and compression
+10/18/2026: Overlap query plan searches the resource span index
+10/18/2026: /get/ object layout of a month mixing bookings and series occurrences
+10/18/2026: /deleteSeries/ answers 400 to a missing or non-numeric id
+10/18/2026: /cancelReservation/ answers 400 to a missing or non-numeric field
+10/18/2026: Tombstones of one booking id in several calendars
+
+Future Task List:
+-
+"""
+import datetime
+import gzip
+import json
+import os
+import unittest
+
+import DBConnection
+from app import app
+from app import S2_lib as evt
+from app import recurrence, inventory, occupancy, wire
+from app.conflicts import OVERLAP_SQL
+from BackendHelper import createBookingDatabase, removeDatabase
+
+
+class BookingUnitTesting(unittest.TestCase):
+    def setUp(self):
+        self.dbPath = createBookingDatabase()
+        self.oldPath = evt.DBFILE
+        evt.DBFILE = self.dbPath
+        evt.conflicts.reset(useIndex=False)
+
+    def tearDown(self):
+        evt.DBFILE = self.oldPath
+        evt.conflicts.reset(useIndex=False)
+        DBConnection.closeConnections()
+        removeDatabase(self.dbPath)
+
+    def checkOverlaps(self):
+        unittest.TestCase.assertTrue(self, expr=evt.save('2023-06-05 10:00', '2023-06-05 12:00', 'Rink A', '#FFFFFF', '#3b39af', 1), msg='Failed to book empty slot')
+        unittest.TestCase.assertFalse(self, expr=evt.save('2023-06-05 10:00', '2023-06-05 12:00', 'Rink A', '#FFFFFF', '#3b39af', 2), msg='Booked identical slot')
+        unittest.TestCase.assertFalse(self, expr=evt.save('2023-06-05 09:00', '2023-06-05 11:00', 'Rink A', '#FFFFFF', '#3b39af', 2), msg='Booked slot overlapping the start')
+        unittest.TestCase.assertFalse(self, expr=evt.save('2023-06-05 11:30', '2023-06-05 13:00', 'Rink A', '#FFFFFF', '#3b39af', 2), msg='Booked slot overlapping the end')
+        unittest.TestCase.assertFalse(self, expr=evt.save('2023-06-05 10:30', '2023-06-05 11:00', 'Rink A', '#FFFFFF', '#3b39af', 2), msg='Booked slot inside an existing booking')
+        unittest.TestCase.assertFalse(self, expr=evt.save('2023-06-04 20:00', '2023-06-06 08:00', 'Rink A', '#FFFFFF', '#3b39af', 2), msg='Booked slot around an existing booking')
+        unittest.TestCase.assertTrue(self, expr=evt.save('2023-06-05 12:00', '2023-06-05 13:00', 'Rink A', '#FFFFFF', '#3b39af', 2), msg='Failed to book adjacent slot')
+        unittest.TestCase.assertTrue(self, expr=evt.save('2023-06-05 08:00', '2023-06-05 10:00', 'Rink A', '#FFFFFF', '#3b39af', 2), msg='Failed to book adjacent slot')
+
+        bookingID = list(evt.get(6, 2023, 1).keys())[0]
+        unittest.TestCase.assertTrue(self, expr=evt.save('2023-06-05 10:00', '2023-06-05 11:00', 'Rink A', '#FFFFFF', '#3b39af', 1, bookingID), msg='Updating a booking conflicted with itself')
+        unittest.TestCase.assertTrue(self, expr=evt.save('2023-06-05 11:00', '2023-06-05 12:00', 'Rink A', '#FFFFFF', '#3b39af', 2), msg='Slot freed by update was not bookable')
+        evt.delete(bookingID)
+        unittest.TestCase.assertTrue(self, expr=evt.save('2023-06-05 10:00', '2023-06-05 11:00', 'Rink A', '#FFFFFF', '#3b39af', 2), msg='Slot freed by delete was not bookable')
+
+    def testConflictQuery(self):
+        self.checkOverlaps()
+
+    def testConflictIntervalIndex(self):
+        evt.conflicts.reset(useIndex=True)
+        self.checkOverlaps()
+
+    def testIncrementalSync(self):
+        evt.save('2023-06-05 10:00', '2023-06-05 12:00', 'Rink A', '#FFFFFF', '#3b39af', 1)
+        evt.save('2023-06-30 22:00', '2023-07-01 02:00', 'Rink A', '#FFFFFF', '#3b39af', 1)
+        evt.save('2023-06-06 10:00', '2023-06-06 12:00', 'Rink A', '#FFFFFF', '#3b39af', 2)
+        client = app.test_client()
+        reply = client.get('/events/?userID=1&from=2023-07-01&to=2023-08-01')
+        unittest.TestCase.assertEqual(self, first=[row[1] for row in reply.json['events']], second=['2023-06-30 22:00'], msg='Range did not include the booking running into July')
+        reply = client.get('/events/?userID=1&from=2023-06-01&to=2023-07-01')
+        unittest.TestCase.assertEqual(self, first=len(reply.json['events']), second=2)
+        unittest.TestCase.assertEqual(self, first=reply.json['rev'], second=2)
+        etag = reply.headers['ETag']
+        unittest.TestCase.assertEqual(self, first=client.get('/events/?userID=1&from=2023-06-01&to=2023-07-01', headers={'If-None-Match': etag}).status_code, second=304)
+
+        deletedID = reply.json['events'][0][0]
+        evt.delete(deletedID)
+        evt.save('2023-06-07 10:00', '2023-06-07 12:00', 'Rink A', '#FFFFFF', '#3b39af', 1)
+        unittest.TestCase.assertEqual(self, first=client.get('/events/?userID=1&from=2023-06-01&to=2023-07-01', headers={'If-None-Match': etag}).status_code, second=200, msg='Changed calendar answered 304')
+        reply = client.get('/events/?userID=1&since=2')
+        unittest.TestCase.assertEqual(self, first=[row[1] for row in reply.json['events']], second=['2023-06-07 10:00'])
+        unittest.TestCase.assertEqual(self, first=reply.json['deleted'], second=[deletedID])
+        unittest.TestCase.assertEqual(self, first=reply.json['rev'], second=4)
+        unittest.TestCase.assertEqual(self, first=client.get('/events/?userID=1&from=June').status_code, second=400)
+
+    def testTombstonesPerUser(self):
+        evt.save('2023-06-05 10:00', '2023-06-05 12:00', 'Rink A', '#FFFFFF', '#3b39af', 1)
+        evt.save('2023-06-06 10:00', '2023-06-06 12:00', 'Rink A', '#FFFFFF', '#3b39af', 1)
+        handedID, returnedID = evt.get(6, 2023, 1).keys()
+        since = evt.revision(1)
+        # user 1 hands a booking to user 2, who deletes it
+        evt.save('2023-06-05 10:00', '2023-06-05 12:00', 'Rink A', '#FFFFFF', '#3b39af', 2, handedID)
+        evt.delete(handedID)
+        unittest.TestCase.assertEqual(self, first=evt.getRange(None, None, 1, since=since), second=([], [handedID]), msg="User 2's delete replaced user 1's tombstone")
+        unittest.TestCase.assertEqual(self, first=evt.getRange(None, None, 2, since=0)[1], second=[handedID])
+
+        # a booking handed back is live again, not deleted too
+        since = evt.revision(1)
+        evt.save('2023-06-06 10:00', '2023-06-06 12:00', 'Rink A', '#FFFFFF', '#3b39af', 2, returnedID)
+        evt.save('2023-06-06 10:00', '2023-06-06 12:00', 'Rink A', '#FFFFFF', '#3b39af', 1, returnedID)
+        events, deleted = evt.getRange(None, None, 1, since=since)
+        unittest.TestCase.assertEqual(self, first=([row[0] for row in events], deleted), second=([returnedID], []))
+
+    def testMonthBoundaries(self):
+        evt.save('2023-10-15 10:00', '2023-10-15 12:00', 'Rink A', '#FFFFFF', '#3b39af', 1)
+        evt.save('2023-12-31 23:00', '2024-01-01 01:00', 'Rink A', '#FFFFFF', '#3b39af', 1)
+        evt.save('2023-11-01 00:00', '2023-11-01 01:00', 'Rink A', '#FFFFFF', '#3b39af', 1)
+        unittest.TestCase.assertEqual(self, first=[e['s'] for e in evt.get(10, 2023, 1).values()], second=['2023-10-15 10:00'], msg='October bookings not found')
+        unittest.TestCase.assertEqual(self, first=[e['s'] for e in evt.get(12, 2023, 1).values()], second=['2023-12-31 23:00'])
+        unittest.TestCase.assertEqual(self, first=[e['s'] for e in evt.get(1, 2024, 1).values()], second=['2023-12-31 23:00'], msg='Booking running into January not found')
+        unittest.TestCase.assertIsNone(self, obj=evt.get(10, 2023, 2))
+
+    def testQueryPlansUseIndexes(self):
+        connection = DBConnection.getConnection(self.dbPath)
+        for sql, params, index in ((evt.GET_SQL, (1, '2023-10-01 00:00', '2023-11-01 00:00'), 'idx_userSpanBook'),
+                                   (evt.RANGE_SQL, (1, '2023-10-01 00:00', '2023-11-01 00:00'), 'idx_userSpanBook'),
+                                   (OVERLAP_SQL, (1, '2023-10-01 10:00', '2023-10-01 11:00', None), 'idx_resourceSpanBook'),
+                                   (recurrence.SPAN_SQL, ('2023-10-01 10:00', '2023-10-01 11:00'), 'idx_spanSeries'),
+                                   (recurrence.USER_SPAN_SQL, (1, '2023-10-01 00:00', '2023-11-01 00:00'), 'idx_userSpanSeries'),
+                                   (inventory.AVAILABILITY_SQL, (1,) + inventory.span('2023-10-01 00:00', '2023-11-01 00:00'), 'idx_spanSession')):
+            plan = ' '.join(row[3] for row in connection.execute('EXPLAIN QUERY PLAN ' + sql, params))
+            unittest.TestCase.assertIn(self, member='USING', container=plan, msg=sql)
+            unittest.TestCase.assertIn(self, member=index, container=plan, msg=sql)
+            unittest.TestCase.assertNotIn(self, member='SCAN Booking', container=plan, msg=sql)
+
+    def testSeriesExpansion(self):
+        # every tuesday and thursday 18:00-20:00 every other week, checked against stepping day by day
+        series = recurrence.Series.fromRule('2023-01-03 18:00', '2023-01-03 20:00', 'WEEKLY', 2, '1,3', until='2023-12-31')
+        expected, day = [], datetime.datetime(2023, 1, 3, 18, 0)
+        while day.year == 2023:
+            if day.weekday() in (1, 3) and (day - datetime.datetime(2023, 1, 2, 18, 0)).days // 7 % 2 == 0:
+                expected.append(day.strftime(recurrence.FORMAT))
+            day += datetime.timedelta(days=1)
+        unittest.TestCase.assertEqual(self, first=[s for s, e in series.occurrences('2023-01-01 00:00', '2024-01-01 00:00')], second=expected)
+        unittest.TestCase.assertEqual(self, first=[s for s, e in series.occurrences('2023-06-01 00:00', '2023-07-01 00:00')],
+                                      second=[s for s in expected if s.startswith('2023-06')], msg='Month expansion differs from full expansion')
+        unittest.TestCase.assertEqual(self, first=list(series.occurrences('2023-01-03 19:00', '2023-01-03 19:30')), second=[('2023-01-03 18:00', '2023-01-03 20:00')], msg='Running occurrence not found')
+        daily = recurrence.Series.fromRule('2023-01-02 06:00', '2023-01-02 07:00', 'DAILY', 1, '0,1,2,3,4', count=10)
+        unittest.TestCase.assertEqual(self, first=daily.span(), second=('2023-01-02 06:00', '2023-01-13 07:00'), msg='Count of weekday mornings ended on the wrong day')
+        with self.assertRaises(ValueError):
+            recurrence.Series.fromRule('2023-01-03 18:00', '2023-01-03 20:00', 'WEEKLY')
+        with self.assertRaises(ValueError):
+            recurrence.Series.fromRule('2023-01-03 18:00', '2023-01-03 20:00', 'DAILY', until='2030-01-01')
+
+    def testSeriesConflictsAndExceptions(self):
+        evt.save('2023-06-13 18:30', '2023-06-13 19:00', 'Rink A', '#FFFFFF', '#3b39af', 2)
+        unittest.TestCase.assertFalse(self, expr=evt.saveSeries('2023-06-06 18:00', '2023-06-06 20:00', 'Rink A', '#FFFFFF', '#3b39af', 1, 'WEEKLY', count=4), msg='Series booked over an existing booking')
+        seriesID = evt.saveSeries('2023-06-06 20:00', '2023-06-06 22:00', 'Rink A', '#FFFFFF', '#3b39af', 1, 'WEEKLY', count=4)
+        unittest.TestCase.assertTrue(self, expr=seriesID, msg='Failed to book free series')
+        unittest.TestCase.assertFalse(self, expr=evt.save('2023-06-20 21:00', '2023-06-20 21:30', 'Rink A', '#FFFFFF', '#3b39af', 2), msg='Booked over a series occurrence')
+        unittest.TestCase.assertFalse(self, expr=evt.saveSeries('2023-06-01 21:00', '2023-06-01 22:00', 'Rink A', '#FFFFFF', '#3b39af', 2, 'DAILY', until='2023-06-30'), msg='Series booked over another series')
+        unittest.TestCase.assertTrue(self, expr=evt.save('2023-07-04 21:00', '2023-07-04 21:30', 'Rink A', '#FFFFFF', '#3b39af', 2), msg='Slot after the last occurrence was not bookable')
+        unittest.TestCase.assertEqual(self, first=sorted(evt.get(6, 2023, 1)), second=[f's{seriesID}:2023-06-{day} 20:00' for day in ('06', '13', '20', '27')])
+
+        evt.delete(f's{seriesID}:2023-06-13 20:00')
+        unittest.TestCase.assertTrue(self, expr=evt.save('2023-06-13 21:00', '2023-06-13 21:30', 'Rink A', '#FFFFFF', '#3b39af', 2), msg='Cancelled occurrence was not bookable')
+        unittest.TestCase.assertTrue(self, expr=evt.save('2023-06-20 20:30', '2023-06-20 22:30', 'Rink A', '#FFFFFF', '#3b39af', 1, f's{seriesID}:2023-06-20 20:00'), msg='Moving an occurrence conflicted with itself')
+        unittest.TestCase.assertEqual(self, first=sorted(e['s'] for e in evt.get(6, 2023, 1).values()), second=['2023-06-06 20:00', '2023-06-20 20:30', '2023-06-27 20:00'])
+        unittest.TestCase.assertEqual(self, first=evt.getRange('2023-06-01 00:00', '2023-07-01 00:00', 1)[0][0][1], second='2023-06-20 20:30')
+
+        rev = evt.revision(1)
+        unittest.TestCase.assertTrue(self, expr=evt.deleteSeries(seriesID))
+        events, deleted = evt.getRange(None, None, 1, since=rev)
+        unittest.TestCase.assertEqual(self, first=(events, deleted), second=([], [f's{seriesID}']), msg='Deleted series not reported to incremental sync')
+        unittest.TestCase.assertEqual(self, first=[e['s'] for e in evt.get(6, 2023, 1).values()], second=['2023-06-20 20:30'], msg='Deleted series still expanded')
+
+    def testDeleteSeriesBadInput(self):
+        client = app.test_client()
+        for fields in ({}, {'id': 'abc'}):
+            unittest.TestCase.assertEqual(self, first=client.post('/deleteSeries/', data=fields).status_code, second=400, msg=str(fields))
+        unittest.TestCase.assertEqual(self, first=client.post('/deleteSeries/', data={'id': 7}).get_data(), second=b'Not Found')
+
+    def testSessionReservations(self):
+        evt.save('2023-06-05 10:00', '2023-06-05 12:00', 'Rink A', '#FFFFFF', '#3b39af', 1)
+        unittest.TestCase.assertFalse(self, expr=evt.saveSession('2023-06-05 11:00', '2023-06-05 13:00', 'Public Skate', 3), msg='Session created over a booking')
+        sessionID = evt.saveSession('2023-06-05 12:00', '2023-06-05 14:00', 'Public Skate', 3)
+        unittest.TestCase.assertTrue(self, expr=sessionID, msg='Failed to create session')
+        unittest.TestCase.assertFalse(self, expr=evt.save('2023-06-05 13:00', '2023-06-05 15:00', 'Rink A', '#FFFFFF', '#3b39af', 2), msg='Booked over a session')
+
+        unittest.TestCase.assertEqual(self, first=evt.reserve(sessionID, 1), second=2)
+        unittest.TestCase.assertEqual(self, first=evt.reserve(sessionID, 2, 2), second=0)
+        unittest.TestCase.assertFalse(self, expr=evt.reserve(sessionID, 3), msg='Full session took a reservation')
+        unittest.TestCase.assertFalse(self, expr=evt.reserve(sessionID + 1, 3), msg='Missing session took a reservation')
+        unittest.TestCase.assertEqual(self, first=evt.availability(6, 2023, 2), second=[[sessionID, '2023-06-05 12:00', '2023-06-05 14:00', 'Public Skate', 3, 0, 2]])
+        unittest.TestCase.assertTrue(self, expr=evt.cancelReservation(sessionID, 2))
+        unittest.TestCase.assertFalse(self, expr=evt.cancelReservation(sessionID, 2), msg='Cancelled twice')
+        unittest.TestCase.assertEqual(self, first=evt.reserve(sessionID, 3), second=1, msg='Cancelled seats were not given back')
+        unittest.TestCase.assertEqual(self, first=evt.availability(7, 2023), second=[])
+        with self.assertRaises(ValueError):
+            evt.reserve(sessionID, 3, 0)
+        unittest.TestCase.assertTrue(self, expr=evt.deleteSession(sessionID))
+        unittest.TestCase.assertTrue(self, expr=evt.save('2023-06-05 13:00', '2023-06-05 15:00', 'Rink A', '#FFFFFF', '#3b39af', 2), msg='Deleted session still holds the rink')
+
+    def testCancelReservationBadInput(self):
+        client = app.test_client()
+        for fields in ({'uid': 1}, {'sessionID': 1}, {'sessionID': 'one', 'uid': 1}):
+            unittest.TestCase.assertEqual(self, first=client.post('/cancelReservation/', data=fields).status_code, second=400, msg=str(fields))
+        unittest.TestCase.assertEqual(self, first=client.post('/cancelReservation/', data={'sessionID': 1, 'uid': 1}).get_data(), second=b'Not Found')
+
+    def testOccupancyBuckets(self):
+        evt.save('2023-06-05 10:30', '2023-06-05 12:00', 'Rink A', '#FFFFFF', '#3b39af', 1)
+        built = evt.occupancyMap('2023-06-01', '2023-07-01')
+        unittest.TestCase.assertEqual(self, first=len(built), second=30, msg='Not every day of the month was built')
+        unittest.TestCase.assertEqual(self, first=built['2023-06-05'][10:12], second=[30, 60])
+
+        # every write after the days are built applies its change to the buckets
+        evt.save('2023-06-06 23:00', '2023-06-07 01:15', 'Rink A', '#FFFFFF', '#3b39af', 2)
+        evt.save('2023-06-05 11:00', '2023-06-05 12:00', 'Rink A', '#FFFFFF', '#3b39af', 1, self.bookingID('2023-06-05 10:30'))
+        seriesID = evt.saveSeries('2023-06-06 18:00', '2023-06-06 20:00', 'Rink A', '#FFFFFF', '#3b39af', 1, 'WEEKLY', count=4)
+        evt.delete(f's{seriesID}:2023-06-13 18:00')
+        evt.save('2023-06-20 19:00', '2023-06-20 20:00', 'Rink A', '#FFFFFF', '#3b39af', 1, f's{seriesID}:2023-06-20 18:00')
+        sessionID = evt.saveSession('2023-06-10 09:00', '2023-06-10 11:00', 'Public Skate', 30)
+        evt.saveSession('2023-06-11 09:00', '2023-06-11 10:00', 'Public Skate', 30)
+        evt.deleteSession(sessionID)
+        evt.delete(self.bookingID('2023-06-06 23:00'))
+        evt.save('2023-06-08 08:00', '2023-06-08 09:00', 'Rink A', '#FFFFFF', '#3b39af', 1)
+        incremental = evt.occupancyMap('2023-06-01', '2023-07-01')
+
+        cursor = DBConnection.getConnection(self.dbPath).cursor()
+        cursor.execute('DELETE FROM OccupancyDay')
+        unittest.TestCase.assertEqual(self, first=incremental, second=evt.occupancyMap('2023-06-01', '2023-07-01'), msg='Incremental buckets differ from a rebuild')
+        unittest.TestCase.assertEqual(self, first=sum(incremental['2023-06-20']), second=60, msg='Edited occurrence still counted')
+        unittest.TestCase.assertEqual(self, first=incremental['2023-06-11'][9], second=60)
+        unittest.TestCase.assertEqual(self, first=occupancy.minutesByDay([('2023-06-06 23:00', '2023-06-07 01:15')]),
+                                      second={'2023-06-06': [0] * 23 + [60], '2023-06-07': [60, 15] + [0] * 22}, msg='Slot not split at midnight')
+
+    def testColumnarEvents(self):
+        evt.save('2023-06-05 10:00', '2023-06-05 11:00', 'Rink A', '#FFFFFF', '#3b39af', 1)
+        evt.save('2023-06-06 10:00', '2023-06-06 11:00', 'Lesson', '#000000', '#ffcc00', 1)
+        evt.save('2023-06-07 10:00', '2023-06-07 11:00', 'Rink A', '#FFFFFF', '#3b39af', 1)
+        seriesID = evt.saveSeries('2023-06-08 18:00', '2023-06-08 19:00', 'Hockey', '#FFFFFF', '#3b39af', 1, 'WEEKLY', count=2)
+        client = app.test_client()
+        reply = client.post('/get/', data={'month': 6, 'year': 2023, 'userID': 1, 'format': 'columns'})
+        cols = reply.json
+        unittest.TestCase.assertEqual(self, first=cols['palette'], second=[['#FFFFFF', '#3b39af'], ['#000000', '#ffcc00']], msg='Color pairs not shared')
+        unpacked = {cols['id'][i]: {'s': cols['s'][i], 'e': cols['e'][i], 'c': cols['palette'][p][0], 'b': cols['palette'][p][1], 't': cols['t'][i], 'uid': cols['uid']}
+                    for i, p in enumerate(cols['p'])}
+        unittest.TestCase.assertEqual(self, first=unpacked, second=evt.get(6, 2023, 1), msg='Columns do not decode to the /get/ objects')
+        unittest.TestCase.assertEqual(self, first=client.post('/get/', data={'month': 1, 'year': 2023, 'userID': 1, 'format': 'columns'}).json['id'], second=[])
+
+        # the object layout of a month holding bookings and series occurrences, every id a string key
+        reply = client.post('/get/', data={'month': 6, 'year': 2023, 'userID': 1})
+        unittest.TestCase.assertEqual(self, first=reply.status_code, second=200)
+        unittest.TestCase.assertEqual(self, first=reply.json, second={str(id): event for id, event in evt.get(6, 2023, 1).items()})
+        unittest.TestCase.assertIn(self, member=f's{seriesID}:2023-06-08 18:00', container=reply.json)
+
+        reply = client.get('/events/?userID=1&from=2023-06-01&to=2023-07-01&format=columns')
+        unittest.TestCase.assertEqual(self, first=reply.json['events']['s'], second=[row[1] for row in client.get('/events/?userID=1&from=2023-06-01&to=2023-07-01').json['events']])
+        unittest.TestCase.assertIn(self, member='ETag', container=reply.headers)
+
+        # small bodies go out as they are, big ones are compressed when the client accepts it
+        unittest.TestCase.assertNotIn(self, member='Content-Encoding', container=reply.headers)
+        oldMin = wire.MIN_BYTES
+        wire.configure(minBytes=0, level=wire.LEVEL)
+        try:
+            for fields in ({'month': 6, 'year': 2023, 'userID': 1, 'format': 'columns'}, {'month': 6, 'year': 2023, 'userID': 1}):
+                reply = client.post('/get/', data=fields, headers={'Accept-Encoding': 'gzip, deflate'})
+                unittest.TestCase.assertEqual(self, first=reply.headers['Content-Encoding'], second='gzip')
+                unittest.TestCase.assertEqual(self, first=json.loads(gzip.decompress(reply.get_data())), second=client.post('/get/', data=fields).json)
+            reply = client.post('/get/', data=fields, headers={'Accept-Encoding': 'gzip;q=0, identity'})
+            unittest.TestCase.assertNotIn(self, member='Content-Encoding', container=reply.headers, msg='Refused encoding was used')
+        finally:
+            wire.configure(minBytes=oldMin, level=wire.LEVEL)
+
+    def bookingID(self, start):
+        return DBConnection.getConnection(self.dbPath).execute('SELECT id FROM Booking WHERE start = ?', (start,)).fetchone()[0]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Bulk import/export benchmark
+
+Created for CSI2999 Polyrhythm Skate semester project to compare seeding bookings and users one at a time
+through S2_lib.save and DBHandler.insertNewUserData with the batched BulkTransfer.py pipeline
+
+Relevant online documentation:
+N/A
+
+Change Log:
+10/18/2026 Initial Version
+
+Future Task List:
+-
+
+Usage (from BackendTesting):
+python BulkTransferBenchmark.py [--bookings 200000] [--users 2000] [--sample 2000]
+The one at a time paths only run --sample records and are reported per record.
+"""
+
+import argparse, csv, os, sys, tempfile, time
+
+sys.path.insert(0, os.path.abspath('..'))
+import BulkTransfer, DBConnection
+from app import S2_lib as evt
+from DBUserHandler import DBHandler
+from PasswordHasher import PasswordHasher
+from BackendHelper import createBookingDatabase, removeDatabase, syntheticBookings, letters
+
+
+def writeFile(suffix, header, rows):
+    handle, path = tempfile.mkstemp(suffix=suffix)
+    with os.fdopen(handle, 'w', newline='') as output:
+        writer = csv.writer(output)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return path
+
+
+def userRows(count, prefix):
+    return [('First', 'Last', prefix + letters(n), prefix + letters(n) + '@mail.com', 'T3stP@ssword') for n in range(count)]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bulk import/export benchmark')
+    parser.add_argument('--bookings', type=int, default=200000)
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--sample', type=int, default=2000)
+    args = parser.parse_args()
+    bookings = list(syntheticBookings(args.bookings + args.sample))
+    bookingFile = writeFile('.csv', BulkTransfer.BOOKING_FIELDS, bookings[:args.bookings])
+    userFile = writeFile('.csv', BulkTransfer.USER_FIELDS, userRows(args.users, 'bulk'))
+    exportFile = tempfile.mkstemp(suffix='.jsonl')[1]
+    dbPath = createBookingDatabase()
+    try:
+        evt.DBFILE = dbPath
+        evt.conflicts.reset()
+        begin = time.perf_counter()
+        for row in bookings[args.bookings:]:
+            evt.save(row[0], row[1], row[2], row[3], row[4], row[5])
+        single = (time.perf_counter() - begin) / args.sample
+
+        begin = time.perf_counter()
+        imported = BulkTransfer.importBookings(dbPath, bookingFile)
+        bulk = time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        exported = BulkTransfer.export(dbPath, 'bookings', exportFile)
+        exportTime = time.perf_counter() - begin
+
+        print(f'{args.bookings} bookings')
+        print(f'  S2_lib.save one at a time  {single * 1000:8.3f} ms/booking  ({single * args.bookings:8.1f} s projected)')
+        print(f'  BulkTransfer import        {bulk / imported * 1000:8.3f} ms/booking  ({bulk:8.1f} s, {imported} inserted)')
+        print(f'  BulkTransfer export        {exportTime:8.1f} s for {exported} bookings')
+
+        sample = min(args.sample, args.users)
+        checker = DBHandler(dbPath)
+        begin = time.perf_counter()
+        for row in userRows(sample // 10, 'single'):
+            checker.insertNewUserData(*row)
+        single = (time.perf_counter() - begin) / (sample // 10)
+        hasher = PasswordHasher(workers=os.cpu_count() or 1, useProcesses=True)
+        begin = time.perf_counter()
+        imported = BulkTransfer.importUsers(dbPath, userFile, hasher=hasher)
+        bulk = time.perf_counter() - begin
+        hasher.shutdown()
+        print(f'{args.users} users, {os.cpu_count()} CPUs')
+        print(f'  insertNewUserData          {single * 1000:8.3f} ms/user')
+        print(f'  BulkTransfer import        {bulk / imported * 1000:8.3f} ms/user  ({bulk:8.1f} s, {imported} inserted)')
+    finally:
+        DBConnection.closeConnections()
+        removeDatabase(dbPath)
+        for path in (bookingFile, userFile, exportFile):
+            os.remove(path)
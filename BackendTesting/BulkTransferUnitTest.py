@@ -0,0 +1,90 @@
+"""
+Bulk import/export unit testing
+
+Created for CSI2999 Polyrhythm Skate semester project to test BulkTransfer.py
+
+Relevant online documentation:
+N/A
+
+Change Log:
+10/18/2026: Initial Version
+
+Future Task List:
+-
+"""
+import json
+import os
+import tempfile
+import unittest
+
+import BulkTransfer
+import DBConnection
+from DBUserHandler import DBHandler
+from PasswordHasher import PasswordHasher
+from BackendHelper import createBookingDatabase, removeDatabase
+
+
+class BulkTransferUnitTesting(unittest.TestCase):
+    def setUp(self):
+        self.dbPath = createBookingDatabase()
+        self.files = []
+
+    def tearDown(self):
+        DBConnection.closeConnections()
+        removeDatabase(self.dbPath)
+        for path in self.files:
+            os.remove(path)
+
+    def writeFile(self, suffix, text):
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(handle, 'w') as output:
+            output.write(text)
+        self.files.append(path)
+        return path
+
+    def testBookingImport(self):
+        connection = DBConnection.getConnection(self.dbPath)
+        connection.execute("INSERT INTO Booking (start, end, text, color, bg, user_id) VALUES ('2023-06-05 10:00', '2023-06-05 12:00', 'Rink A', '#FFFFFF', '#3b39af', 1);")
+        path = self.writeFile('.csv', 'start,end,text,color,bg,user_id\n'
+                                      '2023-06-05 08:00,2023-06-05 09:00,Rink A,#FFFFFF,#3b39af,1\n'
+                                      '2023-06-05 11:00,2023-06-05 13:00,Rink A,#FFFFFF,#3b39af,2\n'
+                                      '2023-06-05T12:00,2023-06-05T13:00,Rink A,#FFFFFF,#3b39af,2\n'
+                                      '2023-06-05 12:30,2023-06-05 14:00,Rink A,#FFFFFF,#3b39af,3\n'
+                                      '2023-06-05 15:00,2023-06-05 14:00,Rink A,#FFFFFF,#3b39af,3\n'
+                                      'tomorrow,2023-06-05 14:00,Rink A,#FFFFFF,#3b39af,3\n')
+        rejects = []
+        unittest.TestCase.assertEqual(self, first=BulkTransfer.importBookings(self.dbPath, path, batchSize=4, rejects=rejects), second=2)
+        unittest.TestCase.assertEqual(self, first=sorted(reason for record, reason in rejects),
+                                      second=['bad start, end or user_id', 'overlaps an existing booking', 'overlaps another booking in the file', 'start is not before end'])
+        starts = [row[0] for row in connection.execute('SELECT start FROM Booking ORDER BY start;')]
+        unittest.TestCase.assertEqual(self, first=starts, second=['2023-06-05 08:00', '2023-06-05 10:00', '2023-06-05 12:00'])
+        unittest.TestCase.assertEqual(self, first=connection.execute('SELECT revision FROM BookingRevision WHERE user_id=2;').fetchone()[0], second=1)
+
+    def testUserImport(self):
+        path = self.writeFile('.csv', 'Test,Test,Test,test@mail.com,T3stP@ssword\n'
+                                      'TestTwo,TestTwo,TestTwo,test2@mail.com,TestP@ssw0rd\n'
+                                      'Dupe,Dupe,Test,dupe@mail.com,T3stP@ssword\n'
+                                      'Weak,Weak,Weak,weak@mail.com,password\n'
+                                      'Bad1,Bad,Bad,bad@mail.com,T3stP@ssword\n')
+        rejects = []
+        hasher = PasswordHasher(rounds=1000, workers=2)
+        unittest.TestCase.assertEqual(self, first=BulkTransfer.importUsers(self.dbPath, path, hasher=hasher, rejects=rejects), second=2)
+        unittest.TestCase.assertEqual(self, first=len(rejects), second=3)
+        unittest.TestCase.assertTrue(self, expr=DBHandler(self.dbPath, hasher=hasher).attemptLogin('TestP@ssw0rd', Username='TestTwo'), msg='Imported user cannot log in')
+        rejects = []
+        unittest.TestCase.assertEqual(self, first=BulkTransfer.importUsers(self.dbPath, path, hasher=hasher, rejects=rejects), second=0, msg='Users imported twice')
+        hasher.shutdown()
+
+    def testExportRoundTrip(self):
+        source = self.writeFile('.jsonl', '\n'.join(json.dumps({'start': f'2023-06-0{day} 10:00', 'end': f'2023-06-0{day} 11:00', 'user_id': day}) for day in range(1, 6)))
+        BulkTransfer.importBookings(self.dbPath, source)
+        exported = self.writeFile('.jsonl', '')
+        unittest.TestCase.assertEqual(self, first=BulkTransfer.export(self.dbPath, 'bookings', exported), second=5)
+        with open(exported) as handle:
+            records = [json.loads(line) for line in handle]
+        unittest.TestCase.assertEqual(self, first=[(r['start'], r['user_id'], r['text']) for r in records],
+                                      second=[(f'2023-06-0{day} 10:00', day, 'Rink A') for day in range(1, 6)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Booking conflict check benchmark
+
+Created for CSI2999 Polyrhythm Skate semester project to measure how long S2_lib takes to decide whether
+a new slot conflicts with existing bookings as the Booking table grows
+
+Relevant online documentation:
+https://www.sqlite.org/lang_select.html#limitoffset
+
+Change Log:
+10/18/2026 Initial Version, compares the old containment query, the EXISTS overlap query and the interval index
+
+Future Task List:
+-
+
+Usage (from BackendTesting):
+python ConflictBenchmark.py [--sizes 10000 100000 1000000] [--checks 2000]
+"""
+
+import argparse, datetime, os, random, sqlite3, sys, time
+
+sys.path.insert(0, os.path.abspath('..'))
+from app.conflicts import ConflictEngine
+from BackendHelper import createBookingDatabase, removeDatabase, fillBookings, slotText
+
+legacySQL = 'SELECT * FROM BOOKING WHERE ((start >= ?) AND (end <= ?))'
+
+
+def randomSlots(lastSlot, checks):
+    """
+    Half an hour slots inside the last month of the schedule, where new bookings land
+    """
+    rng = random.Random(2999)
+    slots = []
+    for _ in range(checks):
+        start = lastSlot - datetime.timedelta(minutes=30 * rng.randrange(30 * 48))
+        slots.append((slotText(start), slotText(start + datetime.timedelta(minutes=30))))
+    return slots
+
+
+def timeChecks(check, slots):
+    begin = time.perf_counter()
+    for start, end in slots:
+        check(start, end)
+    return (time.perf_counter() - begin) / len(slots) * 1e6
+
+
+def runSize(size, checks):
+    dbPath = createBookingDatabase()
+    try:
+        lastSlot = fillBookings(dbPath, size)
+        slots = randomSlots(lastSlot, checks)
+        connection = sqlite3.connect(dbPath)
+        cursor = connection.cursor()
+        query = ConflictEngine()
+        indexed = ConflictEngine(useIndex=True)
+        # warm the day buckets once so the steady state is measured
+        for start, end in slots:
+            indexed.hasConflict(cursor, start, end)
+        # the old query walks most of the table, so only sample it
+        results = {
+            'legacy containment query': timeChecks(lambda s, e: len(cursor.execute(legacySQL, (s, e)).fetchall()) > 0, slots[:50]),
+            'EXISTS overlap query': timeChecks(lambda s, e: query.hasConflict(cursor, s, e), slots),
+            'interval index': timeChecks(lambda s, e: indexed.hasConflict(cursor, s, e), slots),
+        }
+        connection.close()
+        return results
+    finally:
+        removeDatabase(dbPath)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Conflict check latency benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--checks', type=int, default=2000)
+    args = parser.parse_args()
+    for size in args.sizes:
+        print(f'{size} bookings')
+        for name, micros in runSize(size, args.checks).items():
+            print(f'  {name:<26} {micros:9.1f} us/check')
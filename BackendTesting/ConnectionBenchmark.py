@@ -0,0 +1,80 @@
+"""
+Connection manager benchmark
+
+Created for CSI2999 Polyrhythm Skate semester project to compare requests per second on the calendar
+endpoints with one new sqlite3 connection per call against the shared pool in DBConnection.py
+
+Relevant online documentation:
+https://flask.palletsprojects.com/en/2.3.x/testing/
+
+Change Log:
+10/18/2026 Initial Version
+
+Future Task List:
+-
+
+Usage (from BackendTesting):
+python ConnectionBenchmark.py [--threads 8] [--requests 300]
+"""
+
+import argparse, datetime, os, sys, threading, time
+
+sys.path.insert(0, os.path.abspath('..'))
+import DBConnection
+from app import app
+from app import S2_lib as evt
+from BackendHelper import createBookingDatabase, removeDatabase, fillBookings, slotText
+
+
+def run(threads, requests, pooled):
+    """
+    Every thread alternates /get/ for a month with /save/ of a fresh slot
+    :return: (requests per second, number of failed requests)
+    """
+    DBConnection.POOLING = pooled
+    dbPath = createBookingDatabase()
+    if pooled:
+        # the plain baseline keeps the default rollback journal
+        DBConnection.getConnection(dbPath)
+    fillBookings(dbPath, 20000)
+    evt.DBFILE = dbPath
+    evt.conflicts.reset(useIndex=False)
+    failures = []
+
+    def worker(number):
+        client = app.test_client()
+        for n in range(requests):
+            if n % 2:
+                start = datetime.datetime(2030, 1, 1) + datetime.timedelta(hours=number * requests + n)
+                reply = client.post('/save/', data={'s': slotText(start), 'e': slotText(start + datetime.timedelta(minutes=50)),
+                                                    't': 'Rink A', 'c': '#FFFFFF', 'b': '#3b39af', 'uid': number})
+            else:
+                reply = client.post('/get/', data={'month': 1 + n % 12, 'year': 2022, 'userID': number % 50 + 1})
+            if reply.status_code != 200:
+                failures.append(reply.status_code)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    begin = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - begin
+    DBConnection.closeConnections()
+    removeDatabase(dbPath)
+    return threads * requests / elapsed, len(failures)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Requests per second with and without the connection pool')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=300)
+    args = parser.parse_args()
+    # keep the request log quiet while timing
+    sys.stdout = open(os.devnull, 'w')
+    before = run(args.threads, args.requests, pooled=False)
+    after = run(args.threads, args.requests, pooled=True)
+    sys.stdout = sys.__stdout__
+    print(f'{args.threads} threads x {args.requests} requests (/get/ and /save/ alternating)')
+    print(f'  new connection per call  {before[0]:8.0f} req/s  {before[1]} failed')
+    print(f'  pooled WAL connections   {after[0]:8.0f} req/s  {after[1]} failed')
@@ -13,6 +13,12 @@ N/A
 Change Log:
 5/22/2023: Initial Version
 
+10/18/2026: Tests for hash upgrades on login and the hashing pool queue limit
+
+10/18/2026: Hash upgrades only touch the user who logged in
+
+10/18/2026: A full hashing pool puts a hash upgrade off instead of refusing the login
+
 Future Task List:
 Update values to correspond with new input sanitization rules
 """
@@ -20,6 +26,7 @@ import sqlite3
 import unittest
 
 from DBUserHandler import DBHandler
+from PasswordHasher import PasswordHasher
 from exceptions import *
 
 class DBUserHandlerUnitTesting(unittest.TestCase):
@@ -84,6 +91,63 @@ class DBUserHandlerUnitTesting(unittest.TestCase):
         unittest.TestCase.assertRaises(self, BadPasswordException, testDB.insertNewUserData, *('TestFirstnameOne', 'TestLastnameOne', 'TestUsernameOne', 'test1@mail.com', 'P@ssword'))
         unittest.TestCase.assertRaises(self, BadPasswordException, testDB.insertNewUserData, *('TestFirstnameOne', 'TestLastnameOne', 'TestUsernameOne', 'test1@mail.com', '$H0rt'))
         unittest.TestCase.assertRaises(self, BadPasswordException, testDB.insertNewUserData, *('TestFirstnameOne', 'TestLastnameOne', 'TestUsernameOne', 'test1@mail.com', 'L0ng!aaaaaaaaaaaaaaaa'))
+
+    def testRehashOnLogin(self):
+        testDB = DBHandler('unittestDB.db', hasher=PasswordHasher(rounds=1000))
+        testDB.dbCursor.execute('DELETE FROM Users;')
+        testDB.dbConnection.commit()
+        testDB.insertNewUserData('testFirstNameOne', 'TestLastNameOne', 'testUsernameOne', 'test1@mail.com', 'P@ssword1')
+        unittest.TestCase.assertIn(self, member='$1000$', container=testDB.retrievePassHash(Username='testUsernameOne'))
+        upgradedDB = DBHandler('unittestDB.db', hasher=PasswordHasher(rounds=2000))
+        unittest.TestCase.assertFalse(self, expr=upgradedDB.attemptLogin('P@ssword2', Username='testUsernameOne'))
+        unittest.TestCase.assertIn(self, member='$1000$', container=testDB.retrievePassHash(Username='testUsernameOne'), msg='Hash upgraded on a failed login')
+        unittest.TestCase.assertTrue(self, expr=upgradedDB.attemptLogin('P@ssword1', Username='testUsernameOne'))
+        unittest.TestCase.assertIn(self, member='$2000$', container=testDB.retrievePassHash(Username='testUsernameOne'), msg='Hash not upgraded on login')
+        unittest.TestCase.assertTrue(self, expr=testDB.attemptLogin('P@ssword1', Username='testUsernameOne'))
+        testDB.dbCursor.execute('DELETE FROM Users;')
+        testDB.dbConnection.commit()
+
+    def testRehashOnlyThatUser(self):
+        testDB = DBHandler('unittestDB.db', hasher=PasswordHasher(rounds=1000))
+        testDB.dbCursor.execute('DELETE FROM Users;')
+        testDB.dbConnection.commit()
+        testDB.insertNewUserData('testFirstNameOne', 'TestLastNameOne', 'testUsernameOne', 'test1@mail.com', 'P@ssword1')
+        testDB.insertNewUserData('testFirstNameTwo', 'TestLastNameTwo', 'testUsernameTwo', 'test2@mail.com', 'P@ssword2')
+        # an imported account can carry a copy of another account's hash
+        oldHash = testDB.retrievePassHash(Username='testUsernameOne')
+        testDB.dbCursor.execute('UPDATE Users SET Password=? WHERE Username=?;', (oldHash, 'testUsernameTwo'))
+        testDB.dbConnection.commit()
+        upgradedDB = DBHandler('unittestDB.db', hasher=PasswordHasher(rounds=2000))
+        unittest.TestCase.assertTrue(self, expr=upgradedDB.attemptLogin('P@ssword1', Username='testUsernameOne'))
+        unittest.TestCase.assertIn(self, member='$2000$', container=testDB.retrievePassHash(Username='testUsernameOne'))
+        unittest.TestCase.assertEqual(self, first=testDB.retrievePassHash(Username='testUsernameTwo'), second=oldHash, msg='Hash of another user replaced')
+        testDB.dbCursor.execute('DELETE FROM Users;')
+        testDB.dbConnection.commit()
+
+    def testRehashWhenPoolBusy(self):
+        class BusyHasher(PasswordHasher):
+            def hash(self, rawPassword):
+                raise HashingBusyException('Too many password checks in progress')
+        testDB = DBHandler('unittestDB.db', hasher=PasswordHasher(rounds=1000))
+        testDB.dbCursor.execute('DELETE FROM Users;')
+        testDB.dbConnection.commit()
+        testDB.insertNewUserData('testFirstNameOne', 'TestLastNameOne', 'testUsernameOne', 'test1@mail.com', 'P@ssword1')
+        busyDB = DBHandler('unittestDB.db', hasher=BusyHasher(rounds=2000))
+        unittest.TestCase.assertTrue(self, expr=busyDB.attemptLogin('P@ssword1', Username='testUsernameOne'), msg='Verified login refused for a busy pool')
+        unittest.TestCase.assertIn(self, member='$1000$', container=testDB.retrievePassHash(Username='testUsernameOne'))
+        testDB.dbCursor.execute('DELETE FROM Users;')
+        testDB.dbConnection.commit()
+
+    def testHashingQueueLimit(self):
+        hasher = PasswordHasher(rounds=1000, workers=1, queueLimit=1)
+        hasher.slots.acquire()
+        hasher.slots.acquire()
+        unittest.TestCase.assertRaises(self, HashingBusyException, hasher.hash, 'P@ssword1')
+        hasher.slots.release()
+        unittest.TestCase.assertTrue(self, expr=hasher.verify('P@ssword1', hasher.hash('P@ssword1')))
+        hasher.slots.release()
+        hasher.shutdown()
+
 if __name__ == '__main__':
     # Only for unit testing database connector
     unittest.main()
@@ -17,22 +17,23 @@ N/A
 Change Log:
 6/1/2023 Initial Version
 
+10/18/2026 addDummyData loads logins.csv through BulkTransfer.importUsers in one batch
+
 Future Task List:
 Make more values in logins.csv to populate the table
 """
 
-import sqlite3, pandas, os
-from DBUserHandler import DBHandler
+import sqlite3, os
+import BulkTransfer
 
 def eraseUserData(cursor):
     cursor.execute('DELETE FROM Users;')
 
 def addDummyData(cursor,dbPath):
-    data = pandas.read_csv('logins.csv',header=None)
-    dbFiller = DBHandler(dbPath)
-    for val in data.values:
-        print(val)
-        dbFiller.insertNewUserData(val[0], val[1], val[2], val[3], val[4])
+    rejects = []
+    print('imported', BulkTransfer.importUsers(dbPath, 'logins.csv', rejects=rejects), 'users')
+    for record, reason in rejects:
+        print('skipped', record.get('Username'), reason)
 
 if __name__ == '__main__':
     print('start')
@@ -0,0 +1,91 @@
+"""
+/get/ response encoding benchmark
+
+Created for CSI2999 Polyrhythm Skate semester project to compare the payload size and encode time of the /get/ object
+layout with the columnar layout of app/wire.py, for months with thousands of events
+
+Relevant online documentation:
+https://docs.python.org/3/library/gzip.html
+
+Change Log:
+10/18/2026 Initial Version
+
+Future Task List:
+-
+
+Usage (from BackendTesting):
+python EncodingBenchmark.py [--events 1000 5000 20000] [--repeat 5] [--level 6]
+
+One user's month is filled with --events bookings (written straight to the table, overlapping when there are more
+than fit) in a handful of color pairs. Each layout is timed in three steps, query and layout, serialize and gzip, best of --repeat.
+"""
+
+import argparse, datetime, gzip, os, sqlite3, sys, time
+
+sys.path.insert(0, os.path.abspath('..'))
+import DBConnection
+from app import app
+from app import S2_lib as evt
+from app import wire
+from BackendHelper import createBookingDatabase, removeDatabase, slotText
+
+PALETTE = [('#FFFFFF', '#3b39af'), ('#000000', '#ffcc00'), ('#FFFFFF', '#af3939'), ('#000000', '#8fd18f'), ('#FFFFFF', '#333333')]
+TEXTS = ['Rink A', 'Hockey practice', 'Figure skating lesson', 'Birthday party', 'Public skate']
+
+
+def fillMonth(path, count):
+    # 5 minute steps through June 2023, one hour each
+    rows = []
+    for n in range(count):
+        start = datetime.datetime(2023, 6, 1) + datetime.timedelta(minutes=n * 5 % (29 * 24 * 60))
+        rows.append((slotText(start), slotText(start + datetime.timedelta(hours=1)), TEXTS[n % len(TEXTS)]) + PALETTE[n % len(PALETTE)] + (1,))
+    connection = sqlite3.connect(path)
+    connection.execute('DELETE FROM Booking')
+    connection.executemany('INSERT INTO Booking (start, end, text, color, bg, user_id) VALUES (?, ?, ?, ?, ?, ?)', rows)
+    connection.commit()
+    connection.close()
+
+
+def timed(build, serialize, level):
+    """
+    :return: (body, compressed body, [build, serialize, gzip] seconds)
+    """
+    marks = [time.perf_counter()]
+    payload = build()
+    marks.append(time.perf_counter())
+    body = serialize(payload)
+    marks.append(time.perf_counter())
+    packed = gzip.compress(body, compresslevel=level, mtime=0)
+    marks.append(time.perf_counter())
+    return body, packed, [b - a for a, b in zip(marks, marks[1:])]
+
+
+def layouts():
+    # what /get/ sent before: a dict per event, serialized by Flask's json provider
+    yield 'objects (jsonify)', lambda: evt.get(6, 2023, 1), lambda payload: app.json.dumps(payload).encode()
+    yield 'columns (stdlib json)', lambda: evt.getColumns(6, 2023, 1), lambda payload: wire._encoder.encode(payload).encode()
+    if wire.orjson is not None:
+        yield 'columns (orjson)', lambda: evt.getColumns(6, 2023, 1), wire.orjson.dumps
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='/get/ response encoding benchmark')
+    parser.add_argument('--events', type=int, nargs='+', default=[1000, 5000, 20000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--level', type=int, default=6)
+    args = parser.parse_args()
+    dbPath = createBookingDatabase()
+    evt.DBFILE = dbPath
+    try:
+        for count in args.events:
+            fillMonth(dbPath, count)
+            print(f'{count} events in one month, gzip level {args.level}, best of {args.repeat}')
+            for name, build, serialize in layouts():
+                runs = [timed(build, serialize, args.level) for _ in range(args.repeat)]
+                body, packed = runs[0][:2]
+                build, dump, pack = (min(run[2][n] for run in runs) * 1000 for n in range(3))
+                print(f'  {name:<22} {len(body) / 1024:8.1f} KB  gzip {len(packed) / 1024:7.1f} KB'
+                      f'  query+layout {build:7.2f} ms  serialize {dump:7.2f} ms  gzip {pack:7.2f} ms')
+    finally:
+        DBConnection.closeConnections()
+        removeDatabase(dbPath)
@@ -0,0 +1,79 @@
+"""
+Calendar month query benchmark
+
+Created for CSI2999 Polyrhythm Skate semester project to compare the old three way OR month query in
+S2_lib.get with the single overlap query on the per user span index
+
+Relevant online documentation:
+https://www.sqlite.org/eqp.html
+
+Change Log:
+10/18/2026 Initial Version
+
+Future Task List:
+-
+
+Usage (from BackendTesting):
+python GetBenchmark.py [--bookings 1000000] [--queries 500]
+"""
+
+import argparse, os, random, sys, time
+from calendar import monthrange
+
+sys.path.insert(0, os.path.abspath('..'))
+import DBConnection, DBSchema
+from app import S2_lib as evt
+from BackendHelper import createBookingDatabase, removeDatabase, fillBookings
+
+oldSQL = "SELECT * FROM `Booking` WHERE ((`start` BETWEEN ? AND ?) OR (`end` BETWEEN ? AND ?) OR (`start` <= ? AND `end` >= ?)) AND user_id = ?"
+
+
+def oldBounds(month, year):
+    # the previous string building, kept as it was to time the same query
+    month = month if month > 10 else "0" + str(month)
+    dateYM = str(year) + "-" + str(month) + "-"
+    return dateYM + "01 00:00:00", dateYM + str(monthrange(year, int(month))[1]) + " 23:59:59"
+
+
+def timeQueries(connection, sql, paramsList):
+    begin = time.perf_counter()
+    rows = 0
+    for params in paramsList:
+        rows += len(connection.execute(sql, params).fetchall())
+    return (time.perf_counter() - begin) / len(paramsList) * 1000, rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Month query benchmark')
+    parser.add_argument('--bookings', type=int, default=1000000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--users', type=int, default=50)
+    args = parser.parse_args()
+    # schema version 1 is the table and indexes the old query was written against
+    dbPath = createBookingDatabase(version=1)
+    try:
+        lastSlot = fillBookings(dbPath, args.bookings, args.users)
+        rng = random.Random(2999)
+        months = [(rng.randrange(1, 13), rng.randrange(2020, lastSlot.year + 1), rng.randrange(1, args.users + 1)) for _ in range(args.queries)]
+        connection = DBConnection.openConnection(dbPath)
+        connection.execute('ANALYZE;')
+        plan = connection.execute('EXPLAIN QUERY PLAN ' + oldSQL, ('a', 'b', 'a', 'b', 'a', 'b', 1)).fetchall()
+        oldParams = []
+        for month, year, user in months:
+            start, end = oldBounds(month, year)
+            oldParams.append((start, end, start, end, start, end, user))
+        old = timeQueries(connection, oldSQL, oldParams)
+        connection.close()
+
+        DBSchema.migrate(dbPath)
+        connection = DBConnection.openConnection(dbPath)
+        connection.execute('ANALYZE;')
+        newPlan = connection.execute('EXPLAIN QUERY PLAN ' + evt.GET_SQL, (1, 'a', 'b')).fetchall()
+        new = timeQueries(connection, evt.GET_SQL, [(user,) + evt.monthBounds(month, year) for month, year, user in months])
+        connection.close()
+
+        print(f'{args.bookings} bookings, {args.users} users, {args.queries} random months')
+        print(f'  three way OR query   {old[0]:9.3f} ms/query  ({old[1]} rows)  plan: {" / ".join(r[3] for r in plan)}')
+        print(f'  overlap query        {new[0]:9.3f} ms/query  ({new[1]} rows)  plan: {" / ".join(r[3] for r in newPlan)}')
+    finally:
+        removeDatabase(dbPath)
@@ -0,0 +1,62 @@
+"""
+Input validation unit testing
+
+Created for CSI2999 Polyrhythm Skate semester project to test InputValidator.py
+
+Relevant online documentation:
+N/A
+
+Change Log:
+10/18/2026: Initial Version
+
+Future Task List:
+-
+"""
+import unittest
+
+import InputValidator
+from DBUserHandler import DBHandler
+from exceptions import *
+
+goodUser = {'FirstName': 'Test', 'LastName': "O'Test", 'Username': 'Test-Two', 'Email': 'test.two@mail.oakland.edu', 'Password': 'T3stP@ssword'}
+
+
+class InputValidatorUnitTesting(unittest.TestCase):
+    def testSingleValues(self):
+        for name in ('Test', "O'Neil", 'Smith-Jones', 'St.John'):
+            unittest.TestCase.assertIsNotNone(self, obj=InputValidator.checkName(name), msg=name)
+        for name in ('Test1', "O''Neil", '-Test', 'Smith-Jones-Lee', 'Test Test', ''):
+            unittest.TestCase.assertIsNone(self, obj=InputValidator.checkName(name), msg=name)
+        for email in ('test@mail.com', 'first.last+tag@oakland.edu', 'a_b@host'):
+            unittest.TestCase.assertIsNotNone(self, obj=InputValidator.checkEmail(email), msg=email)
+        for email in ('test.mail.com', 'test@mail..com', 'te st@mail.com', 'test@'):
+            unittest.TestCase.assertIsNone(self, obj=InputValidator.checkEmail(email), msg=email)
+        unittest.TestCase.assertIsNotNone(self, obj=InputValidator.checkPassword('P@ssword1'))
+        unittest.TestCase.assertIsNone(self, obj=InputValidator.checkPassword('P@ss word1'))
+
+    def testFieldErrors(self):
+        unittest.TestCase.assertEqual(self, first=InputValidator.validateUser(goodUser), second=[])
+        errors = InputValidator.validateUser(dict(goodUser, FirstName='Test1', Email='', Password='password'))
+        unittest.TestCase.assertEqual(self, first=[(e.field, e.code) for e in errors],
+                                      second=[('FirstName', 'unsanitary'), ('Email', 'missing'), ('Password', 'weak')])
+        unittest.TestCase.assertIn(self, member='FirstName: may only contain letters', container=InputValidator.describe(errors))
+
+    def testBatch(self):
+        records = [goodUser, dict(goodUser, Username='Test2'), {'FirstName': 'Test'}, dict(goodUser, Username='Other')]
+        valid, invalid = InputValidator.validateUsers(records)
+        unittest.TestCase.assertEqual(self, first=[r['Username'] for r in valid], second=['Test-Two', 'Other'])
+        unittest.TestCase.assertEqual(self, first=[[e.field for e in errors] for record, errors in invalid],
+                                      second=[['Username'], ['LastName', 'Username', 'Email', 'Password']])
+
+    def testHandlerReportsFields(self):
+        testDB = DBHandler('unittestDB.db')
+        try:
+            testDB.insertNewUserData('Test', 'Test1', 'Test', 'bad email', 'P@ssword1')
+        except UnsanitaryInputException as e:
+            unittest.TestCase.assertEqual(self, first=[error.field for error in e.errors], second=['LastName', 'Email'])
+        else:
+            self.fail('Unsanitary input was accepted')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Instrumentation overhead benchmark
+
+Created for CSI2999 Polyrhythm Skate semester project to check that Instrumentation.py costs next to nothing while
+config.METRICS is off, and to see what it costs while it is on
+
+Relevant online documentation:
+N/A
+
+Change Log:
+10/18/2026 Initial Version
+
+Future Task List:
+-
+
+Usage (from BackendTesting):
+python InstrumentationBenchmark.py [--requests 2000]
+"""
+
+import argparse, datetime, os, sys, time
+
+sys.path.insert(0, os.path.abspath('..'))
+import DBConnection
+import Instrumentation
+from app import app
+from app import S2_lib as evt
+from BackendHelper import createBookingDatabase, removeDatabase, slotText
+
+
+def timeRequests(client, count, offset):
+    first = datetime.datetime(2020, 1, 1, 6, 0) + datetime.timedelta(days=offset)
+    begin = time.perf_counter()
+    for n in range(count):
+        start = first + datetime.timedelta(hours=n)
+        client.post('/save/', data={'s': slotText(start), 'e': slotText(start + datetime.timedelta(minutes=30)),
+                                    't': 'Rink A', 'c': '#FFFFFF', 'b': '#3b39af', 'uid': n % 50 + 1})
+        client.get('/events/?' + f'userID={n % 50 + 1}&from=2020-01-01&to=2020-02-01')
+    return (time.perf_counter() - begin) / (2 * count) * 1e6
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Instrumentation overhead benchmark')
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+    dbPath = createBookingDatabase()
+    # the views print every saved booking, keep that out of the numbers
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        evt.DBFILE = dbPath
+        client = app.test_client()
+        results = []
+        for n, enabled in enumerate((False, True, False, True)):
+            # a new connection picks up the factory for the current setting
+            DBConnection.closeConnections()
+            Instrumentation.configure(enabled=enabled)
+            results.append((enabled, timeRequests(client, args.requests, 400 * n)))
+    finally:
+        sys.stdout = sys.__stdout__
+        DBConnection.closeConnections()
+        removeDatabase(dbPath)
+    print(f'{2 * args.requests} requests per run, half /save/ and half /events/')
+    for enabled, micros in results:
+        print(f'  instrumentation {"on " if enabled else "off"}   {micros:8.1f} us/request')
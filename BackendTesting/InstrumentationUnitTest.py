@@ -0,0 +1,113 @@
+"""
+Instrumentation unit testing
+
+Created for CSI2999 Polyrhythm Skate semester project to test the request, section and SQL timings in
+Instrumentation.py and the /metrics endpoint
+
+Relevant online documentation:
+https://prometheus.io/docs/instrumenting/exposition_formats/
+
+Change Log:
+10/18/2026: Initial Version
+10/18/2026: Requests that raise are counted as 500s
+
+Future Task List:
+-
+"""
+import sqlite3
+import unittest
+
+import sqlalchemy
+
+import DBConnection
+import Instrumentation
+from app import app
+from app import S2_lib as evt
+from BackendHelper import createBookingDatabase, removeDatabase
+
+
+class InstrumentationUnitTesting(unittest.TestCase):
+    def setUp(self):
+        self.dbPath = createBookingDatabase()
+        self.oldPath = evt.DBFILE
+        evt.DBFILE = self.dbPath
+        Instrumentation.reset()
+
+    def tearDown(self):
+        Instrumentation.configure(enabled=False)
+        Instrumentation.reset()
+        DBConnection.closeConnections()
+        evt.DBFILE = self.oldPath
+        removeDatabase(self.dbPath)
+
+    def testDisabledIsPassThrough(self):
+        Instrumentation.configure(enabled=False)
+        connection = DBConnection.openConnection(self.dbPath)
+        unittest.TestCase.assertIs(self, expr1=type(connection), expr2=sqlite3.Connection, msg='Disabled instrumentation wrapped the connection')
+        connection.execute('SELECT 1')
+        connection.close()
+        unittest.TestCase.assertIs(self, expr1=Instrumentation.timer('conflicts'), expr2=Instrumentation.timer('commit'))
+        unittest.TestCase.assertEqual(self, first=Instrumentation.queryTimes, second={})
+        unittest.TestCase.assertEqual(self, first=app.test_client().get('/metrics').status_code, second=404)
+
+    def testQueryTimingAndSlowLog(self):
+        Instrumentation.configure(enabled=True, slowQueryMs=0)
+        connection = DBConnection.openConnection(self.dbPath, isolation_level=None)
+        with self.assertLogs('glasspass.slowquery', level='WARNING'):
+            connection.execute('SELECT `id` FROM `Booking`\n  WHERE `id` IN (?, ?, ?)', (1, 2, 3)).fetchall()
+            connection.cursor().execute('SELECT `id` FROM `Booking` WHERE `id` IN (?,?)', (1, 2)).fetchall()
+        connection.close()
+        Instrumentation.configure(enabled=True)
+        label = 'SELECT `id` FROM `Booking` WHERE `id` IN (?...)'
+        unittest.TestCase.assertEqual(self, first=Instrumentation.queryTimes[(label,)].count, second=2, msg='IN lists of different lengths were not one statement')
+        unittest.TestCase.assertEqual(self, first=Instrumentation.slowQueries[(label,)], second=2)
+
+        # Flask-SQLAlchemy gets its connections through the same creator
+        engine = sqlalchemy.create_engine('sqlite://', creator=lambda: DBConnection.openConnection(self.dbPath, check_same_thread=False))
+        with engine.connect() as sqlalchemyConnection:
+            sqlalchemyConnection.execute(sqlalchemy.text('SELECT COUNT(*) FROM Users')).fetchall()
+        engine.dispose()
+        unittest.TestCase.assertIn(self, member=('SELECT COUNT(*) FROM Users',), container=Instrumentation.queryTimes, msg='SQLAlchemy query was not timed')
+
+    def testMetricsEndpoint(self):
+        Instrumentation.configure(enabled=True)
+        client = app.test_client()
+        client.post('/save/', data={'s': '2023-06-05 10:00', 'e': '2023-06-05 11:00', 't': 'Rink A', 'c': '#FFFFFF', 'b': '#3b39af', 'uid': 1})
+        client.post('/save/', data={'s': '2023-06-05 10:30', 'e': '2023-06-05 11:30', 't': 'Rink A', 'c': '#FFFFFF', 'b': '#3b39af', 'uid': 2})
+        response = client.get('/metrics')
+        unittest.TestCase.assertEqual(self, first=response.status_code, second=200)
+        unittest.TestCase.assertTrue(self, expr=response.content_type.startswith('text/plain; version=0.0.4'))
+        text = response.get_data(as_text=True)
+        lines = text.splitlines()
+        unittest.TestCase.assertIn(self, member='glasspass_request_seconds_bucket{endpoint="save",method="POST",le="+Inf"} 2', container=lines)
+        unittest.TestCase.assertIn(self, member='glasspass_request_seconds_count{endpoint="save",method="POST"} 2', container=lines)
+        unittest.TestCase.assertIn(self, member='glasspass_requests_total{endpoint="save",method="POST",status="200"} 2', container=lines)
+        unittest.TestCase.assertIn(self, member='glasspass_section_seconds_count{section="conflicts"} 2', container=lines)
+        unittest.TestCase.assertIn(self, member='glasspass_query_seconds_count{statement="COMMIT"} 1', container=lines, msg='Only the free slot should commit')
+        for line in lines:
+            unittest.TestCase.assertRegex(self, text=line, expected_regex=r'^(# (HELP|TYPE) \w+ .+|\w+(\{.*\})? [0-9.e+-]+)$')
+
+    def testRaisingRequestCounted(self):
+        Instrumentation.configure(enabled=True)
+        save = evt.save
+        def failingSave(*args):
+            raise RuntimeError('save failed')
+        evt.save = failingSave
+        form = {'s': '2023-06-05 10:00', 'e': '2023-06-05 11:00', 't': 'Rink A', 'c': '#FFFFFF', 'b': '#3b39af', 'uid': 1}
+        try:
+            # served, the error handler answers 500
+            with self.assertLogs(app.logger, level='ERROR'):
+                unittest.TestCase.assertEqual(self, first=app.test_client().post('/save/', data=form).status_code, second=500)
+            # propagated, as in debug mode, after_request never runs
+            app.config['PROPAGATE_EXCEPTIONS'] = True
+            with self.assertRaises(RuntimeError):
+                app.test_client().post('/save/', data=form)
+        finally:
+            app.config['PROPAGATE_EXCEPTIONS'] = None
+            evt.save = save
+        unittest.TestCase.assertEqual(self, first=Instrumentation.requestCounts.get(('save', 'POST', '500')), second=2, msg='Raising request was not counted')
+        unittest.TestCase.assertEqual(self, first=Instrumentation.requestTimes[('save', 'POST')].count, second=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Login path benchmark
+
+Created for CSI2999 Polyrhythm Skate semester project to time what a login costs on top of the password
+hash check itself
+
+Relevant online documentation:
+https://docs.python.org/3/library/time.html#time.perf_counter
+
+Change Log:
+10/18/2026 Initial Version, per login DBHandler construction against one shared handler
+10/18/2026 Added --storm, /get/ latency while many threads post /login
+10/18/2026 Rate limit turned off for --storm
+
+Future Task List:
+-
+
+Usage (from BackendTesting):
+python LoginBenchmark.py [--logins 200]
+python LoginBenchmark.py --storm [--threads 16] [--seconds 5]
+"""
+
+import argparse, os, shutil, sys, tempfile, threading, time
+
+sys.path.insert(0, os.path.abspath('..'))
+import DBConnection, DBSchema
+from DBUserHandler import DBHandler
+from PasswordHasher import PasswordHasher
+from BackendHelper import createBookingDatabase, removeDatabase, fillBookings, percentile
+
+
+def perCall(function, count):
+    begin = time.perf_counter()
+    for _ in range(count):
+        function()
+    return (time.perf_counter() - begin) / count * 1000
+
+
+def oldHandler(dbPath):
+    # what every login used to do before touching the password: connect, CREATE TABLE and commit
+    handler = DBHandler(dbPath)
+    handler.createTable('Users')
+    return handler
+
+
+def storm(application, threads, seconds):
+    """
+    Measure /get/ latency from one client while `threads` clients post /login as fast as they can
+    :return: (p50 ms, p99 ms, logins answered, logins rejected with 503)
+    """
+    stop = threading.Event()
+    answered, rejected, latencies = [0], [0], []
+
+    def loginClient():
+        client = application.test_client()
+        while not stop.is_set():
+            reply = client.post('/login', data={'username': 'benchmark', 'password': 'B3nchP@ss'})
+            if reply.status_code == 503:
+                rejected[0] += 1
+            else:
+                answered[0] += 1
+
+    clients = [threading.Thread(target=loginClient) for _ in range(threads)]
+    for client in clients:
+        client.start()
+    calendar = application.test_client()
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        begin = time.perf_counter()
+        calendar.post('/get/', data={'month': 3, 'year': 2020, 'userID': 1})
+        latencies.append((time.perf_counter() - begin) * 1000)
+        time.sleep(0.005)
+    stop.set()
+    for client in clients:
+        client.join()
+    return percentile(latencies, 0.5), percentile(latencies, 0.99), answered[0], rejected[0]
+
+
+def runStorm(threads, seconds):
+    # the app opens SkateDB.db in the working directory, so run it inside a scratch directory
+    workDir = tempfile.mkdtemp()
+    os.chdir(workDir)
+    DBSchema.migrate('SkateDB.db')
+    fillBookings('SkateDB.db', 5000)
+    sys.stdout = open(os.devnull, 'w')
+    import app
+    app.userDB.insertNewUserData('Bench', 'Mark', 'benchmark', 'bench@mail.com', 'B3nchP@ss')
+    # every client is 127.0.0.1, the rate limit would refuse them before the pool is reached, see RateLimitBenchmark.py
+    app.loginLimiter.enabled = False
+    results = {'no logins': storm(app.app, 0, seconds)}
+    app.userDB.hasher = PasswordHasher(workers=threads, queueLimit=threads)
+    results['unbounded hashing'] = storm(app.app, threads, seconds)
+    app.userDB.hasher = PasswordHasher(workers=app.app.config['HASH_WORKERS'], queueLimit=app.app.config['HASH_QUEUE_LIMIT'])
+    results['bounded pool'] = storm(app.app, threads, seconds)
+    sys.stdout = sys.__stdout__
+    print(f'/get/ latency with {threads} threads posting /login for {seconds}s each')
+    for name, (p50, p99, answered, rejected) in results.items():
+        print(f'  {name:<18} p50 {p50:7.2f} ms  p99 {p99:7.2f} ms  logins {answered:5d}  rejected {rejected:5d}')
+    os.chdir('/')
+    shutil.rmtree(workDir)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Login path timing')
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--storm', action='store_true')
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=5)
+    args = parser.parse_args()
+    if args.storm:
+        runStorm(args.threads, args.seconds)
+        sys.exit()
+    dbPath = createBookingDatabase()
+    try:
+        shared = DBHandler(dbPath)
+        shared.insertNewUserData('Bench', 'Mark', 'benchmark', 'bench@mail.com', 'B3nchP@ss')
+        DBConnection.POOLING = False
+        before = perCall(lambda: oldHandler(dbPath).retrievePassHash(Username='benchmark'), args.logins)
+        beforeLogin = perCall(lambda: oldHandler(dbPath).attemptLogin('B3nchP@ss', Username='benchmark'), args.logins // 10)
+        DBConnection.POOLING = True
+        after = perCall(lambda: shared.retrievePassHash(Username='benchmark'), args.logins)
+        afterLogin = perCall(lambda: shared.attemptLogin('B3nchP@ss', Username='benchmark'), args.logins // 10)
+        print('                           handler + hash lookup    full login')
+        print(f'  new handler per login    {before:12.3f} ms        {beforeLogin:8.2f} ms')
+        print(f'  shared handler           {after:12.3f} ms        {afterLogin:8.2f} ms')
+    finally:
+        DBConnection.closeConnections()
+        removeDatabase(dbPath)
@@ -0,0 +1,101 @@
+"""
+Occupancy heatmap benchmark
+
+Created for CSI2999 Polyrhythm Skate semester project to compare reading a month of the heatmap from the
+OccupancyDay buckets with adding up the bookings, series occurrences and sessions of the month on every request
+
+Relevant online documentation:
+N/A
+
+Change Log:
+10/18/2026 Initial Version
+
+Future Task List:
+-
+
+Usage (from BackendTesting):
+python OccupancyBenchmark.py [--bookings 50000] [--queries 200]
+"""
+
+import argparse, datetime, os, random, sys, time
+
+sys.path.insert(0, os.path.abspath('..'))
+import DBConnection
+from app import S2_lib as evt
+from app import occupancy
+from BackendHelper import createBookingDatabase, removeDatabase, slotText
+
+
+def monthDays(month, year):
+    following = datetime.date(year + month // 12, month % 12 + 1, 1)
+    return datetime.date(year, month, 1).isoformat(), following.isoformat()
+
+
+def timeMonths(heatmap, months):
+    begin = time.perf_counter()
+    for month, year in months:
+        heatmap(*monthDays(month, year))
+    return (time.perf_counter() - begin) / len(months) * 1000
+
+
+def recount(first, last):
+    # what /occupancy/ would cost without the buckets
+    cursor = DBConnection.getConnection(evt.DBFILE).cursor()
+    buckets = occupancy.minutesByDay(evt.takenSlots(cursor, first + ' 00:00', last + ' 00:00'))
+    return {day: buckets.get(day, [0] * occupancy.HOURS) for day in occupancy.dayRange(first, last)}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Occupancy heatmap benchmark')
+    parser.add_argument('--bookings', type=int, default=50000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+    dbPath = createBookingDatabase()
+    try:
+        evt.DBFILE = dbPath
+        connection = DBConnection.getConnection(dbPath)
+        first = datetime.datetime(2020, 1, 1, 6, 0)
+        rows = []
+        for n in range(args.bookings):
+            start = first + datetime.timedelta(days=n // 12, hours=n % 12 + 0.5 * (n % 2))
+            rows.append((slotText(start), slotText(start + datetime.timedelta(minutes=45)), 'Rink A', '#FFFFFF', '#3b39af', n % 500 + 1, 0))
+        connection.execute('BEGIN')
+        connection.executemany('INSERT INTO Booking (start, end, text, color, bg, user_id, revision) VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+        connection.execute('COMMIT')
+        connection.execute('ANALYZE')
+        lastYear = 2020 + args.bookings // 12 // 365
+        rng = random.Random(2999)
+        months = [(rng.randrange(1, 13), rng.randrange(2020, lastYear + 1)) for _ in range(args.queries)]
+
+        counted = timeMonths(recount, months)
+        begin = time.perf_counter()
+        for month in range(1, 13):
+            for year in range(2020, lastYear + 1):
+                evt.occupancyMap(*monthDays(month, year))
+        built = (time.perf_counter() - begin) / (12 * (lastYear - 2019)) * 1000
+        bucketed = timeMonths(evt.occupancyMap, months)
+
+        # the extra work every write does inside its transaction to keep built days current
+        cursor = connection.cursor()
+        def timeApply(after):
+            slots = [(slotText(start), slotText(start + datetime.timedelta(minutes=30)))
+                     for start in (after + datetime.timedelta(days=n, hours=13) for n in range(1000))]
+            cursor.execute('BEGIN')
+            begin = time.perf_counter()
+            for slot in slots:
+                occupancy.apply(cursor, [slot])
+            elapsed = time.perf_counter() - begin
+            cursor.execute('ROLLBACK')
+            return elapsed / len(slots) * 1000
+        applyTime = timeApply(first)
+        unbuiltTime = timeApply(datetime.datetime(lastYear + 2, 1, 1))
+
+        print(f'{args.bookings} bookings, {args.queries} random months')
+        print(f'  adding up the month         {counted:8.3f} ms/month')
+        print(f'  first read, builds buckets  {built:8.3f} ms/month')
+        print(f'  OccupancyDay buckets        {bucketed:8.3f} ms/month')
+        print(f'  write, day not built        {unbuiltTime:8.3f} ms/booking')
+        print(f'  write, day built            {applyTime:8.3f} ms/booking')
+    finally:
+        DBConnection.closeConnections()
+        removeDatabase(dbPath)
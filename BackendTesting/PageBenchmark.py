@@ -0,0 +1,77 @@
+"""
+Rendered page cache benchmark
+
+Created for CSI2999 Polyrhythm Skate semester project to measure the CPU time per request of /pricing and
+/information rendered on every hit against served from app/pagecache.py, and of static files fetched in full
+against revalidated with their ETag
+
+Relevant online documentation:
+https://docs.python.org/3/library/time.html#time.thread_time
+
+Change Log:
+10/18/2026 Initial Version
+
+Future Task List:
+-
+
+Usage (from BackendTesting):
+python PageBenchmark.py [--threads 8] [--requests 500]
+
+--threads clients each make --requests requests at once. CPU time is the serving thread's own time, so it does not
+include waiting for other threads. A browser holding a versioned static link makes no request at all until the
+file changes, the 304 row is what an unversioned or expired link costs.
+"""
+
+import argparse, os, sys, threading, time
+
+sys.path.insert(0, os.path.abspath('..'))
+from app import app, pageCache
+from BackendHelper import percentile
+
+
+def load(threads, requests, paths, headers=None):
+    """
+    :return: (per request CPU seconds, wall seconds)
+    """
+    cpu, lock = [], threading.Lock()
+
+    def client():
+        session, mine = app.test_client(), []
+        for n in range(requests):
+            started = time.thread_time()
+            with session.get(paths[n % len(paths)], headers=headers) as reply:
+                reply.get_data()
+            mine.append(time.thread_time() - started)
+        with lock:
+            cpu.extend(mine)
+
+    workers = [threading.Thread(target=client) for _ in range(threads)]
+    begin = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return cpu, time.perf_counter() - begin
+
+
+def report(name, cpu, wall):
+    times = [seconds * 1000 for seconds in cpu]
+    print(f'  {name:<32} {len(cpu) / wall:8.1f} req/s  CPU p50 {percentile(times, 0.5):6.3f} ms'
+          f'  p99 {percentile(times, 0.99):6.3f} ms  mean {sum(times) / len(times):6.3f} ms')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Rendered page cache benchmark')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+    pages = ['/pricing', '/information']
+    print(f'{args.threads} clients x {args.requests} requests')
+    for name, enabled in (('pages, rendered per request', False), ('pages, cached', True)):
+        pageCache.enabled = enabled
+        pageCache.clear()
+        report(name, *load(args.threads, args.requests, pages))
+    with app.test_client() as client:
+        etag = client.get('/static/S4B_calendar.js').headers['ETag']
+    report('S4B_calendar.js, full', *load(args.threads, args.requests, ['/static/S4B_calendar.js']))
+    report('S4B_calendar.js, 304', *load(args.threads, args.requests, ['/static/S4B_calendar.js'], {'If-None-Match': etag}))
@@ -0,0 +1,66 @@
+"""
+Page cache unit testing
+
+Created for CSI2999 Polyrhythm Skate semester project to test the rendered page cache in app/pagecache.py and the
+cache headers on pages and static files
+
+Relevant online documentation:
+https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Cache-Control
+
+Change Log:
+10/18/2026: Initial Version
+
+Future Task List:
+-
+"""
+import os
+import re
+import unittest
+
+from app import app, pageCache
+
+
+class PageCacheUnitTesting(unittest.TestCase):
+    def setUp(self):
+        pageCache.clear()
+        self.client = app.test_client()
+
+    def tearDown(self):
+        pageCache.clear()
+
+    def testPagesRenderOnceAndRevalidate(self):
+        first = self.client.get('/pricing')
+        unittest.TestCase.assertIn(self, member='pricing.html', container=pageCache.pages)
+        unittest.TestCase.assertEqual(self, first=first.headers['Cache-Control'], second='no-cache')
+        unittest.TestCase.assertEqual(self, first=self.client.get('/pricing', headers={'If-None-Match': first.headers['ETag']}).status_code, second=304)
+
+        # touching the base template re-renders the next hit
+        base = os.path.join(app.root_path, 'templates', 'base.html')
+        stat = os.stat(base)
+        cached = pageCache.pages['pricing.html']
+        try:
+            os.utime(base, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+            second = self.client.get('/pricing')
+        finally:
+            os.utime(base, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        unittest.TestCase.assertIsNot(self, expr1=pageCache.pages['pricing.html'], expr2=cached, msg='Edited template served from the cache')
+        unittest.TestCase.assertEqual(self, first=second.get_data(), second=first.get_data())
+
+    def testVersionedStaticFiles(self):
+        page = self.client.get('/information').get_data(as_text=True)
+        link = re.search(r'href="(/static/css/style\.css\?v=\d+)"', page)
+        unittest.TestCase.assertIsNotNone(self, obj=link, msg='Static link has no version')
+        status, headers = self.fetch(link.group(1))
+        unittest.TestCase.assertIn(self, member='immutable', container=headers['Cache-Control'])
+        unittest.TestCase.assertEqual(self, first=self.fetch(link.group(1), {'If-None-Match': headers['ETag']})[0], second=304)
+        # a stale or missing version only gets the default revalidation
+        unittest.TestCase.assertEqual(self, first=self.fetch('/static/css/style.css?v=1')[1]['Cache-Control'], second='no-cache')
+        unittest.TestCase.assertEqual(self, first=self.fetch('/static/css/style.css')[1]['Cache-Control'], second='no-cache')
+
+    def fetch(self, path, headers=None):
+        with self.client.get(path, headers=headers) as reply:
+            return reply.status_code, reply.headers
+
+
+if __name__ == '__main__':
+    unittest.main()
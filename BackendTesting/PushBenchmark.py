@@ -0,0 +1,131 @@
+"""
+Calendar push fan-out benchmark
+
+Created for CSI2999 Polyrhythm Skate semester project to find how many open /stream/ subscribers one worker can keep
+up to date, served as coroutines by app/asgi.py and as one thread each by the Flask view
+
+Relevant online documentation:
+https://html.spec.whatwg.org/multipage/server-sent-events.html
+
+Change Log:
+10/18/2026 Initial Version
+
+Future Task List:
+-
+
+Usage (from BackendTesting):
+python PushBenchmark.py [--subscribers 100 1000 5000] [--events 200] [--rate 100] [--threads-limit 1000]
+
+Every subscriber watches the same month and a publisher thread sends --events booking changes at --rate per second,
+the way S2_lib does after each COMMIT. Delivery latency is from publish() until the subscriber's chunk is written.
+Thread subscribers above --threads-limit are skipped.
+"""
+
+import argparse, asyncio, os, resource, sys, threading, time
+
+sys.path.insert(0, os.path.abspath('..'))
+from app import app
+from app import pubsub
+from app.asgi import application
+from BackendHelper import percentile
+
+QUERY = b'from=2023-06-01&to=2023-07-01'
+
+
+def messageIDs(chunk):
+    return [int(line[4:]) for line in chunk.decode().split('\n') if line.startswith('id: ')]
+
+
+def publishAll(events, rate, published):
+    # stand in for S2_lib.save, one change per booking saved
+    for n in range(events):
+        started = time.perf_counter()
+        event = pubsub.broker.publish('save', n, '2023-06-05 10:00', '2023-06-05 11:00', 1)
+        published[event['id']] = (started, time.perf_counter() - started)
+        time.sleep(1 / rate)
+
+
+def runAsgi(subscribers, events, rate):
+    published, arrivals = {}, []
+    scope = {'type': 'http', 'http_version': '1.1', 'method': 'GET', 'path': '/stream/', 'query_string': QUERY, 'headers': []}
+
+    async def subscriber(disconnect, opened):
+        messages = [{'type': 'http.request', 'body': b''}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await disconnect.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                opened.append(True)
+            now = time.perf_counter()
+            arrivals.extend((eventID, now) for eventID in messageIDs(message.get('body', b'')))
+
+        await application(scope, receive, send)
+
+    async def main():
+        disconnect, opened = asyncio.Event(), []
+        tasks = [asyncio.ensure_future(subscriber(disconnect, opened)) for _ in range(subscribers)]
+        while len(opened) < subscribers:
+            await asyncio.sleep(0.01)
+        await asyncio.to_thread(publishAll, events, rate, published)
+        await asyncio.sleep(0.2)
+        disconnect.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    return published, arrivals
+
+
+def runThreads(subscribers, events, rate):
+    published, arrivals, lock = {}, [], threading.Lock()
+    client, streams = app.test_client(), []
+    for _ in range(subscribers):
+        response = client.get('/stream/?' + QUERY.decode(), buffered=False)
+        chunks = iter(response.response)
+        next(chunks)
+        streams.append((response, chunks))
+
+    def subscriber(chunks):
+        for chunk in chunks:
+            now, ids = time.perf_counter(), messageIDs(chunk)
+            with lock:
+                arrivals.extend((eventID, now) for eventID in ids)
+            if ids and ids[-1] == events:
+                return
+
+    threads = [threading.Thread(target=subscriber, args=(chunks,), daemon=True) for _, chunks in streams]
+    for thread in threads:
+        thread.start()
+    publishAll(events, rate, published)
+    for thread in threads:
+        thread.join(5)
+    for response, _ in streams:
+        response.close()
+    return published, arrivals
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Calendar push fan-out benchmark')
+    parser.add_argument('--subscribers', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--events', type=int, default=200)
+    parser.add_argument('--rate', type=float, default=100)
+    parser.add_argument('--threads-limit', type=int, default=1000)
+    args = parser.parse_args()
+    pubsub.broker.configure(maxSubscribers=max(args.subscribers))
+    print(f'{args.events} changes at {args.rate:.0f}/s, every subscriber watching the changed month')
+    for count in args.subscribers:
+        for name, run in (('asgi coroutines', runAsgi), ('flask threads', runThreads)):
+            if run is runThreads and count > args.threads_limit:
+                continue
+            pubsub.broker = pubsub.Broker(maxSubscribers=count)
+            memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            published, arrivals = run(count, args.events, args.rate)
+            delays = [(now - published[eventID][0]) * 1000 for eventID, now in arrivals if eventID in published]
+            costs = [cost * 1000 for _, cost in published.values()]
+            print(f'  {count:6d} {name:<16} delivered {len(delays) / (count * args.events):6.1%}  publish p50 {percentile(costs, 0.5):6.2f} ms'
+                  f'  delivery p50 {percentile(delays, 0.5):7.2f} ms  p99 {percentile(delays, 0.99):7.2f} ms'
+                  f'  peak RSS +{(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - memory) / 1024:.1f} MB')
@@ -0,0 +1,105 @@
+"""
+Calendar push unit testing
+
+Created for CSI2999 Polyrhythm Skate semester project to test the change broadcast in app/pubsub.py, the events
+app/S2_lib.py publishes and the /stream/ Server-Sent Events endpoint
+
+Relevant online documentation:
+https://html.spec.whatwg.org/multipage/server-sent-events.html
+
+Change Log:
+10/18/2026: Initial Version
+
+Future Task List:
+-
+"""
+import json
+import unittest
+
+from app import app
+from app import S2_lib as evt
+from app import pubsub
+from BackendHelper import createBookingDatabase, removeDatabase
+
+june = ('2023-06-01 00:00', '2023-07-01 00:00')
+
+
+class PushUnitTesting(unittest.TestCase):
+    def setUp(self):
+        self.dbPath = createBookingDatabase()
+        self.oldPath = evt.DBFILE
+        evt.DBFILE = self.dbPath
+
+    def tearDown(self):
+        evt.DBFILE = self.oldPath
+        removeDatabase(self.dbPath)
+
+    def testRangesAndLimit(self):
+        broker = pubsub.Broker(maxSubscribers=2)
+        subscription = broker.subscribe(*june)
+        broker.subscribe('2023-08-01 00:00', '2023-09-01 00:00')
+        unittest.TestCase.assertIsNone(self, obj=broker.subscribe(*june), msg='Subscriber limit ignored')
+        broker.publish('save', 1, '2023-06-05 10:00', '2023-06-05 11:00')
+        broker.publish('save', 2, '2023-07-05 10:00', '2023-07-05 11:00')
+        broker.publish('save', 3, '2023-07-06 10:00', '2023-07-06 11:00', old=('2023-06-30 23:00', '2023-07-01 01:00'))
+        broker.publish('delete', 4, '2023-05-31 23:00', '2023-06-01 00:00')
+        unittest.TestCase.assertEqual(self, first=[e['booking'] for e in subscription.wait(0)], second=[1, 3], msg='Moved out booking not sent to its old month')
+        broker.unsubscribe(subscription)
+        unittest.TestCase.assertEqual(self, first=broker.count(), second=1)
+
+    def testReplayAndReset(self):
+        broker = pubsub.Broker()
+        for n in range(3):
+            broker.publish('save', n, '2023-06-05 10:00', '2023-06-05 11:00')
+        unittest.TestCase.assertEqual(self, first=[e['id'] for e in broker.subscribe(*june, since=1).drain()], second=[2, 3])
+        unittest.TestCase.assertEqual(self, first=broker.subscribe(*june, since=3).drain(), second=[])
+        unittest.TestCase.assertEqual(self, first=broker.subscribe(*june, since=99).drain(), second=[pubsub.RESET], msg='Id from before a restart replayed')
+        for n in range(pubsub.HISTORY):
+            broker.publish('save', n, '2023-06-05 10:00', '2023-06-05 11:00')
+        unittest.TestCase.assertEqual(self, first=broker.subscribe(*june, since=1).drain(), second=[pubsub.RESET], msg='Gap older than the history replayed')
+
+        # a subscriber that stops reading is told to reload instead of growing without bound
+        slow = broker.subscribe(*june)
+        for n in range(pubsub.MAX_PENDING + 1):
+            broker.publish('save', n, '2023-06-05 10:00', '2023-06-05 11:00')
+        unittest.TestCase.assertIs(self, expr1=slow.drain()[0], expr2=pubsub.RESET)
+
+    def testLibraryPublishesCommittedChanges(self):
+        subscription = pubsub.broker.subscribe(*june)
+        try:
+            evt.save('2023-06-05 10:00', '2023-06-05 11:00', 'Rink A', '#FFFFFF', '#3b39af', 1)
+            evt.save('2023-06-05 10:30', '2023-06-05 11:30', 'Rink A', '#FFFFFF', '#3b39af', 2)
+            (saved,) = subscription.drain()
+            unittest.TestCase.assertEqual(self, first=(saved['op'], saved['s'], saved['uid']), second=('save', '2023-06-05 10:00', 1), msg='Conflicting save was published')
+            evt.save('2023-06-06 10:00', '2023-06-06 11:00', 'Rink A', '#FFFFFF', '#3b39af', 1, saved['booking'])
+            (moved,) = subscription.drain()
+            unittest.TestCase.assertEqual(self, first=moved['old'], second=['2023-06-05 10:00', '2023-06-05 11:00'])
+            evt.delete(saved['booking'])
+            unittest.TestCase.assertEqual(self, first=[(e['op'], e['s']) for e in subscription.drain()], second=[('delete', '2023-06-06 10:00')])
+
+            seriesID = evt.saveSeries('2023-06-07 18:00', '2023-06-07 19:00', 'Rink A', '#FFFFFF', '#3b39af', 1, 'WEEKLY', count=3)
+            evt.delete(f's{seriesID}:2023-06-14 18:00')
+            evt.deleteSeries(seriesID)
+            unittest.TestCase.assertEqual(self, first=[(e['op'], e['booking']) for e in subscription.drain()],
+                                          second=[('series', f's{seriesID}'), ('delete', f's{seriesID}:2023-06-14 18:00'), ('series', f's{seriesID}')])
+        finally:
+            pubsub.broker.unsubscribe(subscription)
+
+    def testStreamEndpoint(self):
+        client = app.test_client()
+        unittest.TestCase.assertEqual(self, first=client.get('/stream/?from=2023-06-01').status_code, second=400)
+        response = client.get('/stream/?from=2023-06-01&to=2023-07-01', buffered=False)
+        unittest.TestCase.assertEqual(self, first=response.mimetype, second='text/event-stream')
+        chunks = iter(response.response)
+        unittest.TestCase.assertEqual(self, first=next(chunks), second=pubsub.OPENING.encode())
+        evt.save('2023-06-05 10:00', '2023-06-05 11:00', 'Rink A', '#FFFFFF', '#3b39af', 1)
+        message = next(chunks).decode()
+        unittest.TestCase.assertTrue(self, expr=message.startswith('id: ') and '\nevent: booking\n' in message)
+        unittest.TestCase.assertEqual(self, first=json.loads(message.split('data: ', 1)[1])['s'], second='2023-06-05 10:00')
+        before = pubsub.broker.count()
+        response.close()
+        unittest.TestCase.assertEqual(self, first=pubsub.broker.count(), second=before - 1, msg='Closed stream still subscribed')
+
+
+if __name__ == '__main__':
+    unittest.main()
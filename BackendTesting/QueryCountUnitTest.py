@@ -0,0 +1,104 @@
+"""
+Queries per endpoint unit testing
+
+Created for CSI2999 Polyrhythm Skate semester project to pin how many SQL statements each endpoint runs, so a
+second lookup of the user on login or a query per row creeping into a page shows up as a failing test
+
+Relevant online documentation:
+https://flask.palletsprojects.com/en/2.3.x/testing/
+
+Change Log:
+10/18/2026: Initial Version
+10/18/2026: Archive year lookup for past months
+
+Future Task List:
+-
+
+Statements are counted with Instrumentation.py, which sees every connection DBConnection.py opens, Flask-SQLAlchemy's
+included. BEGIN and COMMIT count as statements.
+"""
+import datetime
+import unittest
+
+import DBConnection
+import Instrumentation
+from app import app, db, userCache, loginLimiter
+from app import S2_lib as evt
+from app import views
+from DBUserHandler import DBHandler
+from PasswordHasher import PasswordHasher
+from BackendHelper import createBookingDatabase, removeDatabase
+
+
+class QueryCountUnitTesting(unittest.TestCase):
+    def setUp(self):
+        self.dbPath = createBookingDatabase()
+        self.oldPath, self.oldUserDB = evt.DBFILE, views.userDB
+        evt.DBFILE = self.dbPath
+        views.userDB = DBHandler(self.dbPath, hasher=PasswordHasher(rounds=1000))
+        views.userDB.insertNewUserData('Ada', 'Lovelace', 'adaLovelace', 'ada@mail.com', 'P@ssword1')
+        userCache.clear()
+        loginLimiter.clear()
+        # connections opened from here on are instrumented
+        Instrumentation.configure(enabled=True, slowQueryMs=60000)
+        DBConnection.closeConnections()
+        # open the test client's connection now, its PRAGMAs are not a request's work
+        DBConnection.getConnection(self.dbPath)
+        with app.app_context():
+            db.engine.dispose()
+        self.client = app.test_client()
+
+    def tearDown(self):
+        Instrumentation.configure(enabled=False)
+        Instrumentation.reset()
+        DBConnection.closeConnections()
+        userCache.clear()
+        evt.DBFILE, views.userDB = self.oldPath, self.oldUserDB
+        removeDatabase(self.dbPath)
+
+    def queries(self, method, path, **kwargs):
+        """
+        :return: (response, statements run while serving it)
+        """
+        Instrumentation.reset()
+        response = getattr(self.client, method)(path, **kwargs)
+        return response, sum(histogram.count for histogram in Instrumentation.queryTimes.values())
+
+    def assertQueries(self, expected, method, path, **kwargs):
+        response, count = self.queries(method, path, **kwargs)
+        unittest.TestCase.assertLess(self, a=response.status_code, b=400, msg=f'{method} {path} failed')
+        unittest.TestCase.assertEqual(self, first=count, second=expected, msg=f'{method} {path} ran {count} statements: {sorted(Instrumentation.queryTimes)}')
+        return response
+
+    def testUserPages(self):
+        response = self.assertQueries(1, 'post', '/login', data={'username': 'adaLovelace', 'password': 'P@ssword1'})
+        unittest.TestCase.assertIn(self, member=b'id="userID" value="1"', container=response.get_data(), msg='Not logged in')
+        # login filled the profile cache, pages need no query
+        self.assertQueries(0, 'get', '/times')
+        userCache.clear()
+        self.assertQueries(1, 'get', '/times')
+        self.assertQueries(0, 'get', '/times')
+        # the same for everyone, served from the page cache without looking up the user
+        userCache.clear()
+        self.assertQueries(0, 'get', '/pricing')
+        self.assertQueries(0, 'get', '/information')
+        response = self.assertQueries(1, 'post', '/login', data={'username': 'adaLovelace', 'password': 'wrong'})
+        unittest.TestCase.assertIn(self, member=b'Incorrect Password.', container=response.get_data())
+        response = self.assertQueries(1, 'post', '/login', data={'username': 'nobody', 'password': 'P@ssword1'})
+        unittest.TestCase.assertIn(self, member=b'doesn&#39;t exist', container=response.get_data())
+
+    def testCalendarEndpoints(self):
+        booking = {'s': '2023-06-05 10:00', 'e': '2023-06-05 11:00', 't': 'Rink A', 'c': '#FFFFFF', 'b': '#3b39af', 'uid': 1}
+        # BEGIN, four conflict checks (the archive one as 2023 is past), revision bump, insert, occupancy read and write, COMMIT
+        self.assertQueries(10, 'post', '/save/', data=booking)
+        self.assertQueries(3, 'post', '/get/', data={'month': 6, 'year': 2023, 'userID': 1})
+        self.assertQueries(3, 'post', '/get/', data={'month': 6, 'year': 2023, 'userID': 1, 'format': 'columns'})
+        # revision, bookings, archive years, series
+        response = self.assertQueries(4, 'get', '/events/?userID=1&from=2023-06-01&to=2023-07-01')
+        self.assertQueries(1, 'get', '/events/?userID=1&from=2023-06-01&to=2023-07-01', headers={'If-None-Match': response.headers['ETag']})
+        # months that cannot have archived bookings skip the lookup
+        following = datetime.date.today() + datetime.timedelta(days=40)
+        self.assertQueries(2, 'post', '/get/', data={'month': following.month, 'year': following.year, 'userID': 1})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Login rate limit benchmark
+
+Created for CSI2999 Polyrhythm Skate semester project to measure what a refused /login costs against one that is
+let through to the password check, and the cost of the limiter check itself with each store in app/ratelimit.py
+
+Relevant online documentation:
+https://docs.python.org/3/library/time.html#time.process_time
+
+Change Log:
+10/18/2026 Initial Version
+
+Future Task List:
+-
+
+Usage (from BackendTesting):
+python RateLimitBenchmark.py [--attempts 2000] [--rounds 29000]
+
+--rounds is the pbkdf2 rounds of the stored hash, config.py HASH_ROUNDS by default. Times are process CPU time,
+which includes the hashing pool's threads. The guessing client posts a
+wrong password for a real user from one address, as a credential stuffing burst does.
+"""
+
+import argparse, os, sys, time
+
+sys.path.insert(0, os.path.abspath('..'))
+import DBConnection
+from app import app, views
+from app.ratelimit import LoginLimiter
+from DBUserHandler import DBHandler
+from PasswordHasher import PasswordHasher
+from BackendHelper import createBookingDatabase, removeDatabase, percentile
+
+
+def perCall(function, count):
+    """
+    :return: CPU microseconds of each call
+    """
+    times = []
+    for _ in range(count):
+        started = time.process_time()
+        function()
+        times.append((time.process_time() - started) * 1000000)
+    return times
+
+
+def report(name, times):
+    print(f'  {name:<34} p50 {percentile(times, 0.5):10.1f} us  p99 {percentile(times, 0.99):10.1f} us  mean {sum(times) / len(times):10.1f} us')
+
+
+def guess(client):
+    with client.post('/login', data={'username': 'benchmark', 'password': 'Wr0ngP@ss'}) as reply:
+        reply.get_data()
+        return reply.status_code
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Login rate limit benchmark')
+    parser.add_argument('--attempts', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=app.config['HASH_ROUNDS'])
+    args = parser.parse_args()
+    dbPath, limitPath = createBookingDatabase(), createBookingDatabase()
+    try:
+        views.userDB = DBHandler(dbPath, hasher=PasswordHasher(rounds=args.rounds))
+        views.userDB.insertNewUserData('Bench', 'Mark', 'benchmark', 'bench@mail.com', 'B3nchP@ss')
+        client = app.test_client()
+
+        print(f'/login with a wrong password, pbkdf2 {args.rounds} rounds')
+        views.loginLimiter = LoginLimiter(enabled=False)
+        report('let through to the hash check', perCall(lambda: guess(client), max(args.attempts // 20, 10)))
+        views.loginLimiter = LoginLimiter()
+        while guess(client) != 429:
+            pass
+        report('refused with 429', perCall(lambda: guess(client), args.attempts))
+        # the floor of any request through Flask, a page served from app/pagecache.py
+        report('GET /pricing for comparison', perCall(lambda: client.get('/pricing').get_data(), args.attempts))
+
+        print('limiter check alone')
+        for name, limiter in (('memory store', LoginLimiter()), ('sqlite store', LoginLimiter(dbPath=limitPath))):
+            for _ in range(10):
+                limiter.failed('benchmark')
+            report(f'{name}, refused', perCall(lambda: limiter.attempt('benchmark', '10.0.0.1'), args.attempts))
+            # below the 30 per address default
+            report(f'{name}, allowed and counted', perCall(lambda: limiter.attempt('someone', '10.0.0.2'), 25))
+    finally:
+        DBConnection.closeConnections()
+        removeDatabase(dbPath)
+        removeDatabase(limitPath)
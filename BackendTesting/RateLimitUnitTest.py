@@ -0,0 +1,96 @@
+"""
+Login rate limit unit testing
+
+Created for CSI2999 Polyrhythm Skate semester project to test the sliding window login limits in app/ratelimit.py
+
+Relevant online documentation:
+https://developer.mozilla.org/en-US/docs/Web/HTTP/Status/429
+
+Change Log:
+10/18/2026: Initial Version
+
+Future Task List:
+-
+"""
+import unittest
+
+import DBConnection
+from app import app
+from app import views
+from app.ratelimit import LoginLimiter, MemoryStore, SQLiteStore, SlidingWindow
+from DBUserHandler import DBHandler
+from PasswordHasher import PasswordHasher
+from BackendHelper import createBookingDatabase, removeDatabase
+
+
+class RateLimitUnitTesting(unittest.TestCase):
+    def setUp(self):
+        self.dbPath = createBookingDatabase()
+
+    def tearDown(self):
+        DBConnection.closeConnections()
+        removeDatabase(self.dbPath)
+
+    def checkWindow(self, store):
+        window = SlidingWindow(store, 'u', limit=3, seconds=100)
+        for now in (1000, 1010, 1020):
+            unittest.TestCase.assertEqual(self, first=window.retryAfter('ada', now), second=0)
+            window.hit('ada', now)
+        for now in (1030, 1040, 1050):
+            window.hit('ada', now)
+        # 6 in [1000, 1100), refused until half of them have slid out of the window at 1150
+        unittest.TestCase.assertEqual(self, first=window.retryAfter('ada', 1060), second=90)
+        unittest.TestCase.assertEqual(self, first=window.retryAfter('ada', 1140), second=10)
+        unittest.TestCase.assertEqual(self, first=window.retryAfter('ada', 1151), second=0)
+        unittest.TestCase.assertEqual(self, first=window.retryAfter('grace', 1050), second=0)
+        # two windows later nothing is left
+        unittest.TestCase.assertEqual(self, first=store.counts('u:ada', 12), second=(0, 0))
+        window.reset('ada')
+        unittest.TestCase.assertEqual(self, first=window.retryAfter('ada', 1050), second=0)
+
+    def testMemoryWindow(self):
+        self.checkWindow(MemoryStore())
+
+    def testSQLiteWindow(self):
+        self.checkWindow(SQLiteStore(self.dbPath))
+        # another worker's store sees the same counts
+        SlidingWindow(SQLiteStore(self.dbPath), 'u', 3, 100).hit('ada', 1000)
+        unittest.TestCase.assertEqual(self, first=SQLiteStore(self.dbPath).counts('u:ada', 10), second=(1, 0))
+
+    def testMemoryStoreIsBounded(self):
+        store = MemoryStore(maxKeys=2)
+        for key in ('a', 'b', 'c'):
+            store.add(key, 1)
+        unittest.TestCase.assertEqual(self, first=list(store.entries), second=['b', 'c'])
+
+    def testLoginRefusedBeforeHashing(self):
+        oldUserDB, oldLimiter = views.userDB, views.loginLimiter
+        views.userDB = DBHandler(self.dbPath, hasher=PasswordHasher(rounds=1000))
+        views.userDB.insertNewUserData('Ada', 'Lovelace', 'adaLovelace', 'ada@mail.com', 'P@ssword1')
+        views.loginLimiter = LoginLimiter(perUser=2, perAddress=4, seconds=300)
+        verified = []
+        verify = views.userDB.hasher.verify
+        views.userDB.hasher.verify = lambda *args: verified.append(1) or verify(*args)
+        client = app.test_client()
+        try:
+            for _ in range(2):
+                client.post('/login', data={'username': 'adaLovelace', 'password': 'wrong'})
+            reply = client.post('/login', data={'username': 'adaLovelace', 'password': 'P@ssword1'})
+            unittest.TestCase.assertEqual(self, first=reply.status_code, second=429)
+            unittest.TestCase.assertGreater(self, a=int(reply.headers['Retry-After']), b=0)
+            unittest.TestCase.assertEqual(self, first=len(verified), second=2, msg='Refused login hashed the password')
+
+            # other users from the same address still get in until the address limit
+            views.userDB.insertNewUserData('Grace', 'Hopper', 'graceHopper', 'grace@mail.com', 'P@ssword1')
+            unittest.TestCase.assertEqual(self, first=client.post('/login', data={'username': 'graceHopper', 'password': 'P@ssword1'}).status_code, second=200)
+            unittest.TestCase.assertEqual(self, first=client.post('/login', data={'username': 'graceHopper', 'password': 'P@ssword1'}).status_code, second=200)
+            unittest.TestCase.assertEqual(self, first=client.post('/login', data={'username': 'graceHopper', 'password': 'P@ssword1'}).status_code, second=429)
+            other = app.test_client()
+            unittest.TestCase.assertEqual(self, first=other.post('/login', data={'username': 'graceHopper', 'password': 'P@ssword1'},
+                                                                  environ_base={'REMOTE_ADDR': '10.0.0.2'}).status_code, second=200)
+        finally:
+            views.userDB, views.loginLimiter = oldUserDB, oldLimiter
+
+
+if __name__ == '__main__':
+    unittest.main()
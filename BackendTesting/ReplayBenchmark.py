@@ -0,0 +1,301 @@
+"""
+Request log replay benchmark
+
+Created for CSI2999 Polyrhythm Skate semester project to replay a request log against the whole Flask app, either
+in process through the test client or over HTTP against a multi worker server on localhost, and report throughput
+and p50/p95/p99 latency per endpoint on a database scaled to a chosen number of users and bookings
+
+Relevant online documentation:
+https://flask.palletsprojects.com/en/2.3.x/testing/
+https://werkzeug.palletsprojects.com/en/2.3.x/serving/
+https://docs.gunicorn.org/en/stable/run.html
+
+Change Log:
+10/18/2026 Initial Version
+10/18/2026 --server asgi runs app/asgi.py under uvicorn
+
+Future Task List:
+-
+
+Usage (from BackendTesting):
+python ReplayBenchmark.py --write-log replay.jsonl [--requests 5000] [--users 1000] [--bookings 100000]
+python ReplayBenchmark.py [--log replay.jsonl] [--users 1000] [--bookings 100000] [--mode client|server]
+                          [--server wsgi|asgi] [--workers 4] [--concurrency 8] [--results replay-results.jsonl]
+
+Without --log a log of --requests requests is generated from --seed. A log only makes sense against a database
+of the size it was generated for, since it refers to users and booking ids by number. --results appends one JSON
+line per run (date, commit, sizes, throughput and per endpoint percentiles) so runs can be compared over time.
+Server mode with --server asgi runs app/asgi.py under uvicorn with --workers workers (uvicorn must be installed).
+With --server wsgi it uses gunicorn with --workers prefork workers when it is installed. The werkzeug fallback forks a new
+process for every request when --workers is above 1, which mostly measures fork cost, use --workers 1 for its
+threaded server instead.
+
+The requests.jsonl at the top of the repository is the project backlog, not a traffic log, use --write-log.
+
+Log format, one JSON object per line:
+{"session": 3, "method": "POST", "path": "/get/", "form": {"month": 3, "year": 2020, "userID": 4}}
+{"session": 3, "method": "GET", "path": "/events/", "query": {"userID": 4, "from": "2020-03-01", "to": "2020-04-01"}}
+session groups requests that share a cookie jar (a login followed by page views), method and path are required,
+form is sent as the POST body and query as the query string.
+"""
+
+import argparse, datetime, http.cookiejar, importlib.util, json, os, random, shutil, socket, subprocess, sys
+import tempfile, threading, time, urllib.error, urllib.parse, urllib.request
+
+sys.path.insert(0, os.path.abspath('..'))
+import config, DBSchema
+from PasswordHasher import PasswordHasher
+from BackendHelper import fillBookings, fillUsers, syntheticUsername, percentile, firstSlot, slotText
+
+repoRoot = os.path.abspath('..')
+PASSWORD = 'B3nchP@ss'
+PAGES = ('/', '/pricing', '/information', '/times')
+# share of the generated log per kind of request
+MIX = (('get', 30), ('events', 15), ('save', 15), ('delete', 5), ('login', 5), ('page', 30))
+
+
+def generateLog(count, users, bookings, seed):
+    """
+    Synthetic request log for a database filled by createData
+    :return: list of request records
+    """
+    rng = random.Random(seed)
+    kinds = [kind for kind, weight in MIX for _ in range(weight)]
+    days = max(1, bookings // 12)
+    deletable = list(range(1, bookings + 1))
+    rng.shuffle(deletable)
+    log = []
+    for _ in range(count):
+        kind = rng.choice(kinds)
+        session = rng.randrange(max(1, users))
+        userID = session + 1
+        day = firstSlot + datetime.timedelta(days=rng.randrange(days))
+        if kind == 'get':
+            record = {'method': 'POST', 'path': '/get/', 'form': {'month': day.month, 'year': day.year, 'userID': userID}}
+        elif kind == 'events':
+            following = datetime.date(day.year + day.month // 12, day.month % 12 + 1, 1)
+            record = {'method': 'GET', 'path': '/events/',
+                      'query': {'userID': userID, 'from': f'{day.year}-{day.month:02d}-01', 'to': following.isoformat()}}
+        elif kind == 'save':
+            # any hour of the day, so some land on the generated bookings and conflict
+            start = day.replace(hour=0) + datetime.timedelta(hours=rng.randrange(24))
+            record = {'method': 'POST', 'path': '/save/',
+                      'form': {'s': slotText(start), 'e': slotText(start + datetime.timedelta(minutes=30)), 't': 'Rink A',
+                               'c': '#FFFFFF', 'b': '#3b39af', 'uid': userID}}
+        elif kind == 'delete' and deletable:
+            record = {'method': 'POST', 'path': '/delete/', 'form': {'id': deletable.pop()}}
+        elif kind == 'login':
+            # one in ten with the wrong password
+            password = PASSWORD if rng.random() >= 0.1 else 'Wr0ngP@ss'
+            record = {'method': 'POST', 'path': '/login', 'form': {'username': syntheticUsername(session), 'password': password}}
+        else:
+            record = {'method': 'GET', 'path': rng.choice(PAGES)}
+        record['session'] = session
+        log.append(record)
+    return log
+
+
+def readLog(path):
+    with open(path) as source:
+        return [json.loads(line) for line in source if line.strip()]
+
+
+def writeLog(path, log):
+    with open(path, 'w') as output:
+        for record in log:
+            output.write(json.dumps(record) + '\n')
+
+
+def createData(directory, users, bookings):
+    """
+    SkateDB.db in directory with `users` users sharing PASSWORD and `bookings` bookings spread over them
+    :return: database path
+    """
+    dbPath = os.path.join(directory, 'SkateDB.db')
+    DBSchema.migrate(dbPath)
+    fillUsers(dbPath, users, PasswordHasher(rounds=config.HASH_ROUNDS).hash(PASSWORD))
+    if bookings:
+        fillBookings(dbPath, bookings, max(1, users))
+    return dbPath
+
+
+def replayClient(log):
+    """
+    Replay in this process through the Flask test client, one client (cookie jar) per session
+    :return: ([(path, status, seconds)], wall seconds)
+    """
+    # the app opens SkateDB.db in the working directory, import it only once createData has run there
+    from app import app
+    clients, samples = {}, []
+    sys.stdout = open(os.devnull, 'w')
+    begin = time.perf_counter()
+    try:
+        for record in log:
+            client = clients.get(record['session'])
+            if client is None:
+                client = clients[record['session']] = app.test_client()
+            started = time.perf_counter()
+            reply = client.open(record['path'], method=record['method'], data=record.get('form'), query_string=record.get('query'))
+            reply.get_data()
+            samples.append((record['path'], reply.status_code, time.perf_counter() - started))
+    finally:
+        sys.stdout.close()
+        sys.stdout = sys.__stdout__
+    return samples, time.perf_counter() - begin
+
+
+def freePort():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def startServer(directory, workers, server='wsgi'):
+    """
+    Serve the app from directory on a free localhost port. For wsgi with gunicorn when it is installed and
+    otherwise the werkzeug server, forking per request when workers > 1, for asgi with uvicorn
+    :return: (process, base url, description)
+    """
+    port = freePort()
+    env = dict(os.environ, PYTHONPATH=repoRoot)
+    if server == 'asgi':
+        if importlib.util.find_spec('uvicorn') is None:
+            raise RuntimeError('--server asgi needs uvicorn, pip install -r requirements.txt')
+        command = [sys.executable, '-m', 'uvicorn', 'app.asgi:application', '--workers', str(workers),
+                   '--host', '127.0.0.1', '--port', str(port), '--no-access-log']
+        description = f'uvicorn asgi, {workers} workers'
+    elif importlib.util.find_spec('gunicorn') is not None:
+        command = [sys.executable, '-m', 'gunicorn', '-w', str(workers), '-b', f'127.0.0.1:{port}', 'app:app']
+        description = f'gunicorn, {workers} workers'
+    else:
+        serve = (f'from werkzeug.serving import run_simple; from app import app; '
+                 f'run_simple("127.0.0.1", {port}, app, threaded={workers <= 1}, processes={max(1, workers)})')
+        command = [sys.executable, '-c', serve]
+        description = f'werkzeug, {workers} processes' if workers > 1 else 'werkzeug, threaded'
+    process = subprocess.Popen(command, cwd=directory, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return process, f'http://127.0.0.1:{port}', description
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError('server did not start')
+
+
+def replayServer(log, baseURL, concurrency):
+    """
+    Replay over HTTP from `concurrency` threads, each session's requests stay in order on one thread
+    :return: ([(path, status, seconds)], wall seconds)
+    """
+    shares = [[] for _ in range(concurrency)]
+    for record in log:
+        shares[record['session'] % concurrency].append(record)
+    samples, lock = [], threading.Lock()
+
+    def replay(records):
+        openers, mine = {}, []
+        for record in records:
+            opener = openers.get(record['session'])
+            if opener is None:
+                opener = openers[record['session']] = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+            url = baseURL + record['path']
+            if record.get('query'):
+                url += '?' + urllib.parse.urlencode(record['query'])
+            body = urllib.parse.urlencode(record['form']).encode() if 'form' in record else None
+            started = time.perf_counter()
+            try:
+                with opener.open(urllib.request.Request(url, data=body, method=record['method'])) as reply:
+                    reply.read()
+                    status = reply.status
+            except urllib.error.HTTPError as e:
+                status = e.code
+            mine.append((record['path'], status, time.perf_counter() - started))
+        with lock:
+            samples.extend(mine)
+
+    threads = [threading.Thread(target=replay, args=(share,)) for share in shares]
+    begin = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - begin
+
+
+def summarise(samples, wall):
+    """
+    :return: (requests per second, {path: {count, errors, p50, p95, p99}} with times in ms)
+    """
+    byPath = {}
+    for path, status, seconds in samples:
+        byPath.setdefault(path, []).append((status, seconds))
+    endpoints = {}
+    for path, results in sorted(byPath.items()):
+        times = [seconds * 1000 for status, seconds in results]
+        endpoints[path] = {'count': len(results), 'errors': sum(1 for status, seconds in results if status >= 500),
+                           'p50': round(percentile(times, 0.5), 3), 'p95': round(percentile(times, 0.95), 3),
+                           'p99': round(percentile(times, 0.99), 3)}
+    return len(samples) / wall, endpoints
+
+
+def currentCommit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=repoRoot, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ''
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Request log replay benchmark')
+    parser.add_argument('--log', help='JSONL request log to replay, generated when left out')
+    parser.add_argument('--write-log', help='generate a log to this file and exit')
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--bookings', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=2999)
+    parser.add_argument('--mode', choices=('client', 'server'), default='client')
+    parser.add_argument('--server', choices=('wsgi', 'asgi'), default='wsgi')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--results', help='append this run to a JSONL results file')
+    args = parser.parse_args()
+    if args.write_log:
+        writeLog(args.write_log, generateLog(args.requests, args.users, args.bookings, args.seed))
+        sys.exit()
+    log = readLog(args.log) if args.log else generateLog(args.requests, args.users, args.bookings, args.seed)
+    resultsPath = os.path.abspath(args.results) if args.results else None
+
+    workDir = tempfile.mkdtemp()
+    try:
+        createData(workDir, args.users, args.bookings)
+        if args.mode == 'client':
+            os.chdir(workDir)
+            samples, wall = replayClient(log)
+            description = 'Flask test client, 1 thread'
+        else:
+            process, baseURL, description = startServer(workDir, args.workers, args.server)
+            try:
+                samples, wall = replayServer(log, baseURL, args.concurrency)
+            finally:
+                process.terminate()
+                process.wait()
+            description += f', {args.concurrency} client threads'
+    finally:
+        os.chdir(repoRoot)
+        shutil.rmtree(workDir)
+
+    throughput, endpoints = summarise(samples, wall)
+    print(f'{len(samples)} requests, {args.users} users, {args.bookings} bookings, {description}')
+    print(f'  throughput {throughput:.1f} req/s')
+    print(f'  {"endpoint":<14}{"count":>7}{"5xx":>6}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}')
+    for path, stats in endpoints.items():
+        print(f'  {path:<14}{stats["count"]:>7}{stats["errors"]:>6}{stats["p50"]:>10.2f}{stats["p95"]:>10.2f}{stats["p99"]:>10.2f}')
+    if resultsPath:
+        with open(resultsPath, 'a') as output:
+            output.write(json.dumps({'date': datetime.datetime.now().isoformat(timespec='seconds'), 'commit': currentCommit(),
+                                     'mode': description, 'users': args.users, 'bookings': args.bookings,
+                                     'requests': len(samples), 'throughput': round(throughput, 1), 'endpoints': endpoints}) + '\n')
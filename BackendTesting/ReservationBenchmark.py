@@ -0,0 +1,79 @@
+"""
+Session availability and reservation benchmark
+
+Created for CSI2999 Polyrhythm Skate semester project to compare reading remaining capacity from the
+SkateSession.reserved counter with counting Reservation rows, and to time single reservations
+
+Relevant online documentation:
+N/A
+
+Change Log:
+10/18/2026 Initial Version
+
+Future Task List:
+-
+
+Usage (from BackendTesting):
+python ReservationBenchmark.py [--sessions 20000] [--reservations 40] [--queries 200]
+"""
+
+import argparse, datetime, os, random, sys, time
+
+sys.path.insert(0, os.path.abspath('..'))
+import DBConnection
+from app import S2_lib as evt
+from app import inventory
+from BackendHelper import createBookingDatabase, removeDatabase, slotText
+
+countSQL = ("SELECT s.id, s.start, s.end, s.text, s.capacity, s.capacity - (SELECT IFNULL(SUM(seats), 0) FROM Reservation WHERE session_id = s.id), "
+            "(SELECT IFNULL(SUM(seats), 0) FROM Reservation WHERE session_id = s.id AND user_id = ?) "
+            "FROM SkateSession s WHERE s.start >= ? AND s.start < ? AND s.end > ? ORDER BY s.start")
+
+
+def timeMonths(connection, sql, months):
+    begin = time.perf_counter()
+    for month, year in months:
+        connection.execute(sql, (1,) + inventory.span(*evt.monthBounds(month, year))).fetchall()
+    return (time.perf_counter() - begin) / len(months) * 1000
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Session availability benchmark')
+    parser.add_argument('--sessions', type=int, default=20000)
+    parser.add_argument('--reservations', type=int, default=40)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+    dbPath = createBookingDatabase()
+    try:
+        evt.DBFILE = dbPath
+        connection = DBConnection.getConnection(dbPath)
+        first = datetime.datetime(2020, 1, 1, 8, 0)
+        sessions = []
+        for n in range(args.sessions):
+            start = first + datetime.timedelta(days=n // 6, hours=2 * (n % 6))
+            sessions.append((n + 1, slotText(start), slotText(start + datetime.timedelta(hours=2)), 'Public Skate', 100, args.reservations))
+        connection.execute('BEGIN')
+        connection.executemany('INSERT INTO SkateSession (id, start, end, text, capacity, reserved) VALUES (?, ?, ?, ?, ?, ?)', sessions)
+        connection.executemany('INSERT INTO Reservation (session_id, user_id, seats) VALUES (?, ?, 1)',
+                               ((s[0], user + 1) for s in sessions for user in range(args.reservations)))
+        connection.execute('COMMIT')
+        connection.execute('ANALYZE')
+        lastYear = 2020 + args.sessions // 6 // 365
+        rng = random.Random(2999)
+        months = [(rng.randrange(1, 13), rng.randrange(2020, lastYear + 1)) for _ in range(args.queries)]
+        counted = timeMonths(connection, countSQL, months)
+        counter = timeMonths(connection, inventory.AVAILABILITY_SQL, months)
+
+        sessionIDs = [rng.randrange(1, args.sessions + 1) for _ in range(2000)]
+        begin = time.perf_counter()
+        for n, sessionID in enumerate(sessionIDs):
+            evt.reserve(sessionID, 1000 + n)
+        reserveTime = (time.perf_counter() - begin) / len(sessionIDs) * 1000
+
+        print(f'{args.sessions} sessions, {args.sessions * args.reservations} reservations, {args.queries} random months')
+        print(f'  counting Reservation rows   {counted:8.3f} ms/month')
+        print(f'  reserved counter            {counter:8.3f} ms/month')
+        print(f'  reserve()                   {reserveTime:8.3f} ms/reservation')
+    finally:
+        DBConnection.closeConnections()
+        removeDatabase(dbPath)
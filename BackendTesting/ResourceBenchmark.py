@@ -0,0 +1,108 @@
+"""
+Concurrent writes per resource benchmark
+
+Created for CSI2999 Polyrhythm Skate semester project to measure save throughput and latency when writer processes
+book different resources at once, with every booking in SkateDB.db against each resource sharded into a database file
+of its own (BOOKING_SHARDS in config.py, see app/S2_lib.py)
+
+Relevant online documentation:
+https://www.sqlite.org/lockingv3.html
+https://www.sqlite.org/wal.html
+
+Change Log:
+10/18/2026 Initial Version
+
+Future Task List:
+-
+
+Usage (from BackendTesting):
+python ResourceBenchmark.py [--resources 4] [--writers 2] [--saves 500] [--bookings 20000]
+
+Each resource gets --writers processes saving --saves one hour bookings each, all in free slots so every save takes
+the write lock and commits. --bookings existing bookings are spread over the resources first. A single file has one
+write lock, so writers of different rinks queue behind each other, sharded they only queue behind writers of the same
+resource. Busy is a save given up on after DBConnection.BUSY_TIMEOUT, which /save/ answers with a 503.
+"""
+
+import argparse, datetime, glob, multiprocessing, os, sqlite3, sys, time
+
+sys.path.insert(0, os.path.abspath('..'))
+import DBConnection
+from app import S2_lib as evt
+from BackendHelper import createBookingDatabase, removeDatabase, syntheticBookings, percentile, firstSlot, slotText
+
+
+def fill(resources, count):
+    """
+    count bookings dealt round robin over the resources, each into the file that holds it
+    """
+    byResource = {}
+    for n, booking in enumerate(syntheticBookings(count)):
+        byResource.setdefault(n % resources + 1, []).append(booking + (n % resources + 1,))
+    for resource, rows in byResource.items():
+        connection = DBConnection.getConnection(evt.pathFor(resource))
+        connection.execute('BEGIN')
+        connection.executemany('INSERT INTO Booking (start, end, text, color, bg, user_id, resource) VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+        connection.execute('COMMIT')
+
+
+def writer(dbPath, shards, resource, writerIndex, writers, saves, results):
+    evt.DBFILE, evt.SHARDS = dbPath, shards
+    evt.conflicts.reset(useIndex=True)
+    # a year after the filled bookings, writers of one resource take turns by the hour so none of them conflict
+    first = firstSlot + datetime.timedelta(days=3650)
+    times, busy = [], 0
+    for n in range(saves):
+        start = first + datetime.timedelta(hours=n * writers + writerIndex)
+        started = time.perf_counter()
+        try:
+            if not evt.save(slotText(start), slotText(start + datetime.timedelta(hours=1)), 'Rink A', '#FFFFFF', '#3b39af', writerIndex + 1,
+                            resource=resource):
+                raise RuntimeError(f'conflict at {start} on resource {resource}')
+        except sqlite3.OperationalError:
+            busy += 1
+        times.append((time.perf_counter() - started) * 1000)
+    results.put((times, busy))
+
+
+def run(shards, args):
+    dbPath = createBookingDatabase()
+    evt.DBFILE, evt.SHARDS = dbPath, shards
+    try:
+        for n in range(2, args.resources + 1):
+            evt.addResource(f'Rink {n}')
+        # shard files are created here so the writers do not race to migrate them
+        fill(args.resources, args.bookings)
+        DBConnection.closeConnections()
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=writer, args=(dbPath, shards, resource, index, args.writers, args.saves, results))
+                     for resource in range(1, args.resources + 1) for index in range(args.writers)]
+        started = time.perf_counter()
+        for process in processes:
+            process.start()
+        finished = [results.get() for _ in processes]
+        elapsed = time.perf_counter() - started
+        for process in processes:
+            process.join()
+        times = [t for result in finished for t in result[0]]
+        busy = sum(result[1] for result in finished)
+        name = 'a file per resource' if shards else 'one file'
+        print(f'{name:<20} {len(times) / elapsed:8.0f} saves/s  p50 {percentile(times, 0.5):7.2f} ms  p99 {percentile(times, 0.99):8.2f} ms  '
+              f'max {max(times):8.2f} ms  busy {busy}')
+    finally:
+        DBConnection.closeConnections()
+        for path in glob.glob(evt.shardPath('*')):
+            removeDatabase(path)
+        removeDatabase(dbPath)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Concurrent writes per resource benchmark')
+    parser.add_argument('--resources', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--saves', type=int, default=500)
+    parser.add_argument('--bookings', type=int, default=20000)
+    args = parser.parse_args()
+    print(f'{args.resources} resources x {args.writers} writer processes x {args.saves} saves, {args.bookings} bookings, {os.cpu_count()} CPUs')
+    for shards in (False, True):
+        run(shards, args)
@@ -0,0 +1,117 @@
+"""
+Booking resource unit testing
+
+Created for CSI2999 Polyrhythm Skate semester project to test that bookings of different rinks and rooms only conflict
+with their own resource, and that sharded resources in app/S2_lib.py read and sync like the main file
+
+Relevant online documentation:
+https://www.sqlite.org/lockingv3.html
+
+Change Log:
+10/18/2026: Initial Version
+10/18/2026: Sharded /get/ with the default sorted JSON keys
+10/18/2026: Unknown resources are refused and never get a shard file
+
+Future Task List:
+-
+"""
+import glob
+import os
+import unittest
+
+import DBConnection
+from app import app
+from app import S2_lib as evt
+from BackendHelper import createBookingDatabase, removeDatabase
+
+
+class ResourceUnitTesting(unittest.TestCase):
+    def setUp(self):
+        self.dbPath = createBookingDatabase()
+        self.oldPath = evt.DBFILE
+        evt.DBFILE = self.dbPath
+        evt.conflicts.reset(useIndex=False)
+        self.studio = evt.addResource('Studio')
+
+    def tearDown(self):
+        DBConnection.closeConnections()
+        for path in glob.glob(evt.shardPath('*')):
+            removeDatabase(path)
+        evt.DBFILE, evt.SHARDS = self.oldPath, False
+        evt.conflicts.reset(useIndex=False)
+        removeDatabase(self.dbPath)
+
+    def checkScopedConflicts(self):
+        unittest.TestCase.assertTrue(self, expr=evt.save('2023-06-05 10:00', '2023-06-05 12:00', 'Rink A', '#FFFFFF', '#3b39af', 1))
+        unittest.TestCase.assertTrue(self, expr=evt.save('2023-06-05 10:00', '2023-06-05 12:00', 'Studio', '#FFFFFF', '#3b39af', 2, resource=self.studio),
+                                     msg='Slot taken on the rink refused in the studio')
+        unittest.TestCase.assertFalse(self, expr=evt.save('2023-06-05 11:00', '2023-06-05 13:00', 'Studio', '#FFFFFF', '#3b39af', 1, resource=self.studio))
+        unittest.TestCase.assertFalse(self, expr=evt.save('2023-06-05 11:00', '2023-06-05 13:00', 'Rink A', '#FFFFFF', '#3b39af', 2))
+
+    def testConflictsAreScopedByResource(self):
+        self.checkScopedConflicts()
+        unittest.TestCase.assertEqual(self, first=evt.resources(), second=[[1, 'Main Rink'], [self.studio, 'Studio']])
+        unittest.TestCase.assertEqual(self, first=[e['t'] for e in evt.get(6, 2023, 2, self.studio).values()], second=['Studio'])
+        unittest.TestCase.assertIsNone(self, obj=evt.get(6, 2023, 2, evt.DEFAULT_RESOURCE))
+        unittest.TestCase.assertEqual(self, first=evt.getColumns(6, 2023, 1, evt.DEFAULT_RESOURCE)['t'], second=('Rink A',))
+
+        # moving the rink booking to the studio frees the rink and is a delete for a rink calendar syncing since
+        rev = evt.revision(1)
+        unittest.TestCase.assertFalse(self, expr=evt.save('2023-06-05 10:00', '2023-06-05 12:00', 'Rink A', '#FFFFFF', '#3b39af', 1, 1, self.studio))
+        unittest.TestCase.assertTrue(self, expr=evt.save('2023-06-05 14:00', '2023-06-05 15:00', 'Rink A', '#FFFFFF', '#3b39af', 1, 1, self.studio))
+        unittest.TestCase.assertTrue(self, expr=evt.save('2023-06-05 10:00', '2023-06-05 12:00', 'Rink B', '#FFFFFF', '#3b39af', 2))
+        unittest.TestCase.assertEqual(self, first=evt.getRange(None, None, 1, rev, evt.DEFAULT_RESOURCE), second=([], [1]))
+        unittest.TestCase.assertEqual(self, first=evt.getRange(None, None, 1, rev, self.studio)[0][0][:3], second=[1, '2023-06-05 14:00', '2023-06-05 15:00'])
+
+    def testConflictIndexIsScopedByResource(self):
+        evt.conflicts.reset(useIndex=True)
+        self.checkScopedConflicts()
+
+    def testShardedResources(self):
+        evt.SHARDS = True
+        self.checkScopedConflicts()
+        unittest.TestCase.assertTrue(self, expr=os.path.exists(evt.shardPath(self.studio)))
+        main = DBConnection.getConnection(self.dbPath)
+        unittest.TestCase.assertEqual(self, first=main.execute('SELECT count(*) FROM Booking WHERE resource != 1').fetchone()[0], second=0)
+
+        studioID = f'r{self.studio}:1'
+        unittest.TestCase.assertEqual(self, first=sorted(map(str, evt.get(6, 2023, 2))), second=[studioID])
+        unittest.TestCase.assertEqual(self, first=evt.getColumns(6, 2023, 1)['id'], second=(1,))
+        unittest.TestCase.assertEqual(self, first=evt.revision(2), second=f'1:0,{self.studio}:1')
+        since = evt.revision(1)
+        unittest.TestCase.assertEqual(self, first=evt.parseSince(since), second={1: 1, self.studio: 0})
+
+        # updates and deletes are routed by the id, a booking stays in its file
+        unittest.TestCase.assertTrue(self, expr=evt.save('2023-06-05 12:00', '2023-06-05 13:00', 'Studio', '#FFFFFF', '#3b39af', 2, studioID, self.studio))
+        unittest.TestCase.assertRaises(self, ValueError, evt.save, '2023-06-05 14:00', '2023-06-05 15:00', 'Studio', '#FFFFFF', '#3b39af', 2, studioID)
+        unittest.TestCase.assertTrue(self, expr=evt.save('2023-06-05 10:00', '2023-06-05 11:00', 'Studio', '#FFFFFF', '#3b39af', 1, resource=self.studio))
+        evt.delete(studioID)
+        unittest.TestCase.assertEqual(self, first=evt.getRange(None, None, 2, evt.parseSince(f'1:0,{self.studio}:1')), second=([], [studioID]))
+
+        reply = app.test_client().get(f'/events/?userID=1&since={since}')
+        unittest.TestCase.assertEqual(self, first=reply.status_code, second=200)
+        unittest.TestCase.assertEqual(self, first=[e[0] for e in reply.get_json()['events']], second=[f'r{self.studio}:2'])
+        unittest.TestCase.assertEqual(self, first=reply.get_json()['rev'], second=f'1:1,{self.studio}:1')
+
+        # "r<resource>:<id>" ids next to the main file's ids in the object layout
+        reply = app.test_client().post('/get/', data={'month': 6, 'year': 2023, 'userID': 1})
+        unittest.TestCase.assertEqual(self, first=reply.status_code, second=200)
+        unittest.TestCase.assertEqual(self, first=sorted(reply.json), second=['1', f'r{self.studio}:2'])
+
+    def testUnknownResource(self):
+        client = app.test_client()
+        booking = {'s': '2023-06-05 10:00', 'e': '2023-06-05 11:00', 't': 'Rink A', 'c': '#FFFFFF', 'b': '#3b39af', 'uid': 1, 'r': 424242}
+        for shards in (False, True):
+            evt.SHARDS = shards
+            unittest.TestCase.assertRaises(self, ValueError, evt.save, '2023-06-05 10:00', '2023-06-05 11:00', 'Rink A', '#FFFFFF', '#3b39af', 1, resource=424242)
+            unittest.TestCase.assertEqual(self, first=client.post('/save/', data=booking).status_code, second=400, msg=f'shards {shards}')
+            unittest.TestCase.assertEqual(self, first=client.post('/get/', data={'month': 6, 'year': 2023, 'userID': 1, 'resource': 424242}).status_code, second=400)
+            unittest.TestCase.assertEqual(self, first=client.get('/events/?userID=1&since=0&resource=424242').status_code, second=400)
+            unittest.TestCase.assertFalse(self, expr=os.path.exists(evt.shardPath(424242)), msg='Shard file made for an unknown resource')
+        unittest.TestCase.assertEqual(self, first=DBConnection.getConnection(self.dbPath).execute('SELECT count(*) FROM Booking').fetchone()[0], second=0)
+        # a resource added later is found
+        unittest.TestCase.assertTrue(self, expr=evt.save('2023-06-05 10:00', '2023-06-05 11:00', 'Rink A', '#FFFFFF', '#3b39af', 1, resource=evt.addResource('Party Room')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Recurring series benchmark
+
+Created for CSI2999 Polyrhythm Skate semester project to compare storing weekly sessions as one Booking row per
+occurrence with storing them once in BookingSeries and expanding them in S2_lib.get
+
+Relevant online documentation:
+N/A
+
+Change Log:
+10/18/2026 Initial Version
+
+Future Task List:
+-
+
+Usage (from BackendTesting):
+python SeriesBenchmark.py [--sessions 60] [--weeks 260] [--queries 200]
+"""
+
+import argparse, datetime, os, random, sys, time
+
+sys.path.insert(0, os.path.abspath('..'))
+import DBConnection
+from app import S2_lib as evt
+from app import recurrence
+from BackendHelper import createBookingDatabase, removeDatabase, slotText
+
+
+def weeklySessions(count):
+    """
+    Two hour sessions spread over the week, seven slots a day from 1/2/2023 (a monday)
+    :return: list of (start, end) strings of the first occurrence
+    """
+    first = datetime.datetime(2023, 1, 2, 8, 0)
+    sessions = []
+    for n in range(count):
+        start = first + datetime.timedelta(days=n % 7, hours=2 * (n // 7))
+        sessions.append((slotText(start), slotText(start + datetime.timedelta(hours=2))))
+    return sessions
+
+
+def timeMonths(months):
+    begin = time.perf_counter()
+    found = 0
+    for month, year in months:
+        found += len(evt.get(month, year, 1) or {})
+    return (time.perf_counter() - begin) / len(months) * 1000, found
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Recurring series benchmark')
+    parser.add_argument('--sessions', type=int, default=60)
+    parser.add_argument('--weeks', type=int, default=260)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+    sessions = weeklySessions(args.sessions)
+    rng = random.Random(2999)
+    lastYear = 2023 + args.weeks // 52
+    months = [(rng.randrange(1, 13), rng.randrange(2023, lastYear)) for _ in range(args.queries)]
+    rowsPath, seriesPath = createBookingDatabase(), createBookingDatabase()
+    try:
+        evt.conflicts.reset()
+        evt.DBFILE = rowsPath
+        occurrences = [(s, e, 'Rink A', '#FFFFFF', '#3b39af', 1) for start, end in sessions
+                       for s, e in recurrence.Series.fromRule(start, end, count=args.weeks).occurrences(start, '9999-12-31 00:00')]
+        connection = DBConnection.getConnection(rowsPath)
+        connection.executemany('INSERT INTO Booking (start, end, text, color, bg, user_id) VALUES (?, ?, ?, ?, ?, ?);', occurrences)
+        rows = timeMonths(months)
+
+        evt.DBFILE = seriesPath
+        begin = time.perf_counter()
+        for start, end in sessions:
+            evt.saveSeries(start, end, 'Rink A', '#FFFFFF', '#3b39af', 1, 'WEEKLY', count=args.weeks)
+        saveTime = (time.perf_counter() - begin) / len(sessions) * 1000
+        series = timeMonths(months)
+        DBConnection.closeConnections()
+
+        print(f'{args.sessions} weekly sessions for {args.weeks} weeks, {args.queries} random months')
+        print(f'  one row per occurrence  {len(occurrences):7d} rows  {os.path.getsize(rowsPath) // 1024:6d} KiB  {rows[0]:8.3f} ms/month  ({rows[1]} found)')
+        print(f'  series                  {len(sessions):7d} rows  {os.path.getsize(seriesPath) // 1024:6d} KiB  {series[0]:8.3f} ms/month  ({series[1]} found)')
+        print(f'  saveSeries with bulk conflict check {saveTime:8.3f} ms/series')
+    finally:
+        removeDatabase(rowsPath)
+        removeDatabase(seriesPath)
@@ -0,0 +1,87 @@
+"""
+Session handling benchmark
+
+Created for CSI2999 Polyrhythm Skate semester project to measure the CPU time per request of Flask's signed cookie
+session, made permanent on every request as views.py used to, against the lazily loaded server side sessions of
+app/sessionstore.py
+
+Relevant online documentation:
+https://flask.palletsprojects.com/en/2.3.x/api/#session-interface
+
+Change Log:
+10/18/2026 Initial Version
+
+Future Task List:
+-
+
+Usage (from BackendTesting):
+python SessionBenchmark.py [--requests 2000]
+
+Every request is made by a logged in client, as a browser sends its cookie with every static file and calendar
+call too.
+"""
+
+import argparse, os, sys, time
+
+sys.path.insert(0, os.path.abspath('..'))
+import DBConnection
+from flask import session
+from flask.sessions import SecureCookieSessionInterface
+from app import app, views, loginLimiter
+from app import S2_lib as evt
+from app.sessionstore import MemoryStore, SQLiteStore, ServerSessionInterface
+from DBUserHandler import DBHandler
+from PasswordHasher import PasswordHasher
+from BackendHelper import createBookingDatabase, removeDatabase, fillBookings, percentile
+
+oldBehaviour = [False]
+
+
+def makePermanent():
+    # what before_request did on every request, it marks the session changed so the cookie is signed and sent again
+    if oldBehaviour[0]:
+        session.permanent = True
+
+
+def perRequest(client, method, path, data, count):
+    """
+    :return: (CPU microseconds per request, responses that set a cookie)
+    """
+    times, cookies = [], 0
+    for _ in range(count):
+        started = time.process_time()
+        with getattr(client, method)(path, data=data) as reply:
+            reply.get_data()
+        times.append((time.process_time() - started) * 1000000)
+        cookies += 'Set-Cookie' in reply.headers
+    return times, cookies
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Session handling benchmark')
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+    dbPath, sessionPath = createBookingDatabase(), createBookingDatabase()
+    app.before_request_funcs.setdefault(None, []).insert(0, makePermanent)
+    try:
+        fillBookings(dbPath, 2000)
+        evt.DBFILE = dbPath
+        views.userDB = DBHandler(dbPath, hasher=PasswordHasher(rounds=1000))
+        views.userDB.insertNewUserData('Bench', 'Mark', 'benchmark', 'bench@mail.com', 'B3nchP@ss')
+        paths = (('static file', 'get', '/static/css/style.css', None), ('/get/', 'post', '/get/', {'month': 3, 'year': 2020, 'userID': 1}),
+                 ('/times', 'get', '/times', None))
+        for name, interface, old in (('signed cookie, made permanent', SecureCookieSessionInterface(), True),
+                                     ('server side, memory', ServerSessionInterface(MemoryStore()), False),
+                                     ('server side, sqlite', ServerSessionInterface(SQLiteStore(sessionPath)), False)):
+            app.session_interface, oldBehaviour[0] = interface, old
+            loginLimiter.clear()
+            client = app.test_client()
+            client.post('/login', data={'username': 'benchmark', 'password': 'B3nchP@ss'})
+            print(name)
+            for label, method, path, data in paths:
+                times, cookies = perRequest(client, method, path, data, args.requests)
+                print(f'  {label:<12} CPU p50 {percentile(times, 0.5):8.1f} us  mean {sum(times) / len(times):8.1f} us  Set-Cookie on {cookies} of {len(times)}')
+    finally:
+        DBConnection.closeConnections()
+        removeDatabase(dbPath)
+        removeDatabase(sessionPath)
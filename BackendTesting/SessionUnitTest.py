@@ -0,0 +1,135 @@
+"""
+Server side session unit testing
+
+Created for CSI2999 Polyrhythm Skate semester project to test the lazily loaded sessions of app/sessionstore.py
+
+Relevant online documentation:
+https://flask.palletsprojects.com/en/2.3.x/api/#session-interface
+
+Change Log:
+10/18/2026: Initial Version
+10/18/2026: Login issues a new session id
+
+Future Task List:
+-
+"""
+import time
+import unittest
+
+import DBConnection
+from app import app, loginLimiter, userCache
+from app import views
+from app import S2_lib as evt
+from app.sessionstore import MemoryStore, SQLiteStore, ServerSessionInterface
+from DBUserHandler import DBHandler
+from PasswordHasher import PasswordHasher
+from BackendHelper import createBookingDatabase, removeDatabase
+
+
+class CountingStore(MemoryStore):
+    def __init__(self):
+        MemoryStore.__init__(self)
+        self.loads = 0
+
+    def load(self, sid):
+        self.loads += 1
+        return MemoryStore.load(self, sid)
+
+
+class SessionUnitTesting(unittest.TestCase):
+    def setUp(self):
+        self.dbPath = createBookingDatabase()
+        self.oldUserDB, self.oldInterface, self.oldPath = views.userDB, app.session_interface, evt.DBFILE
+        evt.DBFILE = self.dbPath
+        views.userDB = DBHandler(self.dbPath, hasher=PasswordHasher(rounds=1000))
+        views.userDB.insertNewUserData('Ada', 'Lovelace', 'adaLovelace', 'ada@mail.com', 'P@ssword1')
+        self.store = CountingStore()
+        app.session_interface = ServerSessionInterface(self.store)
+        loginLimiter.clear()
+        userCache.clear()
+        self.client = app.test_client()
+
+    def tearDown(self):
+        views.userDB, app.session_interface, evt.DBFILE = self.oldUserDB, self.oldInterface, self.oldPath
+        loginLimiter.clear()
+        userCache.clear()
+        DBConnection.closeConnections()
+        removeDatabase(self.dbPath)
+
+    def login(self):
+        return self.client.post('/login', data={'username': 'adaLovelace', 'password': 'P@ssword1'})
+
+    def testSessionLifecycle(self):
+        reply = self.login()
+        cookie = self.client.get_cookie('session')
+        unittest.TestCase.assertIsNotNone(self, obj=cookie, msg='Login set no session cookie')
+        unittest.TestCase.assertLess(self, a=len(cookie.value), b=40, msg='Cookie holds more than an id')
+        unittest.TestCase.assertEqual(self, first=self.store.load(cookie.value)[0], second={'userID': 1})
+        unittest.TestCase.assertIn(self, member='Cookie', container=reply.headers['Vary'])
+
+        # an unchanged session is read but the cookie is not sent again
+        reply = self.client.get('/times')
+        unittest.TestCase.assertIn(self, member=b'id="userID" value="1"', container=reply.get_data())
+        unittest.TestCase.assertNotIn(self, member='Set-Cookie', container=reply.headers)
+
+        # logout drops the stored session and the cookie
+        reply = self.client.get('/logout')
+        unittest.TestCase.assertIsNone(self, obj=self.store.load(cookie.value))
+        unittest.TestCase.assertIn(self, member='session=;', container=reply.headers['Set-Cookie'])
+
+    def testLoginRegeneratesSession(self):
+        # an attacker's own session id, planted in the victim's browser
+        attacker = app.test_client()
+        self.store.save('planted', {'visits': 1}, time.time() + 60)
+        self.client.set_cookie('session', 'planted')
+        self.login()
+        sid = self.client.get_cookie('session').value
+        unittest.TestCase.assertNotEqual(self, first=sid, second='planted', msg='Login kept the session id')
+        unittest.TestCase.assertIsNone(self, obj=self.store.load('planted'), msg='Old session id still stored')
+        unittest.TestCase.assertEqual(self, first=self.store.load(sid)[0], second={'visits': 1, 'userID': 1})
+        attacker.set_cookie('session', 'planted')
+        unittest.TestCase.assertNotIn(self, member=b'id="userID" value="1"', container=attacker.get('/times').get_data())
+
+    def testUntouchedSessionIsNeverLoaded(self):
+        self.login()
+        loads = self.store.loads
+        for path in ('/pricing', '/static/css/style.css', '/events/?userID=1&from=2023-06-01&to=2023-07-01'):
+            with self.client.get(path) as reply:
+                unittest.TestCase.assertEqual(self, first=reply.status_code, second=200, msg=path)
+                unittest.TestCase.assertNotIn(self, member='Set-Cookie', container=reply.headers, msg=path)
+        reply = self.client.post('/get/', data={'month': 6, 'year': 2023, 'userID': 1})
+        unittest.TestCase.assertEqual(self, first=reply.status_code, second=200)
+        unittest.TestCase.assertNotIn(self, member='Set-Cookie', container=reply.headers)
+        unittest.TestCase.assertEqual(self, first=self.store.loads, second=loads, msg='Session loaded by a view that does not use it')
+        # nor is one created for an anonymous visitor
+        self.client.get('/logout')
+        unittest.TestCase.assertNotIn(self, member='Set-Cookie', container=app.test_client().get('/').headers)
+
+    def testRefreshAndExpiry(self):
+        self.login()
+        sid = self.client.get_cookie('session').value
+        data, expires = self.store.load(sid)
+        lifetime = app.permanent_session_lifetime.total_seconds()
+        # past half its lifetime the session and the cookie are extended
+        self.store.save(sid, data, time.time() + lifetime / 4)
+        unittest.TestCase.assertIn(self, member='Set-Cookie', container=self.client.get('/times').headers)
+        unittest.TestCase.assertGreater(self, a=self.store.load(sid)[1], b=time.time() + lifetime / 2)
+        # an expired session is a logged out visitor
+        self.store.save(sid, data, time.time() - 1)
+        unittest.TestCase.assertNotIn(self, member=b'id="userID" value="1"', container=self.client.get('/times').get_data())
+
+    def testSQLiteStore(self):
+        store = SQLiteStore(self.dbPath)
+        app.session_interface = ServerSessionInterface(store)
+        self.login()
+        sid = self.client.get_cookie('session').value
+        # another worker with its own store object sees the login
+        app.session_interface = ServerSessionInterface(SQLiteStore(self.dbPath))
+        userCache.clear()
+        unittest.TestCase.assertIn(self, member=b'id="userID" value="1"', container=self.client.get('/times').get_data())
+        self.client.get('/logout')
+        unittest.TestCase.assertIsNone(self, obj=store.load(sid))
+
+
+if __name__ == '__main__':
+    unittest.main()
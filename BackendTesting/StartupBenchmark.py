@@ -0,0 +1,75 @@
+"""
+Cold start benchmark
+
+Created for CSI2999 Polyrhythm Skate semester project to time how long a fresh interpreter takes to get from nothing to
+a built app answering its first request, as every worker process does when it boots, and to import app/S2_lib.py as
+the command line tools do. Fails when the app misses its budget.
+
+Relevant online documentation:
+https://docs.python.org/3/using/cmdline.html#cmdoption-X
+
+Change Log:
+10/18/2026 Initial Version
+
+Future Task List:
+-
+
+Usage (from BackendTesting):
+python StartupBenchmark.py [--runs 10] [--budget 600] [--top 10]
+
+Each case runs --runs times in a new interpreter, from an empty directory so createApp() finds no SkateDB.db. The
+time reported is the wall time of the whole process less that of `python -c pass`, so it is what the site's own
+imports and setup cost. The exit status is 1 when the median of the first request case is above --budget ms. The
+slowest imports of that case, from -X importtime, are listed to show what to trim next.
+"""
+
+import argparse, os, subprocess, sys, tempfile, time
+
+sys.path.insert(0, os.path.abspath('..'))
+from BackendHelper import importTimes, percentile
+
+# the eager app/__init__.py took about 900 ms here, the lazy one about 400 ms
+BUDGET_MS = 600
+CASES = (('import app.S2_lib', 'import app.S2_lib'),
+         ('createApp()', 'from app import createApp; createApp()'),
+         ('createApp(), first request', 'from app import createApp; createApp().test_client().get("/pricing")'),
+         ('createApp() with the ORM', 'import app.models; from app import createApp; createApp()'))
+
+
+def coldStart(code, runs):
+    """
+    :return: wall milliseconds of each fresh interpreter running code
+    """
+    environment = dict(os.environ, PYTHONPATH=os.path.abspath('..'))
+    times = []
+    with tempfile.TemporaryDirectory() as directory:
+        for _ in range(runs):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, '-c', code], cwd=directory, env=environment, check=True)
+            times.append((time.perf_counter() - started) * 1000)
+    return times
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Cold start benchmark')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--budget', type=float, default=BUDGET_MS, help='ms allowed for createApp() and the first request')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+    baseline = percentile(coldStart('pass', args.runs), 0.5)
+    print(f'python -c pass takes {baseline:.1f} ms, subtracted below')
+    medians = {}
+    for name, code in CASES:
+        times = [t - baseline for t in coldStart(code, args.runs)]
+        medians[name] = percentile(times, 0.5)
+        print(f'{name:<28} p50 {medians[name]:7.1f} ms  max {max(times):7.1f} ms')
+
+    print('slowest imports of createApp() and the first request, cumulative')
+    report = importTimes(dict(CASES)['createApp(), first request'])
+    for module, us in sorted(report.items(), key=lambda item: -item[1])[:args.top]:
+        print(f'  {module:<40} {us / 1000:7.1f} ms')
+
+    spent = medians['createApp(), first request']
+    if spent > args.budget:
+        sys.exit(f'cold start {spent:.0f} ms is over the {args.budget:.0f} ms budget')
+    print(f'cold start {spent:.0f} ms is within the {args.budget:.0f} ms budget')
@@ -0,0 +1,44 @@
+"""
+Startup import unit testing
+
+Created for CSI2999 Polyrhythm Skate semester project to keep heavy imports out of startup: command line tools that
+only need app/S2_lib.py never load Flask, and createApp() in app/__init__.py leaves Flask-SQLAlchemy and passlib
+until the ORM or the first password hash needs them
+
+Relevant online documentation:
+https://docs.python.org/3/using/cmdline.html#cmdoption-X
+
+Change Log:
+10/18/2026: Initial Version
+
+Future Task List:
+-
+"""
+import unittest
+
+from BackendHelper import importTimes
+
+
+class StartupUnitTesting(unittest.TestCase):
+    def assertNotImported(self, times, modules):
+        # the slowest imports name what pulled a module in when this fails
+        slowest = ', '.join(f'{name} {us // 1000} ms' for name, us in sorted(times.items(), key=lambda item: -item[1])[:8])
+        for module in modules:
+            unittest.TestCase.assertNotIn(self, member=module, container=times, msg=f'{module} imported, slowest: {slowest}')
+
+    def testBookingLibraryLoadsNoWebFramework(self):
+        times = importTimes('import app.S2_lib, Archive, BulkTransfer')
+        self.assertNotImported(times, ('flask', 'werkzeug', 'flask_sqlalchemy', 'sqlalchemy', 'passlib.hash'))
+
+    def testCreateAppDefersORMAndHashing(self):
+        times = importTimes('from app import createApp; createApp().test_client().get("/pricing")')
+        unittest.TestCase.assertIn(self, member='app.views', container=times)
+        self.assertNotImported(times, ('flask_sqlalchemy', 'sqlalchemy', 'passlib.hash', 'concurrent.futures.process', 'unittest'))
+
+    def testModelsLoadTheORM(self):
+        times = importTimes('import app.models; from app import app, db; assert db.Model.metadata.tables["Users"] is not None')
+        unittest.TestCase.assertIn(self, member='flask_sqlalchemy', container=times)
+
+
+if __name__ == '__main__':
+    unittest.main()
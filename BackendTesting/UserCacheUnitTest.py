@@ -0,0 +1,63 @@
+"""
+User profile cache unit testing
+
+Created for CSI2999 Polyrhythm Skate semester project to test app/usercache.py
+
+Relevant online documentation:
+N/A
+
+Change Log:
+10/18/2026: Initial Version
+
+Future Task List:
+-
+"""
+import time
+import unittest
+
+from app.usercache import CachedUser, UserCache
+
+
+class UserCacheUnitTesting(unittest.TestCase):
+    def setUp(self):
+        self.loads = []
+
+    def loader(self, uid):
+        self.loads.append(uid)
+        return CachedUser(uid, 'First' + str(uid), 'Last', 'user' + str(uid), str(uid) + '@mail.com')
+
+    def testHitsAndMisses(self):
+        cache = UserCache(maxSize=10, ttl=60)
+        unittest.TestCase.assertEqual(self, first=cache.get(1, self.loader).FirstName, second='First1')
+        unittest.TestCase.assertEqual(self, first=cache.get(1, self.loader).FirstName, second='First1')
+        unittest.TestCase.assertEqual(self, first=self.loads, second=[1], msg='Cached user was loaded again')
+        unittest.TestCase.assertEqual(self, first=cache.stats(), second={'hits': 1, 'misses': 1, 'size': 1})
+
+    def testLeastRecentlyUsedEviction(self):
+        cache = UserCache(maxSize=2, ttl=60)
+        cache.get(1, self.loader)
+        cache.get(2, self.loader)
+        cache.get(1, self.loader)
+        cache.get(3, self.loader)
+        cache.get(1, self.loader)
+        cache.get(2, self.loader)
+        unittest.TestCase.assertEqual(self, first=self.loads, second=[1, 2, 3, 2], msg='Wrong user evicted')
+
+    def testExpiryAndInvalidation(self):
+        cache = UserCache(maxSize=10, ttl=0.05)
+        cache.get(1, self.loader)
+        time.sleep(0.06)
+        cache.get(1, self.loader)
+        unittest.TestCase.assertEqual(self, first=self.loads, second=[1, 1], msg='Expired user was not reloaded')
+        cache.invalidate(1)
+        cache.get(1, self.loader)
+        unittest.TestCase.assertEqual(self, first=self.loads, second=[1, 1, 1], msg='Invalidated user was not reloaded')
+
+    def testMissingUserNotCached(self):
+        cache = UserCache(maxSize=10, ttl=60)
+        unittest.TestCase.assertIsNone(self, obj=cache.get(5, lambda uid: None))
+        unittest.TestCase.assertEqual(self, first=cache.stats()['size'], second=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Input validation microbenchmarks
+
+Created for CSI2999 Polyrhythm Skate semester project to compare the per call regex building of the old
+DBHandler.sanitze/checkPasswordIntegrity with the compiled patterns in InputValidator.py
+
+Relevant online documentation:
+https://docs.python.org/3/library/timeit.html
+
+Change Log:
+10/18/2026 Initial Version
+
+Future Task List:
+-
+
+Usage (from BackendTesting):
+python ValidatorBenchmark.py [--number 200000] [--records 10000]
+"""
+
+import argparse, os, re, sys, timeit
+
+sys.path.insert(0, os.path.abspath('..'))
+import InputValidator
+from DBUserHandler import DBHandler
+
+
+# the 5/27/2023 implementations, kept as they were to time the same work
+def oldSanitze(arg, typeflag=None):
+    if typeflag == 'Name':
+        regexStr = '^[A-Za-z]+(((\'|\\-|\\.)?([A-Za-z])+))?$'
+        return re.match(regexStr, arg)
+    if typeflag == 'Email':
+        regexStr = '^[a-zA-Z0-9.!#$%&’*+=?^_`{|}~-]+@[a-zA-Z0-9-]+(?:\\.[a-zA-Z0-9-]+)*$'
+        return re.match(regexStr, arg)
+
+
+def oldCheckPasswordIntegrity(pwd):
+    minLen = 6
+    maxLen = 20
+    regexStr = '^(?=\\S{' + str(minLen) + ',' + str(maxLen) + '}$)(?=.*?\\d)(?=.*?[a-z])(?=.*?[A-Z])(?=.*?[^A-Za-z\\s0-9])'
+    return re.match(regexStr, pwd)
+
+
+def oldSignup(record):
+    # the checks insertNewUserData ran before this change
+    return (oldSanitze(record['FirstName'], 'Name') is not None and oldSanitze(record['LastName'], 'Name') is not None
+            and oldSanitze(record['Username'], 'Name') is not None and oldSanitze(record['Email'], 'Email') is not None
+            and oldCheckPasswordIntegrity(record['Password']) is not None)
+
+
+def report(label, seconds, number):
+    print(f'  {label:34s} {seconds / number * 1e6:8.3f} us')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Input validation microbenchmarks')
+    parser.add_argument('--number', type=int, default=200000)
+    parser.add_argument('--records', type=int, default=10000)
+    args = parser.parse_args()
+    handler = DBHandler.__new__(DBHandler)
+    number = args.number
+    print(f'single values, {number} calls each')
+    for label, old, new in (('name', lambda: oldSanitze('Smith-Jones', 'Name'), lambda: handler.sanitze('Smith-Jones', 'Name')),
+                            ('email', lambda: oldSanitze('first.last@oakland.edu', 'Email'), lambda: handler.sanitze('first.last@oakland.edu', 'Email')),
+                            ('password', lambda: oldCheckPasswordIntegrity('T3stP@ssword'), lambda: handler.checkPasswordIntegrity('T3stP@ssword'))):
+        report(label + ' (string regex per call)', timeit.timeit(old, number=number), number)
+        report(label + ' (compiled)', timeit.timeit(new, number=number), number)
+
+    records = [{'FirstName': 'Test', 'LastName': 'Test', 'Username': 'Test', 'Email': 'test@mail.com', 'Password': 'T3stP@ssword'}] * args.records
+    # every tenth record has a bad email
+    records = [dict(r, Email='bad') if n % 10 == 0 else r for n, r in enumerate(records)]
+    print(f'{args.records} user records')
+    report('per record, old checks', timeit.timeit(lambda: [oldSignup(r) for r in records], number=10), 10 * args.records)
+    report('validateUsers batch', timeit.timeit(lambda: InputValidator.validateUsers(records), number=10), 10 * args.records)
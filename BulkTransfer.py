@@ -0,0 +1,292 @@
+"""
+Bulk import and export of users and bookings
+
+Created 10/18/2026
+Created for CSI2999 Polyrhythm Skate semester project to seed SkateDB.db with whole seasons of sessions and
+large user lists without going through /save/ and DBHandler one row at a time
+
+Relevant online documentation:
+https://docs.python.org/3/library/sqlite3.html#sqlite3.Cursor.executemany
+https://docs.python.org/3/library/csv.html
+
+Change Log:
+10/18/2026: Initial Version
+
+10/18/2026: Imported bookings are checked against recurring series occurrences too
+
+10/18/2026: Users are validated in one pass by InputValidator.validateUsers, rejects name the failing fields
+
+10/18/2026: Imported bookings are checked against skate sessions
+
+10/18/2026: Imports keep the occupancy heatmap buckets current
+
+Future Task List:
+-
+
+Usage:
+python BulkTransfer.py import users logins.csv [--db SkateDB.db] [--batch 5000] [--rejects rejects.jsonl]
+python BulkTransfer.py import bookings season.jsonl
+python BulkTransfer.py export bookings bookings.csv
+
+Files are CSV (optionally with a header row naming the columns) or JSON lines, picked by extension.
+Every batch is validated as a whole and written in one transaction. Records that fail validation, duplicate
+an existing user or overlap another booking are skipped and reported instead of aborting the import.
+"""
+
+import argparse, bisect, csv, datetime, itertools, json, os, sys
+import DBConnection, DBSchema, InputValidator
+from PasswordHasher import PasswordHasher
+
+USER_FIELDS = ('FirstName', 'LastName', 'Username', 'Email', 'Password')
+BOOKING_FIELDS = ('start', 'end', 'text', 'color', 'bg', 'user_id')
+EXPORT_FIELDS = {'users': ('UID', 'FirstName', 'LastName', 'Username', 'Email'), 'bookings': ('id',) + BOOKING_FIELDS}
+BATCH_SIZE = 5000
+
+
+def readRecords(path, fields):
+    """
+    Stream records from a CSV or JSON lines file
+    :param path: input file
+    :param fields: column names, used for CSV files without a header row
+    :return: generator of dicts
+    """
+    with open(path, newline='', encoding='utf-8') as handle:
+        if path.endswith('.jsonl') or path.endswith('.json'):
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        rows = csv.reader(handle)
+        first = next(rows, None)
+        if first is None:
+            return
+        if [column.strip().lower() for column in first] != [field.lower() for field in fields]:
+            yield dict(zip(fields, first))
+        for row in rows:
+            yield dict(zip(fields, row))
+
+
+def batches(records, size):
+    records = iter(records)
+    while True:
+        batch = list(itertools.islice(records, size))
+        if not batch:
+            return
+        yield batch
+
+
+def validateUsers(batch):
+    """
+    :param batch: list of user dicts
+    :return: (valid records, [(record, reason)] rejected)
+    """
+    valid, invalid = InputValidator.validateUsers(batch)
+    return valid, [(record, InputValidator.describe(errors)) for record, errors in invalid]
+
+
+def normaliseDate(value):
+    # fromisoformat validates, values already in the stored form skip the strftime round trip
+    parsed = datetime.datetime.fromisoformat(value)
+    if len(value) == 16 and value[10] == ' ':
+        return value
+    return parsed.strftime('%Y-%m-%d %H:%M')
+
+
+def validateBookings(batch):
+    """
+    Normalise start/end to the stored "YYYY-MM-DD HH:MM" form
+    :param batch: list of booking dicts
+    :return: (valid records, [(record, reason)] rejected)
+    """
+    valid, rejected = [], []
+    for record in batch:
+        try:
+            start = normaliseDate(record['start'])
+            end = normaliseDate(record['end'])
+            userID = int(record['user_id'])
+        except (KeyError, TypeError, ValueError):
+            rejected.append((record, 'bad start, end or user_id'))
+            continue
+        if start >= end:
+            rejected.append((record, 'start is not before end'))
+            continue
+        valid.append(dict(record, start=start, end=end, user_id=userID, text=record.get('text') or 'Rink A',
+                          color=record.get('color') or '#FFFFFF', bg=record.get('bg') or '#3b39af'))
+    return valid, rejected
+
+
+def findOverlaps(cursor, batch):
+    """
+    Bulk conflict detection for a batch of bookings. Existing bookings, series occurrences and skate sessions
+    in the batch's overall span are read once; a booking is rejected if it overlaps one of them or an earlier accepted
+    booking of the batch.
+    :param cursor: sqlite3 cursor inside the import transaction
+    :param batch: list of validated booking dicts
+    :return: (accepted records, [(record, reason)] rejected)
+    """
+    if not batch:
+        return [], []
+    from app import S2_lib
+    batch = sorted(batch, key=lambda record: (record['start'], record['end']))
+    existing = sorted(S2_lib.takenSlots(cursor, batch[0]['start'], max(record['end'] for record in batch)))
+    starts = [row[0] for row in existing]
+    # furthest end among existing bookings starting at or before each position
+    reach = list(itertools.accumulate((row[1] for row in existing), max))
+    accepted, rejected, acceptedEnd = [], [], ''
+    for record in batch:
+        before = bisect.bisect_left(starts, record['end'])
+        if before and reach[before - 1] > record['start']:
+            rejected.append((record, 'overlaps an existing booking'))
+        elif acceptedEnd > record['start']:
+            rejected.append((record, 'overlaps another booking in the file'))
+        else:
+            accepted.append(record)
+            acceptedEnd = max(acceptedEnd, record['end'])
+    return accepted, rejected
+
+
+def takenKeys(connection, records):
+    """
+    Usernames and emails of records that already exist in Users, as 'u:name' / 'e:email' keys
+    """
+    if not records:
+        return set()
+    marks = ','.join('?' * len(records))
+    taken = {'u:' + row[0] for row in connection.execute(f'SELECT Username FROM Users WHERE Username IN ({marks});', [r['Username'] for r in records])}
+    taken |= {'e:' + row[0] for row in connection.execute(f'SELECT Email FROM Users WHERE Email IN ({marks});', [r['Email'] for r in records])}
+    return taken
+
+
+def isTaken(record, taken, rejected):
+    if 'u:' + record['Username'] in taken or 'e:' + record['Email'] in taken:
+        rejected.append((record, 'duplicate username or email'))
+        return True
+    return False
+
+
+def importUsers(dbPath, path, batchSize=BATCH_SIZE, hasher=None, rejects=None):
+    """
+    :param dbPath: database file
+    :param path: CSV or JSON lines file of users
+    :param hasher: PasswordHasher to hash with, defaults to one process per CPU
+    :param rejects: list that collects (record, reason) for skipped records
+    :return: number of users inserted
+    """
+    DBSchema.ensureSchema(dbPath)
+    hasher = hasher or PasswordHasher(workers=os.cpu_count() or 1, useProcesses=True)
+    connection = DBConnection.getConnection(dbPath)
+    inserted = 0
+    for batch in batches(readRecords(path, USER_FIELDS), batchSize):
+        valid, rejected = validateUsers(batch)
+        # duplicates inside the batch, then against the table
+        seen, unique = set(), []
+        for record in valid:
+            keys = ('u:' + record['Username'], 'e:' + record['Email'])
+            if keys[0] in seen or keys[1] in seen:
+                rejected.append((record, 'duplicate username or email in file'))
+            else:
+                seen.update(keys)
+                unique.append(record)
+        # hash only what is not already taken, then check again under the write lock
+        taken = takenKeys(connection, unique)
+        unique = [record for record in unique if not isTaken(record, taken, rejected)]
+        hashes = hasher.hashMany([record['Password'] for record in unique])
+        connection.execute('BEGIN IMMEDIATE;')
+        try:
+            taken = takenKeys(connection, unique)
+            rows = [(record['FirstName'], record['LastName'], record['Username'], record['Email'], passHash)
+                    for record, passHash in zip(unique, hashes) if not isTaken(record, taken, rejected)]
+            connection.executemany('INSERT INTO Users (FirstName, LastName, Username, Email, Password) VALUES (?, ?, ?, ?, ?);', rows)
+            connection.execute('COMMIT;')
+        except Exception:
+            connection.execute('ROLLBACK;')
+            raise
+        inserted += len(rows)
+        if rejects is not None:
+            rejects.extend(rejected)
+    return inserted
+
+
+def importBookings(dbPath, path, batchSize=BATCH_SIZE, rejects=None):
+    """
+    :param dbPath: database file
+    :param path: CSV or JSON lines file of bookings
+    :param rejects: list that collects (record, reason) for skipped records
+    :return: number of bookings inserted
+    """
+    from app import S2_lib
+    DBSchema.ensureSchema(dbPath)
+    connection = DBConnection.getConnection(dbPath)
+    cursor = connection.cursor()
+    inserted = 0
+    for batch in batches(readRecords(path, BOOKING_FIELDS), batchSize):
+        valid, rejected = validateBookings(batch)
+        cursor.execute('BEGIN IMMEDIATE;')
+        try:
+            accepted, overlapping = findOverlaps(cursor, valid)
+            # one revision per user and batch keeps /events/ sync consistent
+            revisions = {userID: S2_lib.bumpRevision(cursor, userID) for userID in {record['user_id'] for record in accepted}}
+            S2_lib.occupancy.apply(cursor, [(record['start'], record['end']) for record in accepted])
+            cursor.executemany('INSERT INTO `Booking` (`start`, `end`, `text`, `color`, `bg`, `user_id`, `revision`) VALUES (?,?,?,?,?,?,?)',
+                               [tuple(record[field] for field in BOOKING_FIELDS) + (revisions[record['user_id']],) for record in accepted])
+            cursor.execute('COMMIT;')
+        except Exception:
+            cursor.execute('ROLLBACK;')
+            raise
+        inserted += len(accepted)
+        if rejects is not None:
+            rejects.extend(rejected + overlapping)
+    return inserted
+
+
+def export(dbPath, table, path, batchSize=BATCH_SIZE):
+    """
+    Stream a table to CSV (with header) or JSON lines. Password hashes are never exported.
+    :param table: 'users' or 'bookings'
+    :return: number of records written
+    """
+    fields = EXPORT_FIELDS[table]
+    sql = f'SELECT {", ".join(fields)} FROM {"Users ORDER BY UID" if table == "users" else "Booking ORDER BY id"};'
+    cursor = DBConnection.getConnection(dbPath).execute(sql)
+    written = 0
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        writer = None if path.endswith('.jsonl') else csv.writer(handle)
+        if writer:
+            writer.writerow(fields)
+        while True:
+            rows = cursor.fetchmany(batchSize)
+            if not rows:
+                break
+            if writer:
+                writer.writerows(rows)
+            else:
+                handle.writelines(json.dumps(dict(zip(fields, row))) + '\n' for row in rows)
+            written += len(rows)
+    return written
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bulk import/export for SkateDB.db')
+    parser.add_argument('action', choices=['import', 'export'])
+    parser.add_argument('table', choices=['users', 'bookings'])
+    parser.add_argument('file')
+    parser.add_argument('--db', default='SkateDB.db')
+    parser.add_argument('--batch', type=int, default=BATCH_SIZE)
+    parser.add_argument('--rejects', help='write skipped records and the reason to this JSON lines file')
+    args = parser.parse_args()
+    if not os.path.isfile(args.db):
+        sys.exit(f'{args.db} not found')
+    if args.action == 'export':
+        print(f'exported {export(args.db, args.table, args.file, args.batch)} {args.table}')
+        sys.exit()
+    rejects = []
+    if args.table == 'users':
+        count = importUsers(args.db, args.file, args.batch, rejects=rejects)
+    else:
+        count = importBookings(args.db, args.file, args.batch, rejects=rejects)
+    print(f'imported {count} {args.table}, skipped {len(rejects)}')
+    if args.rejects:
+        with open(args.rejects, 'w', encoding='utf-8') as handle:
+            for record, reason in rejects:
+                record = {key: value for key, value in record.items() if key != 'Password'}
+                handle.write(json.dumps({'reason': reason, 'record': record}) + '\n')
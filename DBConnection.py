@@ -0,0 +1,90 @@
+"""
+Shared SQLite connection manager
+
+Created 10/18/2026
+Created for CSI2999 Polyrhythm Skate semester project so that the booking library (app/S2_lib.py), the user
+handler (DBUserHandler.py) and Flask-SQLAlchemy all open SkateDB.db the same way
+
+Relevant online documentation:
+https://docs.python.org/3/library/sqlite3.html#sqlite3.connect
+https://www.sqlite.org/wal.html
+https://www.sqlite.org/pragma.html
+
+Change Log:
+10/18/2026: Initial Version, per thread connection reuse with WAL journal and busy timeout
+
+10/18/2026: Connections time their statements when Instrumentation.py is enabled
+
+Future Task List:
+-
+"""
+
+import os, sqlite3, threading
+import Instrumentation
+
+BUSY_TIMEOUT = 30000  # milliseconds to wait for another connection's write lock
+STATEMENT_CACHE = 256  # prepared statements kept per connection
+PRAGMAS = (('journal_mode', 'WAL'), ('synchronous', 'NORMAL'), ('busy_timeout', BUSY_TIMEOUT), ('temp_store', 'MEMORY'))
+
+# set to False to go back to one plain sqlite3.connect per call (benchmark baseline only)
+POOLING = True
+
+_local = threading.local()
+
+
+def applyPragmas(connection):
+    """
+    Apply the project wide pragmas to a raw sqlite3 connection
+    :param connection: sqlite3 connection
+    :return: None
+    """
+    for name, value in PRAGMAS:
+        connection.execute(f'PRAGMA {name}={value};')
+
+
+def openConnection(dbPath, **kwargs):
+    """
+    Open a new configured connection. Used directly by Flask-SQLAlchemy, which keeps its own pool
+    :param dbPath: database file
+    :param kwargs: extra sqlite3.connect arguments
+    :return: sqlite3 connection
+    """
+    kwargs.setdefault('timeout', BUSY_TIMEOUT / 1000)
+    kwargs.setdefault('cached_statements', STATEMENT_CACHE)
+    kwargs.setdefault('factory', Instrumentation.connectionFactory())
+    connection = sqlite3.connect(dbPath, **kwargs)
+    applyPragmas(connection)
+    return connection
+
+
+def getConnection(dbPath):
+    """
+    Connection to dbPath owned by the calling thread, opened on first use and reused afterwards.
+    Connections are in autocommit mode, callers that need a transaction issue BEGIN themselves.
+    A forked worker never reuses its parent's connections.
+    :param dbPath: database file
+    :return: sqlite3 connection, do not close it
+    """
+    if not POOLING:
+        return sqlite3.connect(dbPath, isolation_level=None, factory=Instrumentation.connectionFactory())
+    connections = getattr(_local, 'connections', None)
+    if connections is None or _local.pid != os.getpid():
+        connections = _local.connections = {}
+        _local.pid = os.getpid()
+    connection = connections.get(dbPath)
+    if connection is None:
+        connection = connections[dbPath] = openConnection(dbPath, isolation_level=None)
+    return connection
+
+
+def closeConnections():
+    """
+    Close every connection owned by the calling thread
+    :return: None
+    """
+    connections = getattr(_local, 'connections', None)
+    if connections and _local.pid == os.getpid():
+        for connection in connections.values():
+            connection.close()
+    _local.connections = {}
+    _local.pid = os.getpid()
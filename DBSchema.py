@@ -0,0 +1,223 @@
+"""
+Database schema bootstrap and migrations
+
+Created 10/18/2026
+Created for CSI2999 Polyrhythm Skate semester project so that tables and indexes are created once when the
+app starts instead of on every DBHandler construction
+
+Relevant online documentation:
+https://www.sqlite.org/pragma.html#pragma_user_version
+
+Change Log:
+10/18/2026: Initial Version, Users, Booking and legacy events tables plus the booking span index
+
+10/18/2026: Booking revisions and tombstones
+
+10/18/2026: Per user booking span index, migrate() can stop at an older version for benchmarks
+
+10/18/2026: Recurring booking series and their cancelled occurrences
+
+10/18/2026: Capacity limited skate sessions and reservations
+
+10/18/2026: Per day occupancy buckets for the heatmap
+
+10/18/2026: Index of the per year booking archive files
+
+10/18/2026: Resources (rinks and rooms) and the resource of each booking
+
+10/18/2026: Booking ids use AUTOINCREMENT so a deleted or archived id is never reused
+
+10/18/2026: Tombstones are keyed by user and booking id
+
+Future Task List:
+-
+
+Every entry in MIGRATIONS upgrades the database by one version, the version reached is stored in
+PRAGMA user_version. Only ever append to the list, never edit an entry that has shipped.
+"""
+
+import sqlite3, threading
+import DBConnection
+
+MIGRATIONS = [
+    # 1: tables created by DBUserHandler.py, create_Booking.py and app/S1A_events.sql
+    (
+        'CREATE TABLE IF NOT EXISTS Users ("UID" INTEGER NOT NULL UNIQUE, "FirstName" TEXT NOT NULL, "LastName" TEXT NOT NULL, "Username" TEXT NOT NULL UNIQUE, "Email" TEXT NOT NULL UNIQUE, "Password" TEXT NOT NULL, PRIMARY KEY ("UID" AUTOINCREMENT));',
+        '''CREATE TABLE IF NOT EXISTS Booking
+            (id	INTEGER		PRIMARY KEY,
+            start	DATETIME	NOT NULL,
+            end	DATETIME	NOT NULL,
+            text	TEXT		NOT NULL,
+            color	TEXT		NOT NULL,
+            bg		TEXT		NOT NULL,
+            user_id	INTEGER		NOT NULL,
+            FOREIGN KEY(user_id) REFERENCES Users(UID)
+            );''',
+        'CREATE INDEX IF NOT EXISTS idx_startBook ON Booking (start);',
+        'CREATE INDEX IF NOT EXISTS idx_endBook ON Booking (end);',
+        'CREATE TABLE IF NOT EXISTS events (id INTEGER, start DATETIME, end DATETIME, text TEXT NOT NULL, color TEXT NOT NULL, bg TEXT NOT NULL, PRIMARY KEY("id" AUTOINCREMENT));',
+        'CREATE INDEX IF NOT EXISTS idx_start ON events (start);',
+        'CREATE INDEX IF NOT EXISTS idx_end ON events (end);',
+    ),
+    # 2: overlap search for the booking conflict engine (app/conflicts.py)
+    (
+        'CREATE INDEX IF NOT EXISTS idx_spanBook ON Booking (end, start);',
+    ),
+    # 3: per user revision counter and delete tombstones for incremental calendar sync (/events/)
+    (
+        'ALTER TABLE Booking ADD COLUMN revision INTEGER NOT NULL DEFAULT 0;',
+        'CREATE INDEX IF NOT EXISTS idx_revisionBook ON Booking (user_id, revision);',
+        'CREATE TABLE IF NOT EXISTS BookingRevision (user_id INTEGER PRIMARY KEY, revision INTEGER NOT NULL);',
+        'CREATE TABLE IF NOT EXISTS BookingTombstone (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, revision INTEGER NOT NULL);',
+        'CREATE INDEX IF NOT EXISTS idx_revisionTombstone ON BookingTombstone (user_id, revision);',
+    ),
+    # 4: month/range queries in app/S2_lib.py, user_id = ? AND end > ? AND start < ?
+    (
+        'CREATE INDEX IF NOT EXISTS idx_userSpanBook ON Booking (user_id, end, start);',
+    ),
+    # 5: recurring booking series, expanded on read by app/recurrence.py
+    (
+        '''CREATE TABLE IF NOT EXISTS BookingSeries
+            (id		INTEGER		PRIMARY KEY,
+            start	DATETIME	NOT NULL,
+            end		DATETIME	NOT NULL,
+            freq	TEXT		NOT NULL,
+            `interval`	INTEGER		NOT NULL DEFAULT 1,
+            byday	TEXT,
+            until	DATETIME	NOT NULL,
+            lastEnd	DATETIME	NOT NULL,
+            count	INTEGER,
+            text	TEXT		NOT NULL,
+            color	TEXT		NOT NULL,
+            bg		TEXT		NOT NULL,
+            user_id	INTEGER		NOT NULL,
+            revision	INTEGER		NOT NULL DEFAULT 0,
+            deleted	INTEGER		NOT NULL DEFAULT 0,
+            FOREIGN KEY(user_id) REFERENCES Users(UID)
+            );''',
+        'CREATE TABLE IF NOT EXISTS BookingSeriesException (series_id INTEGER NOT NULL, occurrence DATETIME NOT NULL, PRIMARY KEY (series_id, occurrence)) WITHOUT ROWID;',
+        'CREATE INDEX IF NOT EXISTS idx_spanSeries ON BookingSeries (lastEnd, start) WHERE deleted = 0;',
+        'CREATE INDEX IF NOT EXISTS idx_userSpanSeries ON BookingSeries (user_id, lastEnd, start) WHERE deleted = 0;',
+        'CREATE INDEX IF NOT EXISTS idx_revisionSeries ON BookingSeries (user_id, revision);',
+    ),
+    # 6: skate sessions shared up to a capacity, reserved seats are counted on the session (app/inventory.py)
+    (
+        '''CREATE TABLE IF NOT EXISTS SkateSession
+            (id		INTEGER		PRIMARY KEY,
+            start	DATETIME	NOT NULL,
+            end		DATETIME	NOT NULL,
+            text	TEXT		NOT NULL,
+            capacity	INTEGER		NOT NULL CHECK (capacity > 0),
+            reserved	INTEGER		NOT NULL DEFAULT 0 CHECK (reserved >= 0 AND reserved <= capacity)
+            );''',
+        'CREATE INDEX IF NOT EXISTS idx_spanSession ON SkateSession (start, end);',
+        'CREATE TABLE IF NOT EXISTS Reservation (session_id INTEGER NOT NULL, user_id INTEGER NOT NULL, seats INTEGER NOT NULL CHECK (seats > 0), PRIMARY KEY (session_id, user_id), FOREIGN KEY(session_id) REFERENCES SkateSession(id), FOREIGN KEY(user_id) REFERENCES Users(UID)) WITHOUT ROWID;',
+        'CREATE INDEX IF NOT EXISTS idx_userReservation ON Reservation (user_id);',
+    ),
+    # 7: minutes taken per hour of each day, built on first read by app/occupancy.py and kept current by every write
+    (
+        'CREATE TABLE IF NOT EXISTS OccupancyDay (day TEXT PRIMARY KEY, hours TEXT NOT NULL) WITHOUT ROWID;',
+    ),
+    # 8: which archive files (Archive.py) hold bookings moved out of Booking, and the span each one covers
+    (
+        'CREATE TABLE IF NOT EXISTS ArchiveYear (year INTEGER PRIMARY KEY, firstStart TEXT NOT NULL, lastEnd TEXT NOT NULL, rows INTEGER NOT NULL);',
+    ),
+    # 9: bookings hold one resource, existing ones the main rink. conflict checks search resource + end (app/conflicts.py),
+    # a month of one resource user_id + resource + end (app/S2_lib.py)
+    (
+        'CREATE TABLE IF NOT EXISTS Resource (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);',
+        "INSERT OR IGNORE INTO Resource (id, name) VALUES (1, 'Main Rink');",
+        'ALTER TABLE Booking ADD COLUMN resource INTEGER NOT NULL DEFAULT 1;',
+        'CREATE INDEX IF NOT EXISTS idx_resourceSpanBook ON Booking (resource, end, start);',
+        'CREATE INDEX IF NOT EXISTS idx_userResourceSpanBook ON Booking (user_id, resource, end, start);',
+    ),
+    # 10: booking ids are never handed out twice. without AUTOINCREMENT SQLite reuses max(id) + 1 once the newest
+    # booking is deleted, and that id may already be archived (Archive.py) or tombstoned. the table is rebuilt, which
+    # drops its indexes, and the sequence starts past every id that was live or deleted.
+    (
+        '''CREATE TABLE BookingNext
+            (id	INTEGER		PRIMARY KEY AUTOINCREMENT,
+            start	DATETIME	NOT NULL,
+            end	DATETIME	NOT NULL,
+            text	TEXT		NOT NULL,
+            color	TEXT		NOT NULL,
+            bg		TEXT		NOT NULL,
+            user_id	INTEGER		NOT NULL,
+            revision	INTEGER		NOT NULL DEFAULT 0,
+            resource	INTEGER		NOT NULL DEFAULT 1,
+            FOREIGN KEY(user_id) REFERENCES Users(UID)
+            );''',
+        'INSERT INTO BookingNext (id, start, end, text, color, bg, user_id, revision, resource) SELECT id, start, end, text, color, bg, user_id, revision, resource FROM Booking;',
+        'DROP TABLE Booking;',
+        'ALTER TABLE BookingNext RENAME TO Booking;',
+        "DELETE FROM sqlite_sequence WHERE name = 'Booking';",
+        "INSERT INTO sqlite_sequence (name, seq) VALUES ('Booking', max((SELECT coalesce(max(id), 0) FROM Booking), (SELECT coalesce(max(id), 0) FROM BookingTombstone)));",
+        'CREATE INDEX IF NOT EXISTS idx_startBook ON Booking (start);',
+        'CREATE INDEX IF NOT EXISTS idx_endBook ON Booking (end);',
+        'CREATE INDEX IF NOT EXISTS idx_spanBook ON Booking (end, start);',
+        'CREATE INDEX IF NOT EXISTS idx_revisionBook ON Booking (user_id, revision);',
+        'CREATE INDEX IF NOT EXISTS idx_userSpanBook ON Booking (user_id, end, start);',
+        'CREATE INDEX IF NOT EXISTS idx_resourceSpanBook ON Booking (resource, end, start);',
+        'CREATE INDEX IF NOT EXISTS idx_userResourceSpanBook ON Booking (user_id, resource, end, start);',
+    ),
+    # 11: a tombstone per user and booking, one user's delete never replaces another user's tombstone of the same id
+    (
+        'CREATE TABLE BookingTombstoneNext (id INTEGER NOT NULL, user_id INTEGER NOT NULL, revision INTEGER NOT NULL, PRIMARY KEY (user_id, id)) WITHOUT ROWID;',
+        'INSERT INTO BookingTombstoneNext (id, user_id, revision) SELECT id, user_id, revision FROM BookingTombstone;',
+        'DROP TABLE BookingTombstone;',
+        'ALTER TABLE BookingTombstoneNext RENAME TO BookingTombstone;',
+        'CREATE INDEX IF NOT EXISTS idx_revisionTombstone ON BookingTombstone (user_id, revision);',
+    ),
+]
+
+_migrated = set()
+_lock = threading.Lock()
+
+
+def currentVersion(connection):
+    return connection.execute('PRAGMA user_version;').fetchone()[0]
+
+
+def migrate(dbPath, target=None):
+    """
+    Bring a database file up to the latest schema version. Each version is applied in its own write
+    transaction, so a half applied migration is never recorded as done.
+    :param dbPath: database file
+    :param target: stop at this version instead of the latest
+    :return: schema version after migrating
+    """
+    target = len(MIGRATIONS) if target is None else target
+    connection = DBConnection.openConnection(dbPath, isolation_level=None)
+    try:
+        version = currentVersion(connection)
+        while version < target:
+            connection.execute('BEGIN IMMEDIATE;')
+            try:
+                # another worker may have migrated while we waited for the lock
+                version = currentVersion(connection)
+                if version < target:
+                    for statement in MIGRATIONS[version]:
+                        connection.execute(statement)
+                    version += 1
+                    connection.execute(f'PRAGMA user_version={version};')
+                connection.execute('COMMIT;')
+            except sqlite3.Error:
+                connection.execute('ROLLBACK;')
+                raise
+        return version
+    finally:
+        connection.close()
+
+
+def ensureSchema(dbPath):
+    """
+    Migrate dbPath the first time this process sees it, afterwards this is a set lookup
+    :param dbPath: database file
+    :return: None
+    """
+    if dbPath in _migrated:
+        return
+    with _lock:
+        if dbPath not in _migrated:
+            migrate(dbPath)
+            _migrated.add(dbPath)
@@ -21,34 +21,63 @@ Work on preliminary unit testing
 
 5/27/2023: Fixed regex and modified exceptions to be custom exception classes
 
+10/18/2026: Connections come from the shared per thread pool in DBConnection.py
+
+10/18/2026: Schema is created by DBSchema.py once per process, one handler can now be shared by every request
+
+10/18/2026: Hashing goes through the bounded PasswordHasher pool, hashes are upgraded on login when the rounds change
+
+10/18/2026: Input rules moved to InputValidator.py and compiled once, signup errors name the fields that failed
+
+10/18/2026: SQL moved to Repository.UserRepository, login reads the profile and hash in one query
+
+10/18/2026: Dropped the unused unittest, re and passlib imports, passlib loads with the first hash (PasswordHasher.py)
+
 Future Task List:
 Do unit testing for input sanitization
 """
 
-import os, sqlite3, unittest, re
-from passlib.hash import pbkdf2_sha256
+import os, sqlite3
 from exceptions import *
+import DBConnection, DBSchema, InputValidator
+from PasswordHasher import PasswordHasher
+from Repository import UserRepository
 
 tableColumnDict = {'Users': '("UID" INTEGER NOT NULL UNIQUE, "FirstName" TEXT NOT NULL, "LastName" TEXT NOT NULL, "Username" TEXT NOT NULL UNIQUE, "Email" TEXT NOT NULL UNIQUE, "Password" TEXT NOT NULL, PRIMARY KEY ("UID" AUTOINCREMENT))'}
 tableInsertDict = {'Users': '("UID", "FirstName", "LastName", "Username", "Email", "Password") VALUES (?, ?, ?, ?, ?)'}
 
 
+defaultHasher = PasswordHasher()
+
+
 class DBHandler():
 
-    def __init__(self, databasePath=None):
+    def __init__(self, databasePath=None, hasher=None):
         """
         Initializes the SQLite Database Connection, raises FileNotFoundError if the database is missing
+        :param hasher: PasswordHasher to use, defaults to one shared pool with passlib's default rounds
         """
         self.dbPath = databasePath
+        self.hasher = hasher if hasher is not None else defaultHasher
         if self.dbPath is None:
             self.dbPath = 'SkateDB.db'
         if not os.path.isfile(self.dbPath):
             raise FileNotFoundError("Database file not found in base program directory")
-        self.dbConnection = sqlite3.connect(self.dbPath)
-        self.dbCursor = self.dbConnection.cursor()
 
-        # make sure the table exists before trying to do work later
-        self.createTable('Users')
+        # make sure the tables exist before trying to do work later, only does work the first time per process
+        DBSchema.ensureSchema(self.dbPath)
+        self.users = UserRepository(self.dbPath)
+
+    @property
+    def dbConnection(self):
+        """
+        Connection owned by the calling thread, so a single handler can be shared between request threads
+        """
+        return DBConnection.getConnection(self.dbPath)
+
+    @property
+    def dbCursor(self):
+        return self.dbConnection.cursor()
 
     def createTable(self, tableName):
         """
@@ -69,17 +98,15 @@ class DBHandler():
         :param Password:
         :return: True if storage is successful, false if not
         """
-        if self.sanitze(FirstName, 'Name') is None or self.sanitze(LastName, 'Name') is None or self.sanitze(Username, 'Name') is None or self.sanitze(
-                Email, 'Email') is None:
-            raise UnsanitaryInputException('Unsanitary input')
-        if self.checkPasswordIntegrity(Password) is None:
-            raise BadPasswordException('Password is not strong enough')
+        errors = InputValidator.validateUser({'FirstName': FirstName, 'LastName': LastName, 'Username': Username,
+                                              'Email': Email, 'Password': Password})
+        unsanitary = [error for error in errors if error.field != 'Password']
+        if unsanitary:
+            raise UnsanitaryInputException('Unsanitary input: ' + InputValidator.describe(unsanitary), unsanitary)
+        if errors:
+            raise BadPasswordException('Password is not strong enough', errors)
         self.checkDuplicateUserInfo(Username, Email)
-        passHash = self.hashPassword(str(Password))
-        statement = 'INSERT INTO Users (FirstName, LastName,  Username, Email, Password) VALUES (?, ?, ?, ?, ?);'
-        arg = (str(FirstName), str(LastName), str(Username), str(Email), passHash)
-        self.dbCursor.execute(statement, arg)
-        self.dbConnection.commit()
+        self.users.insert(FirstName, LastName, Username, Email, self.hashPassword(str(Password)))
         return True
 
     def checkDuplicateUserInfo(self, Username, Email):
@@ -90,13 +117,10 @@ class DBHandler():
         :param Email:
         :return:
         """
-        statement = 'SELECT Username FROM Users WHERE Username=?;'
-        arg = (Username,)
-        if len(self.dbCursor.execute(statement, arg).fetchall()) > 0:
+        taken = self.users.taken(Username, Email)
+        if 'Username' in taken:
             raise sqlite3.DataError('Duplicate Username')
-        statement = 'SELECT Email FROM Users WHERE Email=?;'
-        arg = (Email,)
-        if len(self.dbCursor.execute(statement, arg).fetchall()) > 0:
+        if 'Email' in taken:
             raise sqlite3.DataError('Duplicate Email found in table')
 
     def retrievePassHash(self, Username=None, Email=None):
@@ -106,22 +130,21 @@ class DBHandler():
         :param Email:
         :return: password hash
         """
-        if Username is not None:
-            statement = 'SELECT Password FROM USERS WHERE Username=?;'
-            arg = (str(Username),)
-            try:
-                return self.dbCursor.execute(statement, arg).fetchone()[0]
-            except TypeError:
+        return self.retrieveCredentials(Username, Email)[1]
+
+    def retrieveCredentials(self, Username=None, Email=None):
+        """
+        Retrieves the profile and hashed password in one query, accepts Username or email
+        :param Username:
+        :param Email:
+        :return: (UserProfile, password hash)
+        """
+        found = self.users.credentials(Username, Email)
+        if found is None:
+            if Username is not None:
                 raise ValueError('No matching username and password pair')
-        elif Email is not None:
-            statement = 'SELECT Password FROM Users WHERE Email=?;'
-            arg = (str(Email),)
-            try:
-                return self.dbCursor.execute(statement, arg).fetchone()[0]
-            except TypeError:
-                raise ValueError('No matching email and password pair')
-        else:
-            raise ValueError('No input')
+            raise ValueError('No matching email and password pair')
+        return found
 
     def hashPassword(self, rawPassword):
         """
@@ -129,7 +152,7 @@ class DBHandler():
         :param rawPassword: string password value
         :return: hashed password
         """
-        return pbkdf2_sha256.hash(str(rawPassword))
+        return self.hasher.hash(str(rawPassword))
 
     def verifyPassword(self, rawPassword, Username=None, Email=None):
         """
@@ -142,7 +165,33 @@ class DBHandler():
         :param Email:
         :return: True or False depending on password match
         """
-        return pbkdf2_sha256.verify(str(rawPassword), self.retrievePassHash(Username, Email))
+        return self.checkCredentials(rawPassword, self.retrieveCredentials(Username, Email)) is not None
+
+    def checkCredentials(self, rawPassword, credentials):
+        """
+        :param credentials: (UserProfile, password hash) from retrieveCredentials
+        :return: the UserProfile if rawPassword matches, None if not
+        """
+        profile, passHash = credentials
+        if not self.hasher.verify(str(rawPassword), passHash):
+            return None
+        if self.hasher.needsRehash(passHash):
+            # the password is already verified, a full pool only puts the upgrade off to the next login
+            try:
+                self.updatePassHash(profile.UID, passHash, self.hasher.hash(str(rawPassword)))
+            except HashingBusyException:
+                pass
+        return profile
+
+    def updatePassHash(self, uid, oldHash, newHash):
+        """
+        Replace a user's stored hash, only if it has not changed since it was read
+        :param uid: UID of the user whose hash was verified
+        :param oldHash: hash that was verified
+        :param newHash: replacement hash
+        :return: None
+        """
+        self.users.replaceHash(uid, oldHash, newHash)
 
     def attemptLogin(self, passwordArg, Email=None, Username=None):
         """
@@ -152,13 +201,20 @@ class DBHandler():
         :param passwordArg:
         :return: False if email and password match is not found, True if a match is found
         """
+        return self.login(passwordArg, Email=Email, Username=Username) is not None
+
+    def login(self, passwordArg, Email=None, Username=None):
+        """
+        attemptLogin that also returns who logged in, so the view needs no second lookup of the user
+        :return: UserProfile if the password matches, None if not. ValueError if there is no such user
+        """
         if Username is not None:
             if self.sanitze(Username, 'Name') is None:
                 raise UnsanitaryInputException('Unsanitary Input')
         elif Email is not None:
             if self.sanitze(Email, 'Email') is None:
                 raise UnsanitaryInputException('Unsanitary Input')
-        return self.verifyPassword(passwordArg, Email=Email, Username=Username)
+        return self.checkCredentials(passwordArg, self.retrieveCredentials(Username, Email))
 
     def sanitze(self, arg, typeflag=None):
         """
@@ -169,11 +225,9 @@ class DBHandler():
         :return:
         """
         if typeflag == 'Name':
-            regexStr = '^[A-Za-z]+(((\'|\-|\.)?([A-Za-z])+))?$'
-            return re.match(regexStr, arg)
+            return InputValidator.checkName(arg)
         if typeflag == 'Email':
-            regexStr = '^[a-zA-Z0-9.!#$%&’*+=?^_`{|}~-]+@[a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)*$'
-            return re.match(regexStr, arg)
+            return InputValidator.checkEmail(arg)
 
     def checkPasswordIntegrity(self, pwd):
         """
@@ -182,7 +236,4 @@ class DBHandler():
         :param pwd:
         :return:
         """
-        minLen = 6
-        maxLen = 20
-        regexStr = '^(?=\S{' + str(minLen) + ',' + str(maxLen) + '}$)(?=.*?\d)(?=.*?[a-z])(?=.*?[A-Z])(?=.*?[^A-Za-z\s0-9])'
-        return re.match(regexStr, pwd)
+        return InputValidator.checkPassword(pwd)
@@ -0,0 +1,110 @@
+"""
+User input validation
+
+Created 10/18/2026
+Created for CSI2999 Polyrhythm Skate semester project so the name, email and password rules used by
+DBHandler.sanitze/checkPasswordIntegrity are compiled once and can check whole batches of user records
+
+Relevant online documentation:
+https://docs.python.org/3/library/re.html#re.compile
+
+Change Log:
+10/18/2026: Initial Version, same rules as DBUserHandler.py 5/27/2023
+
+Future Task List:
+-
+
+Single values are checked with checkName/checkEmail/checkPassword, which return the match or None like
+re.match. validateUser/validateUsers return FieldError tuples naming every field that failed, so callers
+can report all problems with a record at once instead of only the first.
+"""
+
+import re
+from collections import namedtuple
+
+PASSWORD_MIN_LENGTH = 6
+PASSWORD_MAX_LENGTH = 20
+
+NAME_PATTERN = re.compile(r"^[A-Za-z]+((('|\-|\.)?([A-Za-z])+))?$")
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9.!#$%&’*+=?^_`{|}~-]+@[a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)*$')
+PASSWORD_PATTERN = re.compile(r'^(?=\S{' + str(PASSWORD_MIN_LENGTH) + ',' + str(PASSWORD_MAX_LENGTH) + r'}$)'
+                              r'(?=.*?\d)(?=.*?[a-z])(?=.*?[A-Z])(?=.*?[^A-Za-z\s0-9])')
+
+PASSWORD_RULE = (f'Password must be between {PASSWORD_MIN_LENGTH} and {PASSWORD_MAX_LENGTH} characters and contain at '
+                 'least 1 uppercase letter, 1 lowercase letter, 1 number and 1 special character.')
+
+# field name -> (pattern, error code, message)
+USER_RULES = {
+    'FirstName': (NAME_PATTERN, 'unsanitary', 'may only contain letters and one \', - or .'),
+    'LastName': (NAME_PATTERN, 'unsanitary', 'may only contain letters and one \', - or .'),
+    'Username': (NAME_PATTERN, 'unsanitary', 'may only contain letters and one \', - or .'),
+    'Email': (EMAIL_PATTERN, 'unsanitary', 'is not a valid email address'),
+    'Password': (PASSWORD_PATTERN, 'weak', PASSWORD_RULE),
+}
+
+FieldError = namedtuple('FieldError', ('field', 'code', 'message'))
+
+
+def checkName(value):
+    """
+    :param value: first, last or user name
+    :return: match object or None
+    """
+    return NAME_PATTERN.match(value)
+
+
+def checkEmail(value):
+    """
+    :param value: email address
+    :return: match object or None
+    """
+    return EMAIL_PATTERN.match(value)
+
+
+def checkPassword(value):
+    """
+    :param value: raw password
+    :return: match object or None
+    """
+    return PASSWORD_PATTERN.match(value)
+
+
+def validateUser(record, fields=None):
+    """
+    :param record: dict with FirstName, LastName, Username, Email and Password
+    :param fields: only check these fields, defaults to all of them
+    :return: list of FieldError, empty if the record is valid
+    """
+    errors = []
+    for field in fields or USER_RULES:
+        pattern, code, message = USER_RULES[field]
+        value = record.get(field)
+        if not value:
+            errors.append(FieldError(field, 'missing', 'is required'))
+        elif not isinstance(value, str) or pattern.match(value) is None:
+            errors.append(FieldError(field, code, message))
+    return errors
+
+
+def validateUsers(records):
+    """
+    Validate a batch of user records
+    :param records: iterable of user dicts
+    :return: (valid records, [(record, [FieldError])] for the invalid ones)
+    """
+    valid, invalid = [], []
+    for record in records:
+        errors = validateUser(record)
+        if errors:
+            invalid.append((record, errors))
+        else:
+            valid.append(record)
+    return valid, invalid
+
+
+def describe(errors):
+    """
+    :param errors: list of FieldError
+    :return: one line such as "Email: is not a valid email address"
+    """
+    return '; '.join(f'{error.field}: {error.message}' for error in errors)
@@ -0,0 +1,228 @@
+"""
+Request and SQL timing instrumentation
+
+Created 10/18/2026
+Created for CSI2999 Polyrhythm Skate semester project to see where request time goes: per endpoint latency
+histograms, per statement SQL timings for both the raw sqlite3 connections (app/S2_lib.py, DBUserHandler.py)
+and Flask-SQLAlchemy, named sections such as the conflict check, the commit and password hashing, a slow query
+log, and a Prometheus text rendering of all of it for /metrics
+
+Relevant online documentation:
+https://prometheus.io/docs/instrumenting/exposition_formats/
+https://prometheus.io/docs/practices/histograms/
+https://docs.python.org/3/library/sqlite3.html#sqlite3.connect
+
+Change Log:
+10/18/2026: Initial Version
+
+Future Task List:
+-
+
+Everything is off until configure(enabled=True) runs, which app/__init__.py does from config.METRICS before any
+database connection is opened. While off, DBConnection hands out plain sqlite3 connections, the request hooks
+return straight away and timer() returns one shared no-op context manager, so the cost is a flag check.
+While on, every connection DBConnection opens (including the ones Flask-SQLAlchemy gets through its creator)
+uses TimedConnection, whose cursors time each execute. Time spent fetching rows after the first step is not
+included, for SQLite most of the work happens in the first step.
+"""
+
+import bisect, contextlib, logging, re, sqlite3, threading, time
+
+# upper bounds in seconds, +Inf is implied
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+STATEMENT_LENGTH = 120  # statement labels are cut to this many characters
+
+ENABLED = False
+SLOW_QUERY_SECONDS = 0.05
+
+slowLog = logging.getLogger('glasspass.slowquery')
+
+_lock = threading.Lock()
+_noTimer = contextlib.nullcontext()
+_spaces = re.compile(r'\s+')
+_marks = re.compile(r'\?(\s*,\s*\?)+')
+
+
+class Histogram():
+    """
+    Cumulative bucket counts, sum and count, the layout Prometheus expects. Callers hold _lock
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+
+# {label values: Histogram} for the histograms, {label values: count} for the counters
+requestTimes = {}
+requestCounts = {}
+queryTimes = {}
+sectionTimes = {}
+slowQueries = {}
+
+
+def configure(enabled=False, slowQueryMs=50):
+    """
+    Turn instrumentation on or off, only affects connections opened afterwards
+    :param enabled: True to record
+    :param slowQueryMs: statements slower than this are logged to the glasspass.slowquery logger
+    :return: None
+    """
+    global ENABLED, SLOW_QUERY_SECONDS
+    ENABLED = bool(enabled)
+    SLOW_QUERY_SECONDS = slowQueryMs / 1000
+
+
+def reset():
+    with _lock:
+        for table in (requestTimes, requestCounts, queryTimes, sectionTimes, slowQueries):
+            table.clear()
+
+
+def _observe(table, labels, seconds):
+    with _lock:
+        histogram = table.get(labels)
+        if histogram is None:
+            histogram = table[labels] = Histogram()
+        histogram.observe(seconds)
+
+
+def _count(table, labels):
+    with _lock:
+        table[labels] = table.get(labels, 0) + 1
+
+
+def statementLabel(sql):
+    """
+    Collapse whitespace and IN (?,?,...) lists so one statement is one label whatever its arguments
+    :param sql: statement text
+    :return: label value
+    """
+    return _marks.sub('?...', _spaces.sub(' ', sql).strip())[:STATEMENT_LENGTH]
+
+
+def observeRequest(endpoint, method, status, seconds):
+    _observe(requestTimes, (endpoint, method), seconds)
+    _count(requestCounts, (endpoint, method, str(status)))
+
+
+def observeQuery(sql, seconds):
+    label = statementLabel(sql)
+    _observe(queryTimes, (label,), seconds)
+    if seconds >= SLOW_QUERY_SECONDS:
+        _count(slowQueries, (label,))
+        slowLog.warning('slow query %.1f ms: %s', seconds * 1000, label)
+
+
+class _Timer():
+    __slots__ = ('name', 'started')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _observe(sectionTimes, (self.name,), time.perf_counter() - self.started)
+        return False
+
+
+def timer(name):
+    """
+    Time a named section of a request, for example with timer('commit'): ...
+    :param name: section label
+    :return: context manager, a shared no-op one while disabled
+    """
+    return _Timer(name) if ENABLED else _noTimer
+
+
+class TimedCursor(sqlite3.Cursor):
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            observeQuery(sql, time.perf_counter() - started)
+
+    def executemany(self, sql, parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, parameters)
+        finally:
+            observeQuery(sql, time.perf_counter() - started)
+
+
+class TimedConnection(sqlite3.Connection):
+    """
+    sqlite3 connection whose cursors, including the ones Connection.execute makes, time every statement
+    """
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, parameters):
+        return self.cursor().executemany(sql, parameters)
+
+
+def connectionFactory():
+    """
+    :return: sqlite3.connect factory for new connections
+    """
+    return TimedConnection if ENABLED else sqlite3.Connection
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}'
+
+
+def _renderHistograms(lines, metric, helpText, names, table):
+    lines.append(f'# HELP {metric} {helpText}')
+    lines.append(f'# TYPE {metric} histogram')
+    for values, histogram in sorted(table.items()):
+        cumulative = 0
+        for bound, count in zip(BUCKETS + ('+Inf',), histogram.counts):
+            cumulative += count
+            le = 'le="%s"' % bound
+            lines.append(f'{metric}_bucket{_labels(names, values, le)} {cumulative}')
+        lines.append(f'{metric}_sum{_labels(names, values)} {histogram.sum:.6f}')
+        lines.append(f'{metric}_count{_labels(names, values)} {histogram.count}')
+
+
+def _renderCounters(lines, metric, helpText, names, table):
+    lines.append(f'# HELP {metric} {helpText}')
+    lines.append(f'# TYPE {metric} counter')
+    for values, count in sorted(table.items()):
+        lines.append(f'{metric}{_labels(names, values)} {count}')
+
+
+def render():
+    """
+    :return: every metric in the Prometheus text exposition format
+    """
+    lines = []
+    with _lock:
+        _renderHistograms(lines, 'glasspass_request_seconds', 'Request latency by endpoint', ('endpoint', 'method'), requestTimes)
+        _renderCounters(lines, 'glasspass_requests_total', 'Requests by endpoint and status', ('endpoint', 'method', 'status'), requestCounts)
+        _renderHistograms(lines, 'glasspass_section_seconds', 'Time spent in named sections of a request', ('section',), sectionTimes)
+        _renderHistograms(lines, 'glasspass_query_seconds', 'SQL statement execution time', ('statement',), queryTimes)
+        _renderCounters(lines, 'glasspass_slow_queries_total', 'Statements slower than the slow query threshold', ('statement',), slowQueries)
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,136 @@
+"""
+Password hashing service
+
+Created 10/18/2026
+Created for CSI2999 Polyrhythm Skate semester project to move pbkdf2 hashing and verification off the
+request threads and onto a small bounded worker pool
+
+Relevant online documentation:
+https://passlib.readthedocs.io/en/stable/lib/passlib.hash.pbkdf2_digest.html
+https://docs.python.org/3/library/concurrent.futures.html
+
+Change Log:
+10/18/2026: Initial Version
+
+10/18/2026: hashMany for bulk user imports
+
+10/18/2026: Hashing and verification time, queue wait included, is recorded as the 'hash' section
+
+10/18/2026: passlib and the process pool are imported by the first hash instead of at startup
+
+Future Task List:
+-
+
+At most `workers` hashes run at once and at most `queueLimit` more may wait for a worker. Anything beyond
+that raises HashingBusyException straight away so the view can answer 503 instead of piling up threads.
+"""
+
+import itertools, threading
+from concurrent.futures import ThreadPoolExecutor
+from exceptions import HashingBusyException
+import Instrumentation
+
+
+_handler = None
+_handlerLock = threading.Lock()
+
+
+def _pbkdf2():
+    # passlib.hash resolves its handlers lazily and is not safe to import from several pool threads at once,
+    # the first caller loads it under the lock and everyone after reuses the class
+    global _handler
+    if _handler is None:
+        with _handlerLock:
+            if _handler is None:
+                from passlib.hash import pbkdf2_sha256
+                _handler = pbkdf2_sha256
+    return _handler
+
+
+def _hash(rawPassword, rounds):
+    return _pbkdf2().using(rounds=rounds).hash(rawPassword)
+
+
+def _verify(rawPassword, passHash):
+    return _pbkdf2().verify(rawPassword, passHash)
+
+
+class PasswordHasher():
+
+    def __init__(self, rounds=None, workers=2, queueLimit=16, useProcesses=False):
+        """
+        :param rounds: pbkdf2 rounds for new hashes, defaults to the passlib default
+        :param workers: hashes computed in parallel
+        :param queueLimit: requests allowed to wait for a free worker
+        :param useProcesses: hash in worker processes instead of threads
+        """
+        self.configuredRounds = rounds
+        self.workers = workers
+        self.queueLimit = queueLimit
+        self.useProcesses = useProcesses
+        self.slots = threading.BoundedSemaphore(workers + queueLimit)
+        self.pool = None
+        self.poolLock = threading.Lock()
+
+    @property
+    def rounds(self):
+        return self.configuredRounds or _pbkdf2().default_rounds
+
+    def _pool(self):
+        if self.pool is None:
+            with self.poolLock:
+                if self.pool is None:
+                    if self.useProcesses:
+                        from concurrent.futures import ProcessPoolExecutor as executor
+                    else:
+                        executor = ThreadPoolExecutor
+                    self.pool = executor(max_workers=self.workers)
+        return self.pool
+
+    def _run(self, function, *args):
+        if not self.slots.acquire(blocking=False):
+            raise HashingBusyException('Too many password checks in progress')
+        try:
+            with Instrumentation.timer('hash'):
+                return self._pool().submit(function, *args).result()
+        finally:
+            self.slots.release()
+
+    def hash(self, rawPassword):
+        """
+        :param rawPassword: string password value
+        :return: pbkdf2_sha256 hash using the configured rounds
+        """
+        return self._run(_hash, str(rawPassword), self.rounds)
+
+    def verify(self, rawPassword, passHash):
+        """
+        :param rawPassword: string password value
+        :param passHash: stored hash
+        :return: True or False depending on password match
+        """
+        return self._run(_verify, str(rawPassword), passHash)
+
+    def hashMany(self, rawPasswords):
+        """
+        Hash a whole batch across every worker, for offline bulk loads only since it ignores the queue limit
+        :param rawPasswords: list of string password values
+        :return: list of hashes in the same order
+        """
+        rawPasswords = [str(p) for p in rawPasswords]
+        chunk = max(1, len(rawPasswords) // (self.workers * 4))
+        return list(self._pool().map(_hash, rawPasswords, itertools.repeat(self.rounds), chunksize=chunk))
+
+    def needsRehash(self, passHash):
+        """
+        True if the stored hash was made with a different number of rounds than configured
+        :param passHash: stored hash
+        :return: True or False
+        """
+        return _pbkdf2().from_string(passHash).rounds != self.rounds
+
+    def shutdown(self):
+        with self.poolLock:
+            if self.pool is not None:
+                self.pool.shutdown()
+                self.pool = None
@@ -0,0 +1,102 @@
+"""
+User repository
+
+Created 10/18/2026
+Created for CSI2999 Polyrhythm Skate semester project so that every read and write of the Users table goes through
+one set of queries on the shared per thread connections of DBConnection.py, instead of Flask-SQLAlchemy for some
+requests and DBUserHandler.py's raw sqlite3 for others
+
+Relevant online documentation:
+https://docs.python.org/3/library/sqlite3.html#module-sqlite3
+
+Change Log:
+10/18/2026: Initial Version
+
+Future Task List:
+-
+
+Validation and hashing stay in DBUserHandler.py, which uses this for its SQL. Bookings already have a single layer,
+app/S2_lib.py, on the same connections. app/models.py only maps the Users table for ad hoc ORM use, no request
+path queries through it.
+"""
+
+import collections
+import DBConnection
+
+# only what the templates need, never the password hash
+UserProfile = collections.namedtuple('UserProfile', ['UID', 'FirstName', 'LastName', 'Username', 'Email'])
+
+PROFILE_COLUMNS = 'UID, FirstName, LastName, Username, Email'
+BATCH = 500  # ids per IN (...) query, below SQLite's bound parameter limit
+
+
+class UserRepository():
+
+    def __init__(self, dbPath):
+        self.dbPath = dbPath
+
+    @property
+    def connection(self):
+        return DBConnection.getConnection(self.dbPath)
+
+    def profile(self, uid):
+        """
+        :return: UserProfile or None
+        """
+        row = self.connection.execute(f'SELECT {PROFILE_COLUMNS} FROM Users WHERE UID=?;', (uid,)).fetchone()
+        return None if row is None else UserProfile(*row)
+
+    def profiles(self, uids):
+        """
+        Batched profile lookup, one query per BATCH ids instead of one per id
+        :param uids: user ids, duplicates allowed
+        :return: {uid: UserProfile} for the ids that exist
+        """
+        uids, found = list(set(uids)), {}
+        for n in range(0, len(uids), BATCH):
+            chunk = uids[n:n + BATCH]
+            marks = ', '.join('?' * len(chunk))
+            for row in self.connection.execute(f'SELECT {PROFILE_COLUMNS} FROM Users WHERE UID IN ({marks});', chunk):
+                found[row[0]] = UserProfile(*row)
+        return found
+
+    def credentials(self, Username=None, Email=None):
+        """
+        Profile and password hash in one query, all a login needs
+        :return: (UserProfile, password hash) or None if no such user
+        """
+        if Username is not None:
+            row = self.connection.execute(f'SELECT {PROFILE_COLUMNS}, Password FROM Users WHERE Username=?;', (str(Username),)).fetchone()
+        elif Email is not None:
+            row = self.connection.execute(f'SELECT {PROFILE_COLUMNS}, Password FROM Users WHERE Email=?;', (str(Email),)).fetchone()
+        else:
+            raise ValueError('No input')
+        return None if row is None else (UserProfile(*row[:5]), row[5])
+
+    def taken(self, Username, Email):
+        """
+        :return: set holding 'Username' and/or 'Email' for the values another account already uses
+        """
+        rows = self.connection.execute('SELECT Username, Email FROM Users WHERE Username=? OR Email=?;', (Username, Email))
+        taken = set()
+        for name, email in rows:
+            if name == Username:
+                taken.add('Username')
+            if email == Email:
+                taken.add('Email')
+        return taken
+
+    def insert(self, FirstName, LastName, Username, Email, passHash):
+        """
+        :return: new UID
+        """
+        cursor = self.connection.execute('INSERT INTO Users (FirstName, LastName, Username, Email, Password) VALUES (?, ?, ?, ?, ?);',
+                                         (str(FirstName), str(LastName), str(Username), str(Email), passHash))
+        return cursor.lastrowid
+
+    def replaceHash(self, uid, oldHash, newHash):
+        """
+        Replace a user's stored hash, only if it has not changed since it was read. The row is found by its primary
+        key, Password is only compared
+        """
+        self.connection.execute('UPDATE Users SET Password=? WHERE UID=? AND Password=?;', (newHash, uid, oldHash))
@@ -1,74 +1,387 @@
 # (A) LOAD SQLITE MODULE
-import sqlite3, datetime
-from calendar import monthrange
+import sqlite3, datetime, os
+from app.conflicts import ConflictEngine
+from app import recurrence, inventory, occupancy, pubsub, wire
+import Archive, DBConnection, DBSchema, Instrumentation
 DBFILE = "SkateDB.db"
+conflicts = ConflictEngine()
 
-def checkConflicts(start,end):
-  conn = sqlite3.connect(DBFILE)
-  cursor = conn.cursor()
-  confSQL = "SELECT * FROM BOOKING WHERE ((start >= ?) AND (end <= ?))"
-  conflicts = cursor.execute(confSQL,(start,end)).fetchall()
-  conn.close()
-  if len(conflicts) == 0:
-    return False
-  else:
-    return True
+# a booking is in [start, end) when it starts before the range ends and ends
+# after it starts. user_id + end lead idx_userSpanBook (see DBSchema.py), so
+# only that user's bookings finishing after the range start are walked.
+GET_SQL = "SELECT * FROM `Booking` WHERE `user_id` = ? AND `end` > ? AND `start` < ?"
+RANGE_SQL = "SELECT `id`, `start`, `end`, `text`, `color`, `bg` FROM `Booking` WHERE `user_id` = ? AND `end` > ? AND `start` < ?"
+
+# (A1) RESOURCES
+# every booking holds one resource, a rink or a room (see the Resource
+# table). series, skate sessions and the occupancy heatmap are all on
+# DEFAULT_RESOURCE, the main rink. with SHARDS on, the bookings of every
+# other resource live in a database file of their own (shardPath) with the
+# full schema, so saves on different resources never wait for each other's
+# write lock. those bookings have ids "r<resource>:<id>" and the revision of
+# a calendar spanning several files is "<resource>:<revision>,...".
+DEFAULT_RESOURCE = 1
+SHARDS = False
+
+def shardPath(resource):
+  root, extension = os.path.splitext(DBFILE)
+  return f"{root}.resource-{resource}{extension or '.db'}"
+
+def pathFor(resource):
+  """
+  Database file holding the bookings of resource
+  :raises ValueError: if resource is not in the Resource table, no file is made for it
+  """
+  if not SHARDS or resource is None or int(resource) == DEFAULT_RESOURCE:
+    return DBFILE
+  path = shardPath(checkResource(resource))
+  DBSchema.ensureSchema(path)
+  return path
+
+# resources are never removed, an id found once stays valid. keyed by the
+# main file too, tests and tools point DBFILE at other databases
+knownResources = set()
+
+def checkResource(resource, cursor=None):
+  """
+  :param cursor: cursor on DBFILE to look the resource up with, e.g. inside a save's transaction
+  :return: resource as an int
+  :raises ValueError: if resource is not in the Resource table
+  """
+  resource = int(resource)
+  if resource == DEFAULT_RESOURCE or (DBFILE, resource) in knownResources:
+    return resource
+  cursor = cursor or DBConnection.getConnection(DBFILE).cursor()
+  if not cursor.execute("SELECT EXISTS (SELECT 1 FROM `Resource` WHERE `id`=?)", (resource,)).fetchone()[0]:
+    raise ValueError(f"no resource {resource}")
+  knownResources.add((DBFILE, resource))
+  return resource
+
+def readPaths(resource=None):
+  """
+  (resource, file) of every database a read has to look at, resource None
+  for the main file read without a resource filter
+  :raises ValueError: if resource is not in the Resource table
+  """
+  if resource is not None:
+    return [(checkResource(resource), pathFor(resource))]
+  if not SHARDS:
+    return [(None, DBFILE)]
+  others = [r for r in resourceIDs() if r != DEFAULT_RESOURCE and os.path.exists(shardPath(r))]
+  return [(None, DBFILE)] + [(r, pathFor(r)) for r in others]
+
+def publicID(resource, id):
+  return id if pathFor(resource) == DBFILE else f"r{resource}:{id}"
+
+def bookingKey(id):
+  """
+  :return: (resource whose file holds the booking, row id) of a booking id from the calendar
+  """
+  if isinstance(id, str) and id.startswith("r") and ":" in id:
+    resource, id = id[1:].split(":", 1)
+    return int(resource), int(id)
+  return DEFAULT_RESOURCE, id
+
+def scoped(sql, parameters, resource):
+  if resource is None:
+    return sql, parameters
+  return sql + " AND `resource` = ?", parameters + (resource,)
+
+def resourceIDs():
+  conn = DBConnection.getConnection(DBFILE)
+  return [r[0] for r in conn.execute("SELECT `id` FROM `Resource` ORDER BY `id`")]
+
+def resources():
+  """
+  :return: [id, name] of every rink and room
+  """
+  conn = DBConnection.getConnection(DBFILE)
+  return [list(r) for r in conn.execute("SELECT `id`, `name` FROM `Resource` ORDER BY `id`")]
+
+def addResource(name):
+  """
+  :return: new resource id
+  """
+  conn = DBConnection.getConnection(DBFILE)
+  return conn.execute("INSERT INTO `Resource` (`name`) VALUES (?) RETURNING `id`", (name,)).fetchone()[0]
+
+# the rink is taken by plain bookings, series occurrences and skate sessions,
+# and for past slots by bookings moved to the archive (see Archive.py). any
+# other resource is only taken by its own bookings.
+def rinkTaken(cursor, start, end, id=None, sessionID=None, resource=DEFAULT_RESOURCE):
+  with Instrumentation.timer("conflicts"):
+    if conflicts.hasConflict(cursor, start, end, id, resource):
+      return True
+    if resource == DEFAULT_RESOURCE and (recurrence.hasConflict(cursor, start, end) or inventory.hasConflict(cursor, start, end, sessionID)):
+      return True
+    return Archive.hasConflict(pathFor(resource), cursor, start, end, id, resource)
+
+def takenSlots(cursor, start, end, ignoreSeries=None, resource=DEFAULT_RESOURCE):
+  """
+  (start, end) of everything holding resource in [start, end), for bulk checks
+  """
+  taken = cursor.execute("SELECT `start`, `end` FROM `Booking` WHERE `resource` = ? AND `end` > ? AND `start` < ?", (resource, start, end)).fetchall()
+  if resource == DEFAULT_RESOURCE:
+    taken += recurrence.busy(cursor, start, end, ignoreSeries) + inventory.busy(cursor, start, end)
+  return taken + Archive.busy(pathFor(resource), cursor, start, end, resource)
+
+def checkConflicts(start, end, id=None, resource=DEFAULT_RESOURCE):
+  conn = DBConnection.getConnection(pathFor(resource))
+  return rinkTaken(conn.cursor(), start, end, id, resource=int(resource))
+
+# every save/delete bumps the owner's revision inside the write transaction,
+# so (user, revision) identifies one version of that user's calendar
+def bumpRevision(cursor, userID):
+  return cursor.execute(
+    "INSERT INTO `BookingRevision` (`user_id`, `revision`) VALUES (?, 1) "
+    "ON CONFLICT (`user_id`) DO UPDATE SET `revision` = `revision` + 1 RETURNING `revision`",
+    (userID,)
+  ).fetchone()[0]
+
+def revision(userID, resource=None):
+  """
+  :return: the user's revision, "<resource>:<revision>,..." over every file read when bookings are sharded
+  """
+  revisions = []
+  for shard, path in readPaths(resource):
+    row = DBConnection.getConnection(path).execute("SELECT `revision` FROM `BookingRevision` WHERE `user_id`=?", (userID,)).fetchone()
+    revisions.append((shard or DEFAULT_RESOURCE, 0 if row is None else row[0]))
+  if not SHARDS:
+    return revisions[0][1]
+  return ",".join(f"{shard}:{rev}" for shard, rev in revisions)
+
+def parseSince(since):
+  """
+  since as sent back by a calendar, a revision or {resource: revision} when bookings are sharded
+  :raises ValueError: if it is neither
+  """
+  if ":" not in since:
+    return int(since)
+  return {int(shard): int(rev) for shard, rev in (part.split(":") for part in since.split(","))}
+
+# a booking gone from userID's calendar, listed by /events/?since= until the
+# booking is theirs again. keyed by user, the same id can leave several calendars
+def tombstone(cursor, id, userID):
+  cursor.execute(
+    "INSERT INTO `BookingTombstone` (`id`, `user_id`, `revision`) VALUES (?,?,?) "
+    "ON CONFLICT (`user_id`, `id`) DO UPDATE SET `revision` = excluded.`revision`",
+    (id, userID, bumpRevision(cursor, userID))
+  )
 
 # (B) SAVE EVENT
-def save (start, end, txt, color, bg, user_id, id=None):
+def save (start, end, txt, color, bg, user_id, id=None, resource=DEFAULT_RESOURCE):
   # (B1) CONNECT
-  conn = sqlite3.connect(DBFILE)
+  # autocommit mode, transactions are opened explicitly below. a booking's
+  # file holds it for good, moving it to a resource sharded elsewhere would
+  # take a transaction over two files.
+  resource = int(resource)
+  if id is not None and recurrence.parseID(id) is None:
+    held, id = bookingKey(id)
+    if pathFor(held) != pathFor(resource):
+      raise ValueError("a booking cannot move to a resource in another database file")
+  conn = DBConnection.getConnection(pathFor(resource))
   cursor = conn.cursor()
 
   # (B2) DATA & SQL
-  data = (start, end, txt, color, bg, user_id)
+  # saving an occurrence of a series cancels it there and stores the edited
+  # copy as a plain booking
+  occurrence = recurrence.parseID(id) if id is not None else None
+  if occurrence is not None:
+    id = None
+  data = (start, end, txt, color, bg, user_id, resource)
   if id is None:
-    sql = "INSERT INTO `Booking` (`start`, `end`, `text`, `color`, `bg`, `user_id`) VALUES (?,?,?,?,?,?)"
+    sql = "INSERT INTO `Booking` (`start`, `end`, `text`, `color`, `bg`, `user_id`, `resource`, `revision`) VALUES (?,?,?,?,?,?,?,?)"
   else:
-    sql = "UPDATE `Booking` SET `start`=?, `end`=?, `text`=?, `color`=?, `bg`=?, `user_id`=? WHERE `id`=?"
-    data = data + (id,)
+    sql = "UPDATE `Booking` SET `start`=?, `end`=?, `text`=?, `color`=?, `bg`=?, `user_id`=?, `resource`=?, `revision`=? WHERE `id`=?"
 
-  # (B3) EXECUTE
-  if checkConflicts(start, end):
-    return False
-  else:
-    cursor.execute(sql, data)
-    conn.commit()
-    conn.close()
-    return True
+  # (B3) CHECK & EXECUTE
+  # BEGIN IMMEDIATE takes the database write lock before the conflict check,
+  # so no other connection can book the slot between the check and the insert
+  old = skipped = moved = None
+  try:
+    cursor.execute("BEGIN IMMEDIATE")
+    if pathFor(resource) == DBFILE:
+      # with shards on, pathFor has already looked it up in DBFILE
+      checkResource(resource, cursor)
+    if occurrence is not None:
+      skipped = skipOccurrence(cursor, *occurrence)
+    if rinkTaken(cursor, start, end, id, resource=resource):
+      cursor.execute("ROLLBACK")
+      return False
+    if id is not None:
+      # a booking handed to another user disappears from the old owner's calendar
+      owner = cursor.execute("SELECT `user_id`, `start`, `end`, `resource` FROM `Booking` WHERE `id`=?", (id,)).fetchone()
+      if owner is not None and str(owner[0]) != str(user_id):
+        tombstone(cursor, id, owner[0])
+        # and is live again in the calendar of a user it is handed back to. a
+        # new id never has a tombstone, ids are not reused (DBSchema.py)
+        cursor.execute("DELETE FROM `BookingTombstone` WHERE `user_id`=? AND `id`=?", (user_id, id))
+      if owner is not None:
+        if owner[3] == DEFAULT_RESOURCE:
+          occupancy.apply(cursor, [owner[1:3]], -1)
+        old = owner[1:3]
+        moved = owner[3] != resource and owner[3]
+    data = data + (bumpRevision(cursor, user_id),)
+    cursor.execute(sql, data if id is None else data + (id,))
+    saved = cursor.rowcount > 0
+    if saved and resource == DEFAULT_RESOURCE:
+      occupancy.apply(cursor, [(start, end)])
+    cursor.execute("COMMIT")
+  except Exception:
+    if conn.in_transaction:
+      cursor.execute("ROLLBACK")
+    raise
+  bookingID = cursor.lastrowid if id is None else id
+  if moved:
+    conflicts.deleted(bookingID, moved)
+  conflicts.saved(bookingID, start, end, resource)
+
+  # (B4) TELL OPEN CALENDARS, only once the change is committed
+  if skipped is not None:
+    pubsub.broker.publish("delete", recurrence.occurrenceID(*occurrence), *skipped, user_id)
+  if saved:
+    pubsub.broker.publish("save", publicID(resource, bookingID), start, end, user_id, old)
+  return True
 
 # (C) DELETE EVENT
 def delete(id):
   # (C1) CONNECT
-  conn = sqlite3.connect(DBFILE)
+  occurrence = recurrence.parseID(id)
+  held, key = (DEFAULT_RESOURCE, id) if occurrence is not None else bookingKey(id)
+  conn = DBConnection.getConnection(pathFor(held))
   cursor = conn.cursor()
 
-  # (C2) EXECUTE
-  cursor.execute("DELETE FROM `Booking` WHERE `id`=?", (id,))
-  conn.commit()
-  conn.close()
+  # (C2) EXECUTE & LEAVE A TOMBSTONE FOR INCREMENTAL SYNC
+  # deleting one occurrence of a series only cancels that occurrence
+  owner = skipped = None
+  try:
+    cursor.execute("BEGIN IMMEDIATE")
+    if occurrence is not None:
+      skipped = skipOccurrence(cursor, *occurrence)
+    else:
+      owner = cursor.execute("DELETE FROM `Booking` WHERE `id`=? RETURNING `user_id`, `start`, `end`, `resource`", (key,)).fetchone()
+      if owner is not None:
+        tombstone(cursor, key, owner[0])
+        if owner[3] == DEFAULT_RESOURCE:
+          occupancy.apply(cursor, [owner[1:3]], -1)
+    cursor.execute("COMMIT")
+  except Exception:
+    if conn.in_transaction:
+      cursor.execute("ROLLBACK")
+    raise
+  if owner is not None:
+    conflicts.deleted(key, owner[3])
+  if skipped is not None:
+    pubsub.broker.publish("delete", id, *skipped)
+  if owner is not None:
+    pubsub.broker.publish("delete", id, owner[1], owner[2], owner[0])
   return True
 
-# (D) GET EVENTS
-def get(month, year, userID):
-  # (D1) CONNECT
-  conn = sqlite3.connect(DBFILE)
+# (C3) RECURRING SERIES
+# a series row is never removed, deleting it flags it and bumps its revision
+# so /events/?since= can tell clients to drop its occurrences
+def touchSeries(cursor, seriesID, **changes):
+  owner = cursor.execute("SELECT `user_id` FROM `BookingSeries` WHERE `id`=?", (seriesID,)).fetchone()
+  if owner is None:
+    return False
+  sets = "".join(f", `{column}`=?" for column in changes)
+  cursor.execute(f"UPDATE `BookingSeries` SET `revision`=?{sets} WHERE `id`=?",
+                 (bumpRevision(cursor, owner[0]),) + tuple(changes.values()) + (seriesID,))
+  return True
+
+def skipOccurrence(cursor, seriesID, start):
+  """
+  :return: (start, end) of the occurrence cancelled, None if there was no such live occurrence
+  """
+  series = recurrence.byID(cursor, seriesID)
+  occurrence = None if series is None else series.find(start)
+  if occurrence is not None:
+    touchSeries(cursor, seriesID)
+    cursor.execute("INSERT INTO `BookingSeriesException` (`series_id`, `occurrence`) VALUES (?,?)", (seriesID, start))
+    occupancy.apply(cursor, [occurrence], -1)
+  return occurrence
+
+def saveSeries(start, end, txt, color, bg, user_id, freq="WEEKLY", interval=1, byday=None, until=None, count=None):
+  """
+  Store a recurrence rule once. Every occurrence is checked against the
+  bookings and other series in the rule's whole span in one pass.
+  :return: new series id, or False if an occurrence is already taken
+  :raises ValueError: if the rule is invalid or unbounded
+  """
+  series = recurrence.Series.fromRule(start, end, freq, interval, byday, until, count)
+  first, lastEnd = series.span()
+  occurrences = list(series.occurrences(first, lastEnd))
+  conn = DBConnection.getConnection(DBFILE)
   cursor = conn.cursor()
+  try:
+    cursor.execute("BEGIN IMMEDIATE")
+    if recurrence.overlapping(takenSlots(cursor, first, lastEnd), occurrences):
+      cursor.execute("ROLLBACK")
+      return False
+    seriesID = cursor.execute(
+      "INSERT INTO `BookingSeries` (`start`, `end`, `freq`, `interval`, `byday`, `until`, `lastEnd`, `count`, "
+      "`text`, `color`, `bg`, `user_id`, `revision`) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?) RETURNING `id`",
+      (first, (series.first + series.duration).strftime(recurrence.FORMAT), series.freq, series.interval, ",".join(map(str, series.byday)),
+       series.last.strftime(recurrence.FORMAT), lastEnd, count or None, txt, color, bg, user_id,
+       bumpRevision(cursor, user_id))
+    ).fetchone()[0]
+    occupancy.apply(cursor, occurrences)
+    cursor.execute("COMMIT")
+  except Exception:
+    if conn.in_transaction:
+      cursor.execute("ROLLBACK")
+    raise
+  pubsub.broker.publish("series", f"s{seriesID}", first, lastEnd, user_id)
+  return seriesID
 
-  # (D2) DATE RANGE CALCULATIONS
-  daysInMonth = str(monthrange(year, month)[1])
-  month = month if month>10 else "0" + str(month)
-  dateYM = str(year) + "-" + str(month) + "-"
-  start = dateYM + "01 00:00:00"
-  end = dateYM + daysInMonth + " 23:59:59"
+def deleteSeries(seriesID):
+  conn = DBConnection.getConnection(DBFILE)
+  cursor = conn.cursor()
+  try:
+    cursor.execute("BEGIN IMMEDIATE")
+    series = recurrence.byID(cursor, seriesID)
+    found = touchSeries(cursor, seriesID, deleted=1)
+    if series is not None:
+      occupancy.apply(cursor, list(series.occurrences(*series.span())), -1)
+    cursor.execute("COMMIT")
+  except Exception:
+    if conn.in_transaction:
+      cursor.execute("ROLLBACK")
+    raise
+  if series is not None:
+    pubsub.broker.publish("series", f"s{seriesID}", *series.span(), series.userID)
+  return found
 
-  # (D3) GET EVENTS
-  cursor.execute(
-    "SELECT * FROM `Booking` WHERE ((`start` BETWEEN ? AND ?) OR (`end` BETWEEN ? AND ?) OR (`start` <= ? AND `end` >= ?)) AND user_id = ?",
-    (start, end, start, end, start, end, userID)
-  )
-  rows = cursor.fetchall()
-  if len(rows)==0:
+# (D) GET EVENTS
+def monthBounds(month, year):
+  """
+  Half open [first of the month, first of the next month) as booking strings
+  """
+  first = datetime.datetime(year, month, 1)
+  following = datetime.datetime(year + month // 12, month % 12 + 1, 1)
+  return first.strftime("%Y-%m-%d %H:%M"), following.strftime("%Y-%m-%d %H:%M")
+
+def get(month, year, userID, resource=None):
+  # (D1) DATE RANGE CALCULATIONS
+  start, end = monthBounds(month, year)
+
+  # (D2) GET EVENTS
+  # from every file holding the resource asked for, or all of them. series
+  # are on the main rink.
+  rows, series = [], []
+  for shard, path in readPaths(resource):
+    cursor = DBConnection.getConnection(path).cursor()
+    found = cursor.execute(*scoped(GET_SQL, (userID, start, end), shard)).fetchall()
+    # archived bookings have the same shape as series rows
+    archived = Archive.rows(path, cursor, userID, start, end, {r[0] for r in found}, shard)
+    if pathFor(shard) != DBFILE:
+      found = [(publicID(shard, r[0]),) + tuple(r[1:]) for r in found]
+      archived = [[publicID(shard, r[0])] + list(r[1:]) for r in archived]
+    elif shard is None or shard == DEFAULT_RESOURCE:
+      series += recurrence.occurrenceRows(cursor, start, end, userID)
+    rows += found
+    series += archived
+  if len(rows)==0 and len(series)==0:
     return None
 
   # s & e : start & end date
@@ -81,4 +394,190 @@ def get(month, year, userID):
       "c" : r[4], "b" : r[5],
       "t" : r[3], "uid" : r[6]
     }
-  return data
\ No newline at end of file
+  for r in series:
+    data[r[0]] = {
+      "s" : r[1], "e" : r[2],
+      "c" : r[4], "b" : r[5],
+      "t" : r[3], "uid" : userID
+    }
+  return data
+
+# same events as get() in the columnar layout of app/wire.py, built straight
+# from the rows without a dict per event. uid is the one requested.
+def getColumns(month, year, userID, resource=None):
+  start, end = monthBounds(month, year)
+  rows = []
+  for shard, path in readPaths(resource):
+    cursor = DBConnection.getConnection(path).cursor()
+    found = cursor.execute(*scoped(RANGE_SQL, (userID, start, end), shard)).fetchall()
+    found += Archive.rows(path, cursor, userID, start, end, {r[0] for r in found}, shard)
+    if pathFor(shard) != DBFILE:
+      found = [[publicID(shard, r[0])] + list(r[1:]) for r in found]
+    elif shard is None or shard == DEFAULT_RESOURCE:
+      found += recurrence.occurrenceRows(cursor, start, end, userID)
+    rows += found
+  data = wire.columns(rows)
+  data["uid"] = userID
+  return data
+
+# (E) GET EVENTS IN A RANGE
+# compact rows for /events/: [id, start, end, text, color, bg]
+def getRange(start, end, userID, since=None, resource=None):
+  """
+  Bookings of userID overlapping [start, end), or with since set, every
+  booking of userID changed after that revision plus the ids deleted since
+  (changed rows are returned even if they moved out of the range, the
+  client drops what it does not display). Series occurrences have ids
+  "s<series>:<start>". A series changed since the revision is listed in
+  deleted as "s<series>", which drops all of its occurrences, and its live
+  occurrences are sent again in events. With bookings sharded since is the
+  {resource: revision} of parseSince and each file is synced from its own.
+  """
+  events, deleted = [], []
+  for shard, path in readPaths(resource):
+    found, gone = rangeIn(path, shard, start, end, userID, since)
+    if pathFor(shard) != DBFILE:
+      found = [[publicID(shard, r[0])] + r[1:] for r in found]
+      gone = [publicID(shard, id) for id in gone]
+    events += found
+    deleted += gone
+  return events, deleted
+
+def rangeIn(path, shard, start, end, userID, since):
+  cursor = DBConnection.getConnection(path).cursor()
+  if isinstance(since, dict):
+    since = since.get(shard or DEFAULT_RESOURCE, 0)
+  rink = shard is None or shard == DEFAULT_RESOURCE
+  deleted = []
+  if since is None:
+    cursor.execute(*scoped(RANGE_SQL, (userID, start, end), shard))
+    events = [list(r) for r in cursor.fetchall()]
+    events += Archive.rows(path, cursor, userID, start, end, {r[0] for r in events}, shard)
+    if rink:
+      events += recurrence.occurrenceRows(cursor, start, end, userID)
+  else:
+    # a booking moved to another resource since is deleted from this one's
+    # calendar. a tombstone does not say which resource the booking held,
+    # every reader of the file drops the id, a no-op where it was not shown.
+    changed = cursor.execute(
+      "SELECT `id`, `start`, `end`, `text`, `color`, `bg`, `resource` FROM `Booking` WHERE `user_id`=? AND `revision` > ?",
+      (userID, since)
+    ).fetchall()
+    events = [list(r[:6]) for r in changed if shard is None or r[6] == shard]
+    deleted = [r[0] for r in changed if shard is not None and r[6] != shard]
+    deleted += [r[0] for r in cursor.execute(
+      "SELECT `id` FROM `BookingTombstone` WHERE `user_id`=? AND `revision` > ?", (userID, since)
+    )]
+    if rink:
+      for series in recurrence.changedSince(cursor, userID, since):
+        deleted.append(f"s{series.id}")
+        if not series.deleted:
+          events += [series.row(s, e) for s, e in series.occurrences(*series.span())]
+  return events, deleted
+
+# (F) SKATE SESSIONS
+# shared sessions hold the rink like a booking but take reservations up to
+# their capacity, see app/inventory.py
+def saveSession(start, end, txt, capacity):
+  """
+  :return: new session id, or False if the rink is taken
+  """
+  capacity = int(capacity)
+  if capacity < 1:
+    raise ValueError("capacity must be at least 1")
+  inventory.checkLength(start, end)
+  conn = DBConnection.getConnection(DBFILE)
+  cursor = conn.cursor()
+  try:
+    cursor.execute("BEGIN IMMEDIATE")
+    if rinkTaken(cursor, start, end):
+      cursor.execute("ROLLBACK")
+      return False
+    cursor.execute("INSERT INTO `SkateSession` (`start`, `end`, `text`, `capacity`) VALUES (?,?,?,?)", (start, end, txt, capacity))
+    occupancy.apply(cursor, [(start, end)])
+    cursor.execute("COMMIT")
+  except Exception:
+    if conn.in_transaction:
+      cursor.execute("ROLLBACK")
+    raise
+  return cursor.lastrowid
+
+def deleteSession(sessionID):
+  conn = DBConnection.getConnection(DBFILE)
+  cursor = conn.cursor()
+  try:
+    cursor.execute("BEGIN IMMEDIATE")
+    cursor.execute("DELETE FROM `Reservation` WHERE `session_id`=?", (sessionID,))
+    slot = cursor.execute("DELETE FROM `SkateSession` WHERE `id`=? RETURNING `start`, `end`", (sessionID,)).fetchone()
+    if slot is not None:
+      occupancy.apply(cursor, [slot], -1)
+    cursor.execute("COMMIT")
+  except Exception:
+    if conn.in_transaction:
+      cursor.execute("ROLLBACK")
+    raise
+  return slot is not None
+
+def reserve(sessionID, userID, seats=1):
+  """
+  :return: seats left, or False if the session is full (or does not exist)
+  """
+  if int(seats) < 1:
+    raise ValueError("seats must be at least 1")
+  conn = DBConnection.getConnection(DBFILE)
+  cursor = conn.cursor()
+  try:
+    cursor.execute("BEGIN IMMEDIATE")
+    left = inventory.take(cursor, sessionID, userID, seats)
+    cursor.execute("COMMIT" if left is not None else "ROLLBACK")
+  except Exception:
+    if conn.in_transaction:
+      cursor.execute("ROLLBACK")
+    raise
+  return False if left is None else left
+
+def cancelReservation(sessionID, userID):
+  conn = DBConnection.getConnection(DBFILE)
+  cursor = conn.cursor()
+  try:
+    cursor.execute("BEGIN IMMEDIATE")
+    released = inventory.release(cursor, sessionID, userID)
+    cursor.execute("COMMIT")
+  except Exception:
+    if conn.in_transaction:
+      cursor.execute("ROLLBACK")
+    raise
+  return released > 0
+
+def availability(month, year, userID=None):
+  """
+  :return: [id, start, end, text, capacity, remaining, seats held by userID] for every session of the month
+  """
+  conn = DBConnection.getConnection(DBFILE)
+  return inventory.availability(conn.cursor(), *monthBounds(month, year), userID)
+
+# (G) OCCUPANCY HEATMAP
+def occupancyMap(first, last):
+  """
+  Minutes the rink is taken in every hour of the days [first, last)
+  :param first: first day YYYY-MM-DD
+  :param last: day after the last one
+  :return: {day: [24 minutes]}
+  """
+  conn = DBConnection.getConnection(DBFILE)
+  cursor = conn.cursor()
+  found, missing = occupancy.read(cursor, first, last)
+  if missing:
+    # build under the write lock so no save can slip in between reading the
+    # bookings and storing the buckets
+    try:
+      cursor.execute("BEGIN IMMEDIATE")
+      found, missing = occupancy.read(cursor, first, last)
+      if missing:
+        found.update(occupancy.build(cursor, missing, takenSlots))
+      cursor.execute("COMMIT")
+    except Exception:
+      if conn.in_transaction:
+        cursor.execute("ROLLBACK")
+      raise
+  return dict(sorted(found.items()))
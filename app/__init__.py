@@ -1,14 +1,82 @@
-from flask import Flask
-from flask_sqlalchemy import SQLAlchemy
-import os
+import os, threading
 
-app = Flask(__name__, instance_relative_config=True)
-app.config["SECRET_KEY"] = '571ebf8e12ca209536c'
-app.config["SQLALCHEMY_DATABASE_URI"] = 'sqlite:///' + os.path.join(os.getcwd(), 'SkateDB.db')
-app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-db = SQLAlchemy(app)
+# importing app, or a module in it such as app.S2_lib, builds nothing. the
+# Flask app, its caches and the user handler are built by createApp() the
+# first time one of APP_GLOBALS is looked up (from app import app does this),
+# and Flask-SQLAlchemy is only imported with the ad hoc ORM in app/models.py.
+APP_GLOBALS = ("app", "dbPath", "userDB", "userCache", "pageCache", "sessionStore", "loginLimiter")
+_lock = threading.RLock()
 
-app.config.from_object('config')
+def createApp():
+    """
+    Build the site once per process
+    :return: the Flask app, the same one on every call
+    """
+    with _lock:
+        if "app" in globals():
+            return globals()["app"]
+        from flask import Flask
+        import DBConnection, DBSchema, Instrumentation
+        from DBUserHandler import DBHandler
+        from PasswordHasher import PasswordHasher
+        from app.usercache import UserCache
+        from app.pagecache import PageCache
+        from app.ratelimit import LoginLimiter
+        from app.sessionstore import ServerSessionInterface, MemoryStore, SQLiteStore
 
-from app import views
-from app import models
\ No newline at end of file
+        dbPath = os.path.join(os.getcwd(), 'SkateDB.db')
+        app = Flask(__name__, instance_relative_config=True)
+        app.config["SECRET_KEY"] = '571ebf8e12ca209536c'
+        app.config["SQLALCHEMY_DATABASE_URI"] = 'sqlite:///' + dbPath
+        app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+        # same pragmas as S2_lib and DBHandler, SQLAlchemy keeps its own pool of these connections
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {"creator": lambda: DBConnection.openConnection(dbPath, check_same_thread=False)}
+
+        app.config.from_object('config')
+        # before any connection is opened, only connections opened afterwards are timed
+        Instrumentation.configure(app.config["METRICS"], app.config["SLOW_QUERY_MS"])
+        userCache = UserCache(app.config["USER_CACHE_SIZE"], app.config["USER_CACHE_TTL"])
+        pageCache = PageCache(app, enabled=app.config["PAGE_CACHE"])
+        # sessions are looked up only by views that use them, the lifetime is read once from config
+        sessionStore = MemoryStore(app.config["SESSION_STORE_SIZE"]) if app.config["SESSION_DB"] is None else SQLiteStore(app.config["SESSION_DB"])
+        app.session_interface = ServerSessionInterface(sessionStore)
+        loginLimiter = LoginLimiter(app.config["LOGIN_LIMIT_USER"], app.config["LOGIN_LIMIT_ADDRESS"], app.config["LOGIN_LIMIT_SECONDS"],
+                                    dbPath=app.config["LOGIN_LIMIT_DB"], maxKeys=app.config["LOGIN_LIMIT_KEYS"], enabled=app.config["LOGIN_RATE_LIMIT"])
+
+        # create/upgrade the schema once at startup, request code reuses this handler
+        if os.path.isfile(dbPath):
+            DBSchema.ensureSchema(dbPath)
+            hasher = PasswordHasher(rounds=app.config["HASH_ROUNDS"], workers=app.config["HASH_WORKERS"],
+                                    queueLimit=app.config["HASH_QUEUE_LIMIT"], useProcesses=app.config["HASH_PROCESSES"])
+            userDB = DBHandler(dbPath, hasher=hasher)
+        else:
+            userDB = None
+
+        # views.py imports these from here
+        globals().update(dbPath=dbPath, userDB=userDB, userCache=userCache, pageCache=pageCache, sessionStore=sessionStore,
+                         loginLimiter=loginLimiter, app=app)
+        from app import views, S2_lib
+        S2_lib.conflicts.reset(useIndex=app.config["CONFLICT_INDEX"])
+        S2_lib.pubsub.broker.configure(maxSubscribers=app.config["STREAM_MAX_SUBSCRIBERS"])
+        S2_lib.wire.configure(minBytes=app.config["COMPRESS_MIN_BYTES"], level=app.config["COMPRESS_LEVEL"])
+        S2_lib.SHARDS = app.config["BOOKING_SHARDS"]
+        return app
+
+def createORM():
+    """
+    Flask-SQLAlchemy on the app, for app/models.py. Import app.models before
+    the app serves its first request, Flask refuses new teardown handlers after.
+    """
+    with _lock:
+        if "db" not in globals():
+            from flask_sqlalchemy import SQLAlchemy
+            globals()["db"] = SQLAlchemy(createApp())
+        return globals()["db"]
+
+def __getattr__(name):
+    if name in APP_GLOBALS:
+        createApp()
+        return globals()[name]
+    if name == "db":
+        return createORM()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
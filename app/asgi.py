@@ -0,0 +1,199 @@
+# (A) LOAD MODULES
+import asyncio, io, sqlite3, sys, time
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.wrappers import Request
+from app import app
+from app import S2_lib as evt
+from app import pubsub, wire
+import Instrumentation
+
+# (B) ASGI SERVING MODE
+# `application` is an ASGI app for uvicorn (see run.py --asgi). the calendar
+# JSON endpoints /get/, /save/ and /delete/ are answered here by coroutines,
+# so an idle keep-alive connection costs the event loop a few objects instead
+# of a whole server thread, and only the sqlite work itself runs on the small
+# DB_THREADS pool (each pool thread keeps its own connection, see
+# DBConnection.py). every other path, pages and login included, is handed to
+# the Flask app unchanged on the same pool, so sessions and templates behave
+# exactly like under run.py. it needs nothing beyond Flask, uvicorn is only
+# the launcher. /stream/ is served here too, as a coroutine per open stream
+# instead of the thread per stream it takes under run.py.
+DB_THREADS = app.config["ASGI_DB_THREADS"]
+executor = ThreadPoolExecutor(max_workers=DB_THREADS, thread_name_prefix="db")
+
+
+async def offload(function, *args):
+  return await asyncio.get_running_loop().run_in_executor(executor, function, *args)
+
+
+# (C) ASGI <-> WSGI
+async def readBody(receive):
+  chunks = []
+  while True:
+    message = await receive()
+    if message["type"] == "http.disconnect":
+      return None
+    chunks.append(message.get("body", b""))
+    if not message.get("more_body", False):
+      return b"".join(chunks)
+
+def environFor(scope, body):
+  """
+  WSGI environ for an ASGI http scope, used to parse forms and to call the Flask app
+  """
+  server = scope.get("server") or ("localhost", 80)
+  environ = {
+    "REQUEST_METHOD": scope["method"],
+    "SCRIPT_NAME": scope.get("root_path", "").encode("utf8").decode("latin1"),
+    "PATH_INFO": scope["path"].encode("utf8").decode("latin1"),
+    "QUERY_STRING": scope.get("query_string", b"").decode("latin1"),
+    "SERVER_NAME": server[0], "SERVER_PORT": str(server[1]),
+    "SERVER_PROTOCOL": "HTTP/" + scope.get("http_version", "1.1"),
+    "REMOTE_ADDR": (scope.get("client") or ("127.0.0.1", 0))[0],
+    "CONTENT_LENGTH": str(len(body)),
+    "wsgi.version": (1, 0), "wsgi.url_scheme": scope.get("scheme", "http"),
+    "wsgi.input": io.BytesIO(body), "wsgi.errors": sys.stderr,
+    "wsgi.multithread": True, "wsgi.multiprocess": True, "wsgi.run_once": False
+  }
+  for name, value in scope.get("headers", []):
+    name, value = name.decode("latin1").upper().replace("-", "_"), value.decode("latin1")
+    if name == "CONTENT_TYPE":
+      environ["CONTENT_TYPE"] = value
+    elif name != "CONTENT_LENGTH":
+      key = "HTTP_" + name
+      environ[key] = environ[key] + "," + value if key in environ else value
+  return environ
+
+def callFlask(environ):
+  """
+  Run one request through the Flask app, on a pool thread
+  :return: (status, [(header, value)], body)
+  """
+  started = []
+  def startResponse(status, headers, exc_info=None):
+    started[:] = [status, headers]
+  chunks = app(environ, startResponse)
+  try:
+    body = b"".join(chunks)
+  finally:
+    if hasattr(chunks, "close"):
+      chunks.close()
+  return int(started[0].split(" ", 1)[0]), started[1], body
+
+async def respond(send, status, headers, body):
+  await send({"type": "http.response.start", "status": status,
+              "headers": [(k.lower().encode("latin1"), v.encode("latin1")) for k, v in headers]})
+  await send({"type": "http.response.body", "body": body})
+
+def text(status, body):
+  return status, [("Content-Type", "text/html; charset=utf-8")], body.encode()
+
+
+# (D) JSON ENDPOINTS
+# same answers as the views in views.py
+async def get(request):
+  form, acceptEncoding = request.form, request.headers.get("Accept-Encoding")
+  month, year, userID = int(form["month"]), int(form["year"]), int(form["userID"])
+  resource = int(form["resource"]) if form.get("resource") else None
+  if form.get("format") == "columns":
+    # serializing and compressing thousands of events is worth a pool thread too
+    body, headers = await offload(wire.encode, await offload(evt.getColumns, month, year, userID, resource), acceptEncoding)
+    return 200, headers, body
+  events = await offload(evt.get, month, year, userID, resource)
+  if events is None:
+    return text(200, "{}")
+  # same bytes jsonify would send
+  reply = app.json.response(wire.objects(events))
+  body, headers = await offload(wire.compress, reply.get_data(), acceptEncoding)
+  return 200, [("Content-Type", reply.content_type)] + headers, body
+
+async def save(request):
+  form = request.form
+  ok = await offload(evt.save, form["s"], form["e"], form["t"], form["c"], form["b"], form["uid"], form.get("id"),
+                     form.get("r") or evt.DEFAULT_RESOURCE)
+  return text(200, "OK" if ok else "Time Conflict")
+
+async def delete(request):
+  await offload(evt.delete, request.form["id"])
+  return text(200, "OK")
+
+ROUTES = {"/get/": ("get", get), "/save/": ("save", save), "/delete/": ("delete", delete)}
+
+
+# (D2) LIVE CALENDAR CHANGES, see views.py (B12)
+async def waitDisconnect(receive):
+  while (await receive())["type"] != "http.disconnect":
+    pass
+
+async def stream(environ, receive, send):
+  request = Request(environ)
+  try:
+    first, last = pubsub.parseRange(request.args)
+  except (KeyError, ValueError) as e:
+    return await respond(send, *text(400, f"Bad Request: {e}"))
+  loop, ready = asyncio.get_running_loop(), asyncio.Event()
+  # the broker calls wake from whichever thread published
+  subscription = pubsub.broker.subscribe(first, last, pubsub.parseSince(request.headers.get("Last-Event-ID")),
+                                         wake=lambda: loop.call_soon_threadsafe(ready.set))
+  if subscription is None:
+    return await respond(send, *text(503, "Server Busy, Please Try Again"))
+  disconnected = asyncio.ensure_future(waitDisconnect(receive))
+  try:
+    await send({"type": "http.response.start", "status": 200, "headers": [
+      (b"content-type", b"text/event-stream; charset=utf-8"), (b"cache-control", b"no-cache"), (b"x-accel-buffering", b"no")]})
+    await send({"type": "http.response.body", "body": pubsub.OPENING.encode(), "more_body": True})
+    while not disconnected.done():
+      readyWait = asyncio.ensure_future(ready.wait())
+      await asyncio.wait({readyWait, disconnected}, timeout=pubsub.KEEPALIVE, return_when=asyncio.FIRST_COMPLETED)
+      readyWait.cancel()
+      if disconnected.done():
+        break
+      ready.clear()
+      chunk = pubsub.formatAll(subscription.drain()) or pubsub.PING
+      await send({"type": "http.response.body", "body": chunk.encode(), "more_body": True})
+  finally:
+    pubsub.broker.unsubscribe(subscription)
+    disconnected.cancel()
+
+
+# (E) APPLICATION
+async def lifespan(receive, send):
+  while True:
+    message = await receive()
+    if message["type"] == "lifespan.startup":
+      await send({"type": "lifespan.startup.complete"})
+    elif message["type"] == "lifespan.shutdown":
+      executor.shutdown(wait=True)
+      await send({"type": "lifespan.shutdown.complete"})
+      return
+
+async def application(scope, receive, send):
+  if scope["type"] == "lifespan":
+    return await lifespan(receive, send)
+  if scope["type"] != "http":
+    raise ValueError(f"unsupported scope {scope['type']}")
+  body = await readBody(receive)
+  if body is None:
+    return
+  environ = environFor(scope, body)
+  if scope["path"] == "/stream/" and scope["method"] == "GET":
+    return await stream(environ, receive, send)
+  route = ROUTES.get(scope["path"]) if scope["method"] == "POST" else None
+  if route is None:
+    return await respond(send, *await offload(callFlask, environ))
+
+  started = time.perf_counter()
+  # what is counted if anything else raises, uvicorn answers those with a 500
+  reply = text(500, "Internal Server Error")
+  try:
+    # form parsing is cheap next to a request's sqlite work, keep it on the loop
+    reply = await route[1](Request(environ))
+  except (KeyError, ValueError) as e:
+    reply = text(400, f"Bad Request: {e}")
+  except sqlite3.OperationalError as e:
+    print(e)
+    reply = text(503, "Server Busy, Please Try Again")
+  finally:
+    if Instrumentation.ENABLED:
+      Instrumentation.observeRequest(route[0], "POST", reply[0], time.perf_counter() - started)
+  await respond(send, *reply)
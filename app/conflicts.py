@@ -0,0 +1,157 @@
+# (A) LOAD MODULES
+import bisect, datetime, threading
+
+# (B) SQL
+# bookings are stored as "YYYY-MM-DD HH:MM" strings, so plain string
+# comparison orders them correctly. two slots overlap when each one starts
+# before the other ends. only bookings of the same resource conflict.
+# idx_resourceSpanBook (see DBSchema.py) leads with `resource` and `end` so
+# the search only walks that resource's bookings that finish after the new
+# slot starts (i.e. current and future bookings) instead of every historical
+# row that started before it ends.
+OVERLAP_SQL = ("SELECT EXISTS (SELECT 1 FROM `Booking` INDEXED BY idx_resourceSpanBook "
+               "WHERE `resource` = ? AND `end` > ? AND `start` < ? AND `id` IS NOT ?)")
+BUCKET_SQL = "SELECT `id`, `start`, `end` FROM `Booking` WHERE `resource` = ? AND `end` > ? AND `start` < ?"
+
+
+def daysBetween(start, end):
+  """
+  Every calendar day (YYYY-MM-DD) touched by the half open slot [start, end)
+  :param start: slot start string
+  :param end: slot end string
+  :return: list of day strings
+  """
+  first = datetime.date.fromisoformat(start[:10])
+  last = datetime.date.fromisoformat(end[:10])
+  # a slot ending exactly at midnight does not occupy the following day
+  if last > first and end[11:].strip("0:") == "":
+    last -= datetime.timedelta(days=1)
+  return [str(first + datetime.timedelta(days=n)) for n in range((last - first).days + 1)]
+
+
+class IntervalIndex():
+  """
+  In-process copy of the booked slots, bucketed by resource and day. Each
+  bucket is a list of (start, end, id) tuples sorted by start and is loaded
+  from SQLite the first time a check touches that day, after which
+  save/delete keep it in sync.
+
+  Only enable this when a single process writes to the database, otherwise
+  bookings made by other workers will not be visible to it.
+  """
+
+  def __init__(self):
+    self.buckets = {}
+    self.spans = {}
+    self.lock = threading.Lock()
+
+  def load(self, cursor, resource, day):
+    """
+    Fill the bucket for one resource and day from the database
+    :param cursor: sqlite3 cursor
+    :param day: YYYY-MM-DD
+    :return: None
+    """
+    rows = cursor.execute(BUCKET_SQL, (resource, day + " 00:00", day + " 24:00")).fetchall()
+    with self.lock:
+      if (resource, day) in self.buckets:
+        return
+      self.buckets[resource, day] = sorted((r[1], r[2], r[0]) for r in rows)
+      for r in rows:
+        self.spans[resource, r[0]] = (r[1], r[2])
+
+  def overlaps(self, cursor, start, end, ignoreID=None, resource=1):
+    """
+    True if any indexed booking of resource overlaps [start, end)
+    :param cursor: sqlite3 cursor, only used to load missing day buckets
+    :param start: slot start string
+    :param end: slot end string
+    :param ignoreID: booking id to skip (the booking being updated)
+    :return: True or False
+    """
+    for day in daysBetween(start, end):
+      if (resource, day) not in self.buckets:
+        self.load(cursor, resource, day)
+      bucket = self.buckets[resource, day]
+      # only bookings starting before the new slot ends can overlap it
+      for s, e, id in bucket[:bisect.bisect_left(bucket, (end,))]:
+        if e > start and id != ignoreID:
+          return True
+    return False
+
+  def add(self, id, start, end, resource=1):
+    """
+    Record a saved booking in every loaded bucket it touches
+    :return: None
+    """
+    with self.lock:
+      self._discard(id, resource)
+      self.spans[resource, id] = (start, end)
+      for day in daysBetween(start, end):
+        if (resource, day) in self.buckets:
+          bisect.insort(self.buckets[resource, day], (start, end, id))
+
+  def remove(self, id, resource=1):
+    """
+    Forget a deleted booking
+    :return: None
+    """
+    with self.lock:
+      self._discard(id, resource)
+
+  def _discard(self, id, resource):
+    span = self.spans.pop((resource, id), None)
+    if span is None:
+      return
+    for day in daysBetween(*span):
+      bucket = self.buckets.get((resource, day))
+      if bucket is not None and (span[0], span[1], id) in bucket:
+        bucket.remove((span[0], span[1], id))
+
+  def clear(self):
+    with self.lock:
+      self.buckets.clear()
+      self.spans.clear()
+
+
+class ConflictEngine():
+  """
+  Answers "does this slot overlap an existing booking" for S2_lib.save
+  """
+
+  def __init__(self, useIndex=False):
+    self.index = IntervalIndex() if useIndex else None
+
+  def hasConflict(self, cursor, start, end, ignoreID=None, resource=1):
+    """
+    True if [start, end) overlaps any booking of resource other than ignoreID
+    :param cursor: sqlite3 cursor
+    :param start: slot start string
+    :param end: slot end string
+    :param ignoreID: booking id to skip (the booking being updated)
+    :param resource: rink or room id
+    :return: True or False
+    """
+    if ignoreID is not None:
+      ignoreID = int(ignoreID)
+    if self.index is not None:
+      return self.index.overlaps(cursor, start, end, ignoreID, resource)
+    return cursor.execute(OVERLAP_SQL, (resource, start, end, ignoreID)).fetchone()[0] == 1
+
+  def saved(self, id, start, end, resource=1):
+    if self.index is not None:
+      self.index.add(int(id), start, end, resource)
+
+  def deleted(self, id, resource=1):
+    if self.index is not None:
+      self.index.remove(int(id), resource)
+
+  def reset(self, useIndex=None):
+    """
+    Drop all cached state, optionally switching the interval index on or off
+    :return: None
+    """
+    if useIndex is not None:
+      self.index = IntervalIndex() if useIndex else None
+    elif self.index is not None:
+      self.index.clear()
@@ -0,0 +1,86 @@
+# (A) LOAD MODULES
+import datetime
+
+# (B) SESSIONS & RESERVATIONS
+# a SkateSession is rink time shared by many skaters up to its capacity.
+# `reserved` counts the seats taken and is only ever changed by the guarded
+# UPDATEs below, so a reservation is one primary key update instead of a
+# count over Reservation, and the CHECK constraint in DBSchema.py makes
+# overselling impossible even if a caller skips the guard. sessions take the
+# rink like bookings do, so they are part of the conflict checks in S2_lib.
+# a session lasts at most MAX_LENGTH, so every search below is a range on
+# idx_spanSession (start, end) from MAX_LENGTH before the range to its end,
+# whatever the month, instead of walking every later session.
+MAX_LENGTH = datetime.timedelta(hours=24)
+
+# (C) SQL
+# parameters are (earliest start, range end, range start)
+OVERLAP_SQL = "SELECT EXISTS (SELECT 1 FROM `SkateSession` WHERE `start` >= ? AND `start` < ? AND `end` > ? AND `id` IS NOT ?)"
+SPAN_SQL = "SELECT `start`, `end` FROM `SkateSession` WHERE `start` >= ? AND `start` < ? AND `end` > ?"
+# every session in the range with its remaining seats and the seats userID
+# holds, in one pass over idx_spanSession plus a primary key probe each
+AVAILABILITY_SQL = (
+  "SELECT s.`id`, s.`start`, s.`end`, s.`text`, s.`capacity`, s.`capacity` - s.`reserved`, IFNULL(r.`seats`, 0) "
+  "FROM `SkateSession` s LEFT JOIN `Reservation` r ON r.`session_id` = s.`id` AND r.`user_id` = ? "
+  "WHERE s.`start` >= ? AND s.`start` < ? AND s.`end` > ? ORDER BY s.`start`"
+)
+TAKE_SQL = ("UPDATE `SkateSession` SET `reserved` = `reserved` + ? "
+            "WHERE `id` = ? AND `reserved` + ? <= `capacity` RETURNING `capacity` - `reserved`")
+RELEASE_SQL = "UPDATE `SkateSession` SET `reserved` = `reserved` - ? WHERE `id` = ?"
+
+
+# (D) QUERIES
+def span(start, end):
+  """
+  :return: query parameters for sessions overlapping [start, end)
+  """
+  earliest = (datetime.datetime.fromisoformat(start) - MAX_LENGTH).isoformat(" ", "minutes")
+  return earliest, end, start
+
+def checkLength(start, end):
+  length = datetime.datetime.fromisoformat(end) - datetime.datetime.fromisoformat(start)
+  if not datetime.timedelta(0) < length <= MAX_LENGTH:
+    raise ValueError(f"a session must end after it starts and last at most {MAX_LENGTH}")
+
+def hasConflict(cursor, start, end, ignore=None):
+  return cursor.execute(OVERLAP_SQL, span(start, end) + (ignore,)).fetchone()[0] == 1
+
+def busy(cursor, start, end):
+  """
+  :return: (start, end) of every session overlapping [start, end)
+  """
+  return cursor.execute(SPAN_SQL, span(start, end)).fetchall()
+
+def availability(cursor, start, end, userID=None):
+  """
+  :return: [id, start, end, text, capacity, remaining, seats held by userID] for every session overlapping [start, end)
+  """
+  return [list(r) for r in cursor.execute(AVAILABILITY_SQL, (userID,) + span(start, end))]
+
+
+# (E) RESERVATIONS
+# both run inside the caller's write transaction
+def take(cursor, sessionID, userID, seats=1):
+  """
+  :return: seats left after the reservation, or None if the session is full or does not exist
+  """
+  row = cursor.execute(TAKE_SQL, (seats, sessionID, seats)).fetchone()
+  if row is None:
+    return None
+  cursor.execute(
+    "INSERT INTO `Reservation` (`session_id`, `user_id`, `seats`) VALUES (?,?,?) "
+    "ON CONFLICT (`session_id`, `user_id`) DO UPDATE SET `seats` = `seats` + excluded.`seats`",
+    (sessionID, userID, seats)
+  )
+  return row[0]
+
+def release(cursor, sessionID, userID):
+  """
+  :return: seats given back, 0 if userID held none
+  """
+  row = cursor.execute("DELETE FROM `Reservation` WHERE `session_id`=? AND `user_id`=? RETURNING `seats`",
+                       (sessionID, userID)).fetchone()
+  if row is None:
+    return 0
+  cursor.execute(RELEASE_SQL, (row[0], sessionID))
+  return row[0]
@@ -0,0 +1,85 @@
+# (A) LOAD MODULES
+import datetime
+
+# (B) DAY BUCKETS
+# OccupancyDay keeps, for each calendar day, the minutes of every hour that
+# the rink is taken (bookings, series occurrences and skate sessions) as 24
+# comma separated numbers. a day is built from the source tables the first
+# time it is asked for, after that every write applies its change to the
+# days that are already built, inside the same write transaction, so reading
+# a heatmap costs one row per day however many bookings there are.
+DAY_SQL = "SELECT `day`, `hours` FROM `OccupancyDay` WHERE `day` >= ? AND `day` < ?"
+HOURS = 24
+
+
+def dayRange(first, last):
+  """
+  :param first: first day YYYY-MM-DD
+  :param last: day after the last one
+  :return: list of day strings
+  """
+  first, last = datetime.date.fromisoformat(first), datetime.date.fromisoformat(last)
+  return [(first + datetime.timedelta(days=n)).isoformat() for n in range((last - first).days)]
+
+def minutesByDay(slots):
+  """
+  Split slots at every hour
+  :param slots: (start, end) strings
+  :return: {day: [minutes taken in each hour]}
+  """
+  days = {}
+  for start, end in slots:
+    start, end = datetime.datetime.fromisoformat(start), datetime.datetime.fromisoformat(end)
+    while start < end:
+      hourEnd = start.replace(minute=0, second=0) + datetime.timedelta(hours=1)
+      piece = min(end, hourEnd)
+      hours = days.get(start.date().isoformat())
+      if hours is None:
+        hours = days[start.date().isoformat()] = [0] * HOURS
+      hours[start.hour] += (piece - start) // datetime.timedelta(minutes=1)
+      start = piece
+  return days
+
+def parse(hours):
+  return [int(minutes) for minutes in hours.split(",")]
+
+def encode(hours):
+  return ",".join(map(str, hours))
+
+
+# (C) UPDATES
+# run inside the caller's write transaction
+def apply(cursor, slots, sign=1):
+  """
+  Add (sign 1) or remove (sign -1) slots from the days that are already built
+  :param slots: (start, end) strings
+  :return: None
+  """
+  changes = minutesByDay(slots)
+  if not changes:
+    return
+  marks = ",".join("?" * len(changes))
+  rows = cursor.execute(f"SELECT `day`, `hours` FROM `OccupancyDay` WHERE `day` IN ({marks})", list(changes)).fetchall()
+  cursor.executemany("UPDATE `OccupancyDay` SET `hours`=? WHERE `day`=?",
+                     [(encode(a + sign * b for a, b in zip(parse(hours), changes[day])), day) for day, hours in rows])
+
+def build(cursor, days, taken):
+  """
+  Materialize days from the source tables
+  :param days: sorted day strings that are not built yet
+  :param taken: function (cursor, start, end) returning the (start, end) slots holding the rink
+  :return: {day: hours} for the days built
+  """
+  last = (datetime.date.fromisoformat(days[-1]) + datetime.timedelta(days=1)).isoformat()
+  buckets = minutesByDay(taken(cursor, days[0] + " 00:00", last + " 00:00"))
+  built = {day: buckets.get(day, [0] * HOURS) for day in days}
+  cursor.executemany("INSERT OR REPLACE INTO `OccupancyDay` (`day`, `hours`) VALUES (?,?)",
+                     [(day, encode(hours)) for day, hours in built.items()])
+  return built
+
+def read(cursor, first, last):
+  """
+  :return: ({day: hours} of the built days in [first, last), sorted list of the days missing)
+  """
+  found = {day: parse(hours) for day, hours in cursor.execute(DAY_SQL, (first, last))}
+  return found, [day for day in dayRange(first, last) if day not in found]
@@ -0,0 +1,80 @@
+# (A) LOAD MODULES
+import hashlib, os, threading
+from jinja2 import meta
+from flask import render_template
+
+# (B) RENDERED PAGE CACHE
+# pages that look the same for every visitor (pricing, information) are
+# rendered once and served from memory. an entry is keyed by the mtime of
+# the template, of every template it extends or includes and of the static
+# files it links, so editing any of them re-renders on the next hit without
+# a restart. each page keeps an ETag of its body for 304s.
+class PageCache():
+
+  def __init__(self, app, enabled=True):
+    self.app = app
+    self.enabled = enabled
+    self.pages = {}
+    self.lock = threading.Lock()
+    self.local = threading.local()
+
+  def templateFiles(self, name, found=None):
+    """
+    :return: {filename: mtime} of name and every template it pulls in
+    """
+    found = {} if found is None else found
+    env = self.app.jinja_env
+    source, filename, _ = env.loader.get_source(env, name)
+    if filename in found:
+      return found
+    found[filename] = os.stat(filename).st_mtime_ns
+    for parent in meta.find_referenced_templates(env.parse(source)):
+      if parent is not None:
+        self.templateFiles(parent, found)
+    return found
+
+  def fresh(self, page):
+    try:
+      return all(os.stat(filename).st_mtime_ns == mtime for filename, mtime in page[2].items())
+    except OSError:
+      return False
+
+  def get(self, name):
+    """
+    Render name once, call inside a request so url_for works
+    :return: (body, etag)
+    """
+    if not self.enabled:
+      body = render_template(name)
+      return body, hashlib.md5(body.encode()).hexdigest()
+    page = self.pages.get(name)
+    if page is None or not self.fresh(page):
+      # files are read before rendering, an edit in between re-renders next time
+      files = self.local.files = self.templateFiles(name)
+      try:
+        body = render_template(name)
+      finally:
+        self.local.files = None
+      page = (body, hashlib.md5(body.encode()).hexdigest(), files)
+      with self.lock:
+        self.pages[name] = page
+    return page[0], page[1]
+
+  def clear(self):
+    with self.lock:
+      self.pages.clear()
+
+  # (C) STATIC ASSET VERSIONS
+  # url_for('static') links get ?v=<file mtime>, so a versioned link can be
+  # cached for a year and an edited file gets a new link
+  def staticVersion(self, filename):
+    path = os.path.join(self.app.static_folder, filename)
+    try:
+      mtime = os.stat(path).st_mtime_ns
+    except OSError:
+      return None
+    # a page being cached also depends on the files it links
+    files = getattr(self.local, "files", None)
+    if files is not None:
+      files[path] = mtime
+    return str(mtime // 1000000)
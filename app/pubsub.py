@@ -0,0 +1,165 @@
+# (A) LOAD MODULES
+import collections, datetime, json, threading
+
+# (B) CALENDAR CHANGE BROADCAST
+# S2_lib publishes every booking change here after its COMMIT and the
+# /stream/ endpoints (views.py for the threaded server, asgi.py for uvicorn)
+# forward the ones overlapping each subscriber's date range as Server-Sent
+# Events, so open calendars refresh when something changes instead of
+# re-polling. events are small deltas: {"id", "op", "booking", "s", "e", "uid"}, with
+# op "save", "delete" or "series" (a whole series changed, refetch its span)
+# and "old" holding the previous slot when a booking moved.
+# the broker lives in one process: with several uvicorn workers a client only
+# hears about changes made through the worker it is connected to, and
+# catches up on the next load. the last HISTORY events are kept so a client
+# that reconnects with Last-Event-ID gets what it missed, older gaps get a
+# "reset" telling it to reload.
+HISTORY = 1024
+MAX_PENDING = 256  # per subscriber, a client this far behind is told to reload
+KEEPALIVE = 15  # seconds between comment lines on an idle stream
+RESET = {"op": "reset"}
+
+
+class Subscription():
+  """
+  One open stream. push() is called by the broker under its lock, the
+  stream's thread or coroutine collects with wait() or drain()
+  """
+
+  def __init__(self, first, last, wake=None):
+    self.first = first
+    self.last = last
+    self.pending = collections.deque()
+    self.ready = threading.Event()
+    self.wake = wake
+
+  def wants(self, event):
+    if event is RESET:
+      return True
+    if event["e"] > self.first and event["s"] < self.last:
+      return True
+    old = event.get("old")
+    return old is not None and old[1] > self.first and old[0] < self.last
+
+  def push(self, event):
+    if len(self.pending) >= MAX_PENDING:
+      self.pending.clear()
+      event = RESET
+    self.pending.append(event)
+    # one wake per batch, a subscriber that has not drained yet will see this event too
+    if not self.ready.is_set():
+      self.ready.set()
+      if self.wake is not None:
+        self.wake()
+
+  def drain(self):
+    self.ready.clear()
+    events = []
+    while self.pending:
+      events.append(self.pending.popleft())
+    return events
+
+  def wait(self, timeout):
+    """
+    :return: events waiting, [] if none arrived within timeout seconds
+    """
+    self.ready.wait(timeout)
+    return self.drain()
+
+
+class Broker():
+
+  def __init__(self, maxSubscribers=1000):
+    self.maxSubscribers = maxSubscribers
+    self.lock = threading.Lock()
+    self.subscribers = set()
+    self.recent = collections.deque(maxlen=HISTORY)
+    self.sequence = 0
+
+  def configure(self, maxSubscribers):
+    self.maxSubscribers = maxSubscribers
+
+  def subscribe(self, first, last, since=None, wake=None):
+    """
+    :param first: range start, "YYYY-MM-DD HH:MM"
+    :param last: range end
+    :param since: last event id the client saw, to replay what it missed
+    :param wake: called (under the broker lock) whenever an event is queued, for asyncio subscribers
+    :return: Subscription, or None if the process already has maxSubscribers streams open
+    """
+    subscription = Subscription(first, last, wake)
+    with self.lock:
+      if len(self.subscribers) >= self.maxSubscribers:
+        return None
+      self.subscribers.add(subscription)
+      if since is not None and since != self.sequence:
+        # ids from before a restart, or older than the history, can not be replayed
+        if since > self.sequence or not self.recent or self.recent[0]["id"] > since + 1:
+          subscription.push(RESET)
+        else:
+          for event in self.recent:
+            if event["id"] > since and subscription.wants(event):
+              subscription.push(event)
+    return subscription
+
+  def unsubscribe(self, subscription):
+    with self.lock:
+      self.subscribers.discard(subscription)
+
+  def publish(self, op, booking, start, end, uid=None, old=None):
+    """
+    :param op: "save", "delete" or "series"
+    :param booking: booking id, "s<series>:<start>" for an occurrence, "s<series>" for a whole series
+    :return: the event, with its sequence number as id
+    """
+    event = {"op": op, "booking": booking, "s": start, "e": end, "uid": uid}
+    if old is not None:
+      event["old"] = list(old)
+    with self.lock:
+      self.sequence += 1
+      event["id"] = self.sequence
+      self.recent.append(event)
+      for subscription in self.subscribers:
+        if subscription.wants(event):
+          subscription.push(event)
+    return event
+
+  def count(self):
+    with self.lock:
+      return len(self.subscribers)
+
+
+broker = Broker()
+
+
+# (C) STREAM HELPERS
+def parseRange(args):
+  """
+  :param args: request args with from and to as YYYY-MM-DD
+  :return: (first, last) as booking strings
+  """
+  first = datetime.date.fromisoformat(args["from"])
+  last = datetime.date.fromisoformat(args["to"])
+  if last <= first:
+    raise ValueError("to must be after from")
+  return first.isoformat() + " 00:00", last.isoformat() + " 00:00"
+
+def parseSince(lastEventID):
+  try:
+    return int(lastEventID) if lastEventID else None
+  except ValueError:
+    return None
+
+def format(event):
+  """
+  :return: one Server-Sent Events message
+  """
+  if event is RESET:
+    return "event: reset\ndata: {}\n\n"
+  return f"id: {event['id']}\nevent: booking\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+def formatAll(events):
+  return "".join(format(event) for event in events)
+
+OPENING = "retry: 3000\n\n"
+PING = ": keepalive\n\n"
@@ -0,0 +1,162 @@
+# (A) LOAD MODULES
+import collections, math, threading, time
+import DBConnection
+
+# (B) SLIDING WINDOW COUNTS
+# a key's attempts are counted per fixed window of `seconds`, and the count
+# of the window before is weighed by how much of it still falls inside the
+# sliding window: estimate = previous * (1 - elapsed / seconds) + current.
+# that needs three numbers per key instead of a timestamp per attempt.
+class MemoryStore():
+  """
+  Counts of one process, the least recently used keys are dropped past maxKeys
+  """
+
+  def __init__(self, maxKeys=100000):
+    self.maxKeys = maxKeys
+    self.entries = collections.OrderedDict()
+    self.lock = threading.Lock()
+
+  def counts(self, key, window):
+    """
+    :return: (attempts in window, attempts in the window before)
+    """
+    return shift(self.entries.get(key), window)
+
+  def add(self, key, window):
+    with self.lock:
+      current, previous = shift(self.entries.get(key), window)
+      self.entries[key] = (window, current + 1, previous)
+      self.entries.move_to_end(key)
+      while len(self.entries) > self.maxKeys:
+        self.entries.popitem(last=False)
+
+  def reset(self, key):
+    with self.lock:
+      self.entries.pop(key, None)
+
+  def clear(self):
+    with self.lock:
+      self.entries.clear()
+
+
+def shift(entry, window):
+  """
+  (current, previous) of a stored (window, current, previous) seen from window
+  """
+  if entry is None or entry[0] < window - 1:
+    return 0, 0
+  if entry[0] == window - 1:
+    return 0, entry[1]
+  return entry[1], entry[2]
+
+
+class SQLiteStore():
+  """
+  Counts shared by every worker process through one database file. It is
+  kept apart from SkateDB.db so failed logins never wait on booking writes.
+  """
+  PRUNE_EVERY = 1000
+
+  def __init__(self, dbPath):
+    self.dbPath = dbPath
+    self.adds = 0
+    DBConnection.getConnection(dbPath).execute(
+      "CREATE TABLE IF NOT EXISTS LoginAttempt (key TEXT PRIMARY KEY, window INTEGER NOT NULL, current INTEGER NOT NULL, previous INTEGER NOT NULL) WITHOUT ROWID")
+
+  def counts(self, key, window):
+    return shift(DBConnection.getConnection(self.dbPath).execute(
+      "SELECT window, current, previous FROM LoginAttempt WHERE key = ?", (key,)).fetchone(), window)
+
+  def add(self, key, window):
+    # one upsert, the SET expressions all see the row as it was
+    connection = DBConnection.getConnection(self.dbPath)
+    connection.execute(
+      "INSERT INTO LoginAttempt (key, window, current, previous) VALUES (?, ?, 1, 0) "
+      "ON CONFLICT (key) DO UPDATE SET "
+      "previous = CASE WHEN window = excluded.window THEN previous WHEN window = excluded.window - 1 THEN current ELSE 0 END, "
+      "current = CASE WHEN window = excluded.window THEN current + 1 ELSE 1 END, window = excluded.window", (key, window))
+    self.adds += 1
+    if self.adds % self.PRUNE_EVERY == 0:
+      connection.execute("DELETE FROM LoginAttempt WHERE window < ?", (window - 1,))
+
+  def reset(self, key):
+    DBConnection.getConnection(self.dbPath).execute("DELETE FROM LoginAttempt WHERE key = ?", (key,))
+
+  def clear(self):
+    DBConnection.getConnection(self.dbPath).execute("DELETE FROM LoginAttempt")
+
+
+class SlidingWindow():
+  """
+  At most `limit` attempts per key in any `seconds` long window (estimated)
+  """
+
+  def __init__(self, store, name, limit, seconds):
+    self.store = store
+    self.name = name
+    self.limit = limit
+    self.seconds = seconds
+
+  def retryAfter(self, key, now=None):
+    """
+    :return: whole seconds until key may try again, 0 if it may now
+    """
+    now = time.time() if now is None else now
+    window, elapsed = divmod(now, self.seconds)
+    current, previous = self.store.counts(f"{self.name}:{key}", int(window))
+    if previous * (1 - elapsed / self.seconds) + current < self.limit:
+      return 0
+    # solve for the time the weighted previous count drops enough
+    if current >= self.limit:
+      wait = self.seconds - elapsed + self.seconds * (1 - self.limit / current)
+    else:
+      wait = self.seconds * (1 - (self.limit - current) / previous) - elapsed
+    return max(1, math.ceil(wait))
+
+  def hit(self, key, now=None):
+    now = time.time() if now is None else now
+    self.store.add(f"{self.name}:{key}", int(now // self.seconds))
+
+  def reset(self, key):
+    self.store.reset(f"{self.name}:{key}")
+
+
+# (C) LOGIN LIMITS
+class LoginLimiter():
+  """
+  Checked by /login before the user is looked up or a password is hashed.
+  Every address gets perAddress attempts and every username perUser failed
+  ones per window, a successful login clears the username's count.
+  """
+
+  def __init__(self, perUser=5, perAddress=30, seconds=300, dbPath=None, maxKeys=100000, enabled=True):
+    self.enabled = enabled
+    self.store = MemoryStore(maxKeys) if dbPath is None else SQLiteStore(dbPath)
+    self.users = SlidingWindow(self.store, "u", perUser, seconds)
+    self.addresses = SlidingWindow(self.store, "a", perAddress, seconds)
+
+  def attempt(self, username, address):
+    """
+    Count an attempt from address unless it is refused
+    :return: seconds to wait if refused, 0 to go ahead
+    """
+    if not self.enabled:
+      return 0
+    now = time.time()
+    # keys are capped, a megabyte username must not become a megabyte entry
+    wait = max(self.users.retryAfter(str(username)[:64], now), self.addresses.retryAfter(address, now))
+    if wait == 0:
+      self.addresses.hit(address, now)
+    return wait
+
+  def failed(self, username):
+    if self.enabled:
+      self.users.hit(str(username)[:64])
+
+  def succeeded(self, username):
+    if self.enabled:
+      self.users.reset(str(username)[:64])
+
+  def clear(self):
+    self.store.clear()
@@ -0,0 +1,243 @@
+# (A) LOAD MODULES
+import bisect, datetime, itertools
+
+# (B) RULES & SQL
+# a series is stored once in BookingSeries: its first occurrence (start, end),
+# freq DAILY or WEEKLY repeated every `interval` days/weeks, optional byday
+# weekdays ("0,2,4", monday is 0) and in `until` the start of its last
+# occurrence (a count is turned into that date when the series is saved).
+# occurrences are only generated for the range that is asked for, cancelled
+# ones are rows in BookingSeriesException. lastEnd (end of the last
+# occurrence) leads idx_spanSeries / idx_userSpanSeries just like `end` does
+# for Booking, see DBSchema.py.
+FORMAT = "%Y-%m-%d %H:%M"
+FREQUENCIES = {"DAILY": 1, "WEEKLY": 7}
+MAX_OCCURRENCES = 1000
+
+COLUMNS = "`id`, `start`, `end`, `freq`, `interval`, `byday`, `until`, `text`, `color`, `bg`, `user_id`, `deleted`"
+SPAN_SQL = f"SELECT {COLUMNS} FROM `BookingSeries` WHERE `deleted` = 0 AND `lastEnd` > ? AND `start` < ?"
+USER_SPAN_SQL = f"SELECT {COLUMNS} FROM `BookingSeries` WHERE `user_id` = ? AND `deleted` = 0 AND `lastEnd` > ? AND `start` < ?"
+CHANGED_SQL = f"SELECT {COLUMNS} FROM `BookingSeries` WHERE `user_id` = ? AND `revision` > ?"
+ID_SQL = f"SELECT {COLUMNS} FROM `BookingSeries` WHERE `id` = ? AND `deleted` = 0"
+
+
+def parseTime(value):
+  return datetime.datetime.fromisoformat(str(value))
+
+
+def occurrenceID(seriesID, start):
+  return f"s{seriesID}:{start}"
+
+
+def parseID(id):
+  """
+  :param id: booking id from the calendar
+  :return: (series id, occurrence start) for a series occurrence, None for a plain booking
+  """
+  id = str(id)
+  if not id.startswith("s") or ":" not in id:
+    return None
+  seriesID, start = id[1:].split(":", 1)
+  return int(seriesID), parseTime(start).strftime(FORMAT)
+
+
+class Series():
+  """
+  One recurrence rule. Occurrences are computed by jumping straight to the
+  period that contains the requested range, so expanding a month of a five
+  year series costs the same as expanding the first month.
+  """
+
+  def __init__(self, start, end, freq, interval, byday, until, id=None, skipped=(), info=()):
+    """
+    :param start: first occurrence start
+    :param end: first occurrence end
+    :param freq: DAILY or WEEKLY
+    :param interval: repeat every interval days/weeks
+    :param byday: comma separated weekdays, monday is 0, defaults to the weekday of start for WEEKLY
+      and every day for DAILY
+    :param until: start of the last occurrence, None while it is being worked out
+    :param skipped: occurrence start strings that were cancelled
+    :param info: (text, color, bg, user_id, deleted) as stored
+    """
+    self.first = parseTime(start)
+    self.duration = parseTime(end) - self.first
+    if self.duration <= datetime.timedelta(0):
+      raise ValueError("start is not before end")
+    if freq not in FREQUENCIES:
+      raise ValueError(f"freq must be one of {', '.join(FREQUENCIES)}")
+    self.freq = freq
+    self.interval = int(interval)
+    if self.interval < 1:
+      raise ValueError("interval must be at least 1")
+    if byday in (None, ""):
+      self.byday = [self.first.weekday()] if freq == "WEEKLY" else list(range(7))
+    else:
+      self.byday = sorted({int(day) for day in str(byday).split(",")})
+      if self.byday[0] < 0 or self.byday[-1] > 6:
+        raise ValueError("byday weekdays go from 0 (monday) to 6 (sunday)")
+    self.period = datetime.timedelta(days=FREQUENCIES[freq] * self.interval)
+    if freq == "WEEKLY":
+      # periods start on the monday of the first week, byday picks days in it
+      self.anchor = self.first - datetime.timedelta(days=self.first.weekday())
+      self.offsets = [datetime.timedelta(days=day) for day in self.byday]
+    else:
+      self.anchor = self.first
+      self.offsets = [datetime.timedelta(0)]
+    self.last = None if until is None else parseTime(until)
+    self.id = id
+    self.skipped = set(skipped)
+    self.text, self.color, self.bg, self.userID, self.deleted = tuple(info) + (None,) * (5 - len(info))
+
+  @classmethod
+  def fromRule(cls, start, end, freq="WEEKLY", interval=1, byday=None, until=None, count=None, info=()):
+    """
+    Validate a new rule and pin down its last occurrence
+    :param until: last day (or time) an occurrence may start
+    :param count: number of occurrences, one of until or count is required
+    :return: Series
+    """
+    series = cls(start, end, freq, interval, byday, None, info=info)
+    if count not in (None, ""):
+      count = int(count)
+      if count < 1 or count > MAX_OCCURRENCES:
+        raise ValueError(f"count must be between 1 and {MAX_OCCURRENCES}")
+      starts = list(itertools.islice(series.starts(series.first, datetime.datetime.max), count))
+    elif until not in (None, ""):
+      last = parseTime(until)
+      if len(str(until)) == 10:
+        last = last.replace(hour=23, minute=59)
+      series.last = last
+      starts = list(itertools.islice(series.starts(series.first, last + series.period), MAX_OCCURRENCES + 1))
+      if len(starts) > MAX_OCCURRENCES:
+        raise ValueError(f"a series may have at most {MAX_OCCURRENCES} occurrences")
+    else:
+      raise ValueError("a series needs an until date or a count")
+    if not starts:
+      raise ValueError("the rule has no occurrences")
+    series.last = starts[-1]
+    return series
+
+  @classmethod
+  def fromRow(cls, row, skipped=()):
+    return cls(row[1], row[2], row[3], row[4], row[5], row[6], row[0], skipped, row[7:])
+
+  def starts(self, after, before):
+    """
+    Occurrence start datetimes of occurrences overlapping [after, before), cancelled ones included
+    """
+    lowest = max(after - self.duration, self.first)
+    period = max(0, (lowest - self.anchor) // self.period - 1)
+    while True:
+      base = self.anchor + period * self.period
+      if base >= before or (self.last is not None and base > self.last):
+        return
+      for offset in self.offsets:
+        start = base + offset
+        if start < self.first or start + self.duration <= after:
+          continue
+        if start >= before or (self.last is not None and start > self.last):
+          return
+        if self.freq == "DAILY" and start.weekday() not in self.byday:
+          continue
+        yield start
+      period += 1
+
+  def occurrences(self, after, before):
+    """
+    :param after: range start string
+    :param before: range end string
+    :return: generator of (start, end) strings of the live occurrences overlapping [after, before)
+    """
+    # isoformat gives the same "YYYY-MM-DD HH:MM" as FORMAT without the strftime cost
+    for start in self.starts(parseTime(after), parseTime(before)):
+      text = start.isoformat(" ", "minutes")
+      if text not in self.skipped:
+        yield text, (start + self.duration).isoformat(" ", "minutes")
+
+  def find(self, start):
+    """
+    :param start: occurrence start string
+    :return: (start, end) if a live occurrence starts then, else None
+    """
+    after = parseTime(start)
+    before = (after + datetime.timedelta(minutes=1)).isoformat(" ", "minutes")
+    for occurrence in self.occurrences(start, before):
+      if occurrence[0] == start:
+        return occurrence
+    return None
+
+  def span(self):
+    """
+    :return: (first start, last end) strings
+    """
+    return self.first.strftime(FORMAT), (self.last + self.duration).strftime(FORMAT)
+
+  def row(self, start, end):
+    # same layout as S2_lib.RANGE_SQL rows, [id, start, end, text, color, bg]
+    return [occurrenceID(self.id, start), start, end, self.text, self.color, self.bg]
+
+
+# (C) LOADING
+def load(cursor, sql, params):
+  """
+  :return: list of Series for the rows of sql, with their cancelled occurrences
+  """
+  rows = cursor.execute(sql, params).fetchall()
+  if not rows:
+    return []
+  skipped = {}
+  marks = ",".join("?" * len(rows))
+  for seriesID, occurrence in cursor.execute(
+      f"SELECT `series_id`, `occurrence` FROM `BookingSeriesException` WHERE `series_id` IN ({marks})", [r[0] for r in rows]):
+    skipped.setdefault(seriesID, set()).add(occurrence)
+  return [Series.fromRow(r, skipped.get(r[0], ())) for r in rows]
+
+def byID(cursor, seriesID):
+  found = load(cursor, ID_SQL, (seriesID,))
+  return found[0] if found else None
+
+def inRange(cursor, start, end, userID=None):
+  if userID is None:
+    return load(cursor, SPAN_SQL, (start, end))
+  return load(cursor, USER_SPAN_SQL, (userID, start, end))
+
+def changedSince(cursor, userID, since):
+  return load(cursor, CHANGED_SQL, (userID, since))
+
+def occurrenceRows(cursor, start, end, userID):
+  """
+  :return: occurrence rows [id, start, end, text, color, bg] of userID's series overlapping [start, end)
+  """
+  return [series.row(s, e) for series in inRange(cursor, start, end, userID) for s, e in series.occurrences(start, end)]
+
+
+# (D) CONFLICTS
+def busy(cursor, start, end, ignore=None):
+  """
+  :param ignore: series id left out, e.g. the one being saved
+  :return: (start, end) of every live occurrence overlapping [start, end)
+  """
+  return [occurrence for series in inRange(cursor, start, end) if series.id != ignore
+          for occurrence in series.occurrences(start, end)]
+
+def hasConflict(cursor, start, end):
+  return any(True for series in inRange(cursor, start, end) for _ in series.occurrences(start, end))
+
+def overlapping(taken, candidates):
+  """
+  Bulk overlap test: every candidate slot that overlaps one of the taken slots
+  :param taken: (start, end) slots, any order
+  :param candidates: (start, end) slots
+  :return: list of overlapping candidates
+  """
+  taken = sorted(taken)
+  starts = [slot[0] for slot in taken]
+  # furthest end among the taken slots starting at or before each position
+  reach = list(itertools.accumulate((slot[1] for slot in taken), max))
+  clashes = []
+  for slot in candidates:
+    before = bisect.bisect_left(starts, slot[1])
+    if before and reach[before - 1] > slot[0]:
+      clashes.append(slot)
+  return clashes
@@ -0,0 +1,172 @@
+# (A) LOAD MODULES
+import collections, json, secrets, threading, time
+from flask.sessions import SessionInterface, SessionMixin
+import DBConnection
+
+# (B) STORES
+# a session is (data, expires) under a random id, the id is all the cookie
+# holds. stores return a copy of data so requests never share a dict.
+class MemoryStore():
+  """
+  Sessions of one process, the least recently used are dropped past maxSize
+  """
+
+  def __init__(self, maxSize=10000):
+    self.maxSize = maxSize
+    self.entries = collections.OrderedDict()
+    self.lock = threading.Lock()
+
+  def load(self, sid):
+    """
+    :return: (data, expires) or None if there is no such session
+    """
+    with self.lock:
+      entry = self.entries.get(sid)
+      if entry is None:
+        return None
+      self.entries.move_to_end(sid)
+    return dict(entry[0]), entry[1]
+
+  def save(self, sid, data, expires):
+    with self.lock:
+      self.entries[sid] = (dict(data), expires)
+      self.entries.move_to_end(sid)
+      while len(self.entries) > self.maxSize:
+        self.entries.popitem(last=False)
+
+  def delete(self, sid):
+    with self.lock:
+      self.entries.pop(sid, None)
+
+  def clear(self):
+    with self.lock:
+      self.entries.clear()
+
+
+class SQLiteStore():
+  """
+  Sessions in a database file, shared by every worker process and kept
+  across restarts. Each load is one primary key read.
+  """
+  PRUNE_EVERY = 1000
+
+  def __init__(self, dbPath):
+    self.dbPath = dbPath
+    self.saves = 0
+    DBConnection.getConnection(dbPath).execute(
+      "CREATE TABLE IF NOT EXISTS Session (sid TEXT PRIMARY KEY, data TEXT NOT NULL, expires REAL NOT NULL) WITHOUT ROWID")
+
+  def load(self, sid):
+    row = DBConnection.getConnection(self.dbPath).execute("SELECT data, expires FROM Session WHERE sid = ?", (sid,)).fetchone()
+    return None if row is None else (json.loads(row[0]), row[1])
+
+  def save(self, sid, data, expires):
+    connection = DBConnection.getConnection(self.dbPath)
+    connection.execute("INSERT OR REPLACE INTO Session (sid, data, expires) VALUES (?, ?, ?)", (sid, json.dumps(data), expires))
+    self.saves += 1
+    if self.saves % self.PRUNE_EVERY == 0:
+      connection.execute("DELETE FROM Session WHERE expires < ?", (time.time(),))
+
+  def delete(self, sid):
+    DBConnection.getConnection(self.dbPath).execute("DELETE FROM Session WHERE sid = ?", (sid,))
+
+  def clear(self):
+    DBConnection.getConnection(self.dbPath).execute("DELETE FROM Session")
+
+
+# (C) LAZY SESSION
+class LazySession(SessionMixin):
+  """
+  Looks its data up the first time a view reads or writes it, a request
+  that never touches `session` costs no store access and sends no cookie
+  """
+  # every session lasts PERMANENT_SESSION_LIFETIME from its last refresh
+  permanent = True
+
+  def __init__(self, store, sid, lifetime):
+    self.store = store
+    self.sid = sid
+    self.lifetime = lifetime
+    self.modified = False
+    self.refresh = False
+    self.retired = None
+    self._data = None
+
+  @property
+  def loaded(self):
+    return self._data is not None
+
+  @property
+  def data(self):
+    if self._data is None:
+      found = None if self.sid is None else self.store.load(self.sid)
+      if found is None or found[1] < time.time():
+        self.sid, self._data = None, {}
+      else:
+        self._data = found[0]
+        # past half its lifetime, the request that uses it extends it
+        self.refresh = found[1] - time.time() < self.lifetime / 2
+    return self._data
+
+  def regenerate(self):
+    """
+    Keep the data under a new id, the old one is removed from the store when
+    the response is saved. Called when a session logs in, so an id planted
+    in a browser before then never becomes an authenticated one.
+    """
+    self.data
+    if self.sid is not None:
+      self.retired, self.sid = self.sid, None
+    self.modified = True
+
+  def __getitem__(self, key):
+    return self.data[key]
+
+  def __setitem__(self, key, value):
+    self.data[key] = value
+    self.modified = True
+
+  def __delitem__(self, key):
+    del self.data[key]
+    self.modified = True
+
+  def __iter__(self):
+    return iter(self.data)
+
+  def __len__(self):
+    return len(self.data)
+
+
+class ServerSessionInterface(SessionInterface):
+  """
+  Keeps session data in `store` instead of a signed cookie. The cookie is
+  only set when a session is created, changed or extended.
+  """
+
+  def __init__(self, store):
+    self.store = store
+
+  def open_session(self, app, request):
+    sid = request.cookies.get(self.get_cookie_name(app))
+    return LazySession(self.store, sid, app.permanent_session_lifetime.total_seconds())
+
+  def save_session(self, app, session, response):
+    if not session.loaded:
+      return
+    response.vary.add("Cookie")
+    name, domain, path = self.get_cookie_name(app), self.get_cookie_domain(app), self.get_cookie_path(app)
+    secure, samesite, httponly = self.get_cookie_secure(app), self.get_cookie_samesite(app), self.get_cookie_httponly(app)
+    if session.retired is not None:
+      self.store.delete(session.retired)
+    if not session:
+      # emptied, e.g. by logout
+      if session.sid is not None and session.modified:
+        self.store.delete(session.sid)
+        response.delete_cookie(name, domain=domain, path=path, secure=secure, samesite=samesite, httponly=httponly)
+      return
+    if not (session.modified or session.refresh):
+      return
+    sid = session.sid or secrets.token_urlsafe(24)
+    expires = time.time() + session.lifetime
+    self.store.save(sid, dict(session), expires)
+    response.set_cookie(name, sid, expires=expires, httponly=httponly, domain=domain, path=path, secure=secure, samesite=samesite)
@@ -12,6 +12,8 @@ var cal = {
   sLD : 0, // last day of the selected month (mon-sun)
   sUserID : null, // current user database UID
   ready : 0, // to track loading
+  stream : null, // EventSource for the selected month
+  streamRange : "", streamTimer : null,
 
   // (A2) HTML ELEMENTS
   hMth : null, hYear : null, // month & year
@@ -20,6 +22,7 @@ var cal = {
   hfID : null, hfStart : null, // event form fields
   hfEnd : null, hfTxt : null,
   hfColor : null, hfBG : null, hfUID : null,
+  hfRepeat : null, hfUntil : null, // recurring series
   hfDel : null,
 
   // (B) SUPPORT FUNCTION - AJAX FETCH
@@ -51,6 +54,8 @@ var cal = {
     cal.hfColor = document.getElementById("evtColor");
     cal.hfBG = document.getElementById("evtBG");
     cal.hfUID = document.getElementById("userID");
+    cal.hfRepeat = document.getElementById("evtRepeat");
+    cal.hfUntil = document.getElementById("evtUntil");
     cal.hfSave = document.getElementById("evtSave");
     cal.hfDel = document.getElementById("evtDel");
 
@@ -119,11 +124,34 @@ var cal = {
     cal.sF = parseInt(String(cal.sYear) + String(m) + "010000");
     cal.sL = parseInt(String(cal.sYear) + String(m) + String(cal.sDIM) + "2359");
 
-    // (E2) AJAX GET EVENTS
-    cal.ajax("get", { month : cal.sMth, year : cal.sYear, userID : cal.sUserID }, evt => {
-      cal.events = JSON.parse(evt);
+    // (E2) GET EVENTS FOR [1ST OF MONTH, 1ST OF NEXT MONTH)
+    // the browser revalidates with the ETag, an unchanged month is a 304
+    let next = cal.sMth==12 ? [cal.sYear+1, 1] : [cal.sYear, cal.sMth+1],
+        pad = n => String(n).padStart(2, "0"),
+        from = cal.sYear + "-" + pad(cal.sMth) + "-01",
+        to = next[0] + "-" + pad(next[1]) + "-01";
+    cal.listen(from, to);
+    fetch("events/?" + new URLSearchParams({
+      userID : cal.sUserID, from : from, to : to, format : "columns"
+    }))
+    .then(res => res.json())
+    .then(res => {
+      cal.events = cal.unpack(res.events, cal.sUserID);
       cal.draw();
-    });
+      cal.heat(from, to);
+    })
+    .catch(err => console.error(err));
+  },
+
+  // (E3) COLUMNAR EVENTS TO OBJECTS
+  // {id:[], s:[], e:[], t:[], p:[], palette:[[c, b]]} as sent with format=columns
+  unpack : (cols, uid) => {
+    let events = {};
+    for (let i=0; i<cols.id.length; i++) {
+      let [c, b] = cols.palette[cols.p[i]];
+      events[cols.id[i]] = { s : cols.s[i], e : cols.e[i], t : cols.t[i], c : c, b : b, uid : uid };
+    }
+    return events;
   },
 
   // (F) DRAW CALENDAR
@@ -161,6 +189,7 @@ var cal = {
       rowB.appendChild(cell);
       cell = document.createElement("div");
       cell.className = "calCell";
+      if (day) { cell.dataset.day = day; }
       if (day===undefined) { cell.classList.add("calBlank"); }
       if (day!==undefined && day==nowDay) { cell.classList.add("calToday"); }
       rowC.appendChild(cell);
@@ -248,11 +277,15 @@ var cal = {
       cal.hfUID.value = cal.events[id]["uid"];
       cal.hfSave.value = "Update";
       cal.hfDel.style.display = "inline-block";
+      // editing one occurrence of a series turns it into a single booking
+      cal.hfRepeat.value = "";
+      cal.hfRepeat.disabled = cal.hfUntil.disabled = true;
     } else {
       cal.hForm.reset();
       cal.hfID.value = "";
       cal.hfSave.value = "Book";
       cal.hfDel.style.display = "none";
+      cal.hfRepeat.disabled = cal.hfUntil.disabled = false;
     }
     cal.hFormWrap.show();
   },
@@ -271,7 +304,8 @@ var cal = {
       b : cal.hfBG.value,
       uid : cal.hfUID.value
     };
-    if (cal.hfID.value != "") { data.id = parseInt(cal.hfID.value); }
+    // series occurrences have string ids "s<series>:<start>"
+    if (cal.hfID.value != "") { data.id = cal.hfID.value; }
 
     // (H2) DATE CHECK
     if (new Date(data.s) > new Date(data.e)) {
@@ -280,7 +314,18 @@ var cal = {
     }
 
     // (H3) SAVE
-    cal.ajax("save", data, res => {
+    // a repeating booking is stored once as a series, the server expands it
+    let req = "save";
+    if (cal.hfRepeat.value != "" && cal.hfID.value == "") {
+      if (cal.hfUntil.value == "") {
+        alert("Pick the last day the booking repeats on!");
+        return false;
+      }
+      req = "saveSeries";
+      data.freq = cal.hfRepeat.value;
+      data.until = cal.hfUntil.value;
+    }
+    cal.ajax(req, data, res => {
       if (res=="OK") {
         cal.hFormWrap.close();
         cal.load();
@@ -291,12 +336,46 @@ var cal = {
 
   // (I) DELETE EVENT
   del : () => { if (confirm("Delete Event?")) {
-    cal.ajax("delete", { id : parseInt(cal.hfID.value) }, res => {
+    cal.ajax("delete", { id : cal.hfID.value }, res => {
       if (res=="OK") {
         cal.hFormWrap.close();
         cal.load();
       } else { alert(res); }
     });
-  }}
+  }},
+
+  // (J) OCCUPANCY HEATMAP
+  // shade every day by how much of it the rink is taken, hover for the hours
+  heat : (from, to) => {
+    fetch("occupancy/?" + new URLSearchParams({ from : from, to : to }))
+    .then(res => res.json())
+    .then(res => {
+      for (let [day, hours] of Object.entries(res.days)) {
+        let cell = cal.hCB.querySelector(".calRowBack [data-day='" + parseInt(day.slice(8)) + "']");
+        if (!cell || day.slice(0, 7) != from.slice(0, 7)) { continue; }
+        let used = hours.reduce((a, b) => a + b, 0);
+        cell.style.backgroundColor = "rgba(59, 57, 175, " + (used / 1440 * 0.6).toFixed(2) + ")";
+        cell.title = (used / 60).toFixed(1) + "h of 24h booked";
+      }
+    })
+    .catch(err => console.error(err));
+  },
+
+  // (K) LIVE UPDATES
+  // the server pushes every booking change in the selected month, reload
+  // when one arrives instead of waiting for the next month change
+  listen : (from, to) => {
+    if (!window.EventSource || cal.streamRange == from + to) { return; }
+    if (cal.stream) { cal.stream.close(); }
+    cal.streamRange = from + to;
+    cal.stream = new EventSource("stream/?" + new URLSearchParams({ from : from, to : to }));
+    let reload = () => {
+      // a burst of changes reloads once
+      clearTimeout(cal.streamTimer);
+      cal.streamTimer = setTimeout(cal.load, 250);
+    };
+    cal.stream.addEventListener("booking", reload);
+    cal.stream.addEventListener("reset", reload);
+  }
 };
 window.onload = cal.init;
\ No newline at end of file
@@ -0,0 +1,72 @@
+# (A) LOAD MODULES
+import collections, threading, time
+from Repository import UserProfile
+
+# (B) CACHED USER
+# the profile Repository.UserRepository reads, never the password hash
+CachedUser = UserProfile
+
+
+class UserCache():
+  """
+  LRU cache of user profiles keyed by UID, entries expire after ttl seconds.
+  Account changes must call invalidate() (models.py does this for ad hoc ORM
+  updates and deletes) so a stale name is never shown for longer than the ttl.
+  """
+
+  def __init__(self, maxSize=1024, ttl=300):
+    self.maxSize = maxSize
+    self.ttl = ttl
+    self.entries = collections.OrderedDict()
+    self.lock = threading.Lock()
+    self.hits = 0
+    self.misses = 0
+
+  def get(self, uid, loader):
+    """
+    Cached profile for uid, calling loader(uid) on a miss
+    :param uid: user id
+    :param loader: returns a CachedUser or None if the user does not exist
+    :return: CachedUser or None
+    """
+    now = time.monotonic()
+    with self.lock:
+      entry = self.entries.get(uid)
+      if entry is not None and entry[1] > now:
+        self.entries.move_to_end(uid)
+        self.hits += 1
+        return entry[0]
+      self.misses += 1
+    user = loader(uid)
+    if user is not None:
+      self.put(user)
+    return user
+
+  def put(self, user):
+    """
+    Store a profile, e.g. straight after login when the row was just read
+    :param user: CachedUser
+    :return: None
+    """
+    with self.lock:
+      self.entries[user.UID] = (user, time.monotonic() + self.ttl)
+      self.entries.move_to_end(user.UID)
+      while len(self.entries) > self.maxSize:
+        self.entries.popitem(last=False)
+
+  def invalidate(self, uid):
+    with self.lock:
+      self.entries.pop(uid, None)
+
+  def clear(self):
+    with self.lock:
+      self.entries.clear()
+      self.hits = 0
+      self.misses = 0
+
+  def stats(self):
+    """
+    :return: dict with hits, misses and current size
+    """
+    with self.lock:
+      return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
@@ -1,44 +1,59 @@
-from app import app
-from datetime import timedelta
-from flask import render_template, request, redirect, url_for, make_response, session, jsonify, flash
-from app.models import Users
+from app import app, userDB, userCache, pageCache, loginLimiter
+from datetime import datetime, timedelta
+from flask import render_template, request, redirect, url_for, make_response, session, jsonify, flash, g, Response
 from DBUserHandler import DBHandler
 from exceptions import *
 import sqlite3
 import sys
 from app import S2_lib as evt
+from app import pubsub, wire
+import time
+import Instrumentation
+
+def fetchUser(userID):
+    return None if userDB is None else userDB.users.profile(userID)
+
+def loadUser():
+    """
+    Profile of the logged in user for this request (None when logged out), served from userCache
+    so page renders do not query Users in the steady state
+    """
+    if "user" not in g:
+        g.user = None
+        if "userID" in session.keys():
+            g.user = userCache.get(session["userID"], fetchUser)
+    return g.user
 
 @app.route("/")
 def index():
-    if "userID" in session.keys():
-        userID = session["userID"]
-        user = Users.query.filter_by(UID=userID).first()
+    user = loadUser()
+    if user:
         message = f'Welcome, { user.FirstName }!'
         return render_template('times.html', message=message, user=user)
     return render_template("login.html")
 
+def cachedPage(name):
+    """
+    A page that is the same for every visitor, logged in or not, from pageCache. Browsers revalidate with the ETag
+    """
+    body, etag = pageCache.get(name)
+    response = make_response(body)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
+
 @app.route("/pricing")
 def pricing():
-    if "userID" in session.keys():
-        userID = session["userID"]
-        user = Users.query.filter_by(UID=userID).first()
-        return render_template("pricing.html", user=user)
-    return render_template("pricing.html")
+    return cachedPage("pricing.html")
 
 @app.route("/information")
 def information():
-    if "userID" in session.keys():
-        userID = session["userID"]
-        user = Users.query.filter_by(UID=userID).first()
-        return render_template("information.html", user=user)
-    return render_template("information.html")
+    return cachedPage("information.html")
 
 @app.route("/times")
 def times():
-    userID = None
-    if "userID" in session.keys():
-        userID = session["userID"]
-        user = Users.query.filter_by(UID=userID).first()
+    user = loadUser()
+    if user:
         message = f'Welcome, { user.FirstName }!'
         return render_template('times.html', message=message, user=user)
     return render_template("times.html")
@@ -46,17 +61,36 @@ def times():
 @app.route("/login", methods=['POST'])
 def login():
     form = request.form
-    user = Users.query.filter_by(Username=form['username']).first()
     message = None
+    # refused before the user is looked up or a password hashed, so a flood of guesses costs next to nothing
+    wait = loginLimiter.attempt(form['username'], request.remote_addr)
+    if wait:
+        message = f'Too many login attempts, please try again in {wait} seconds.'
+        response = make_response(render_template('login.html', message=message), 429)
+        response.headers['Retry-After'] = str(wait)
+        return response
     try:
-        if not user:
+        if userDB is None:
+            raise FileNotFoundError("Database file not found in base program directory")
+        # profile and hash come back from one query
+        try:
+            user = userDB.login(form['password'], Username=form['username'])
+        except ValueError:
+            loginLimiter.failed(form['username'])
             message = 'Username doesn\'t exist.'
             return render_template('login.html', message=message)
-        if user.check_password(form['password'], form['username']):
+        if user is not None:
+            loginLimiter.succeeded(form['username'])
+            # a new session id, one planted before the login is never authenticated.
+            # a signed cookie session (SessionBenchmark.py) has no id to plant
+            if hasattr(session, 'regenerate'):
+                session.regenerate()
             session['userID'] = user.UID
+            userCache.put(user)
             message = f'Welcome, { user.FirstName }!'
             return render_template('times.html', message=message, user=user)
         else:
+            loginLimiter.failed(form['username'])
             message = 'Incorrect Password.'
             return render_template('login.html', message=message)
     except FileNotFoundError as e:
@@ -71,6 +105,10 @@ def login():
         print(e)
         message = 'Password must be between 6 and 20 characters and contain at least 1 uppercase letter, 1 lowercase letter, 1 number and 1 special character.'
         return render_template('login.html', message=message)
+    except HashingBusyException as e:
+        print(e)
+        message = 'Server Busy, Please Try Again.'
+        return make_response(render_template('login.html', message=message), 503)
 
 @app.route("/accountCreated", methods=['POST','GET'])
 def accountCreated():
@@ -85,7 +123,9 @@ def createAccount():
         password = request.form['password']
         email = request.form['email']
         try:
-            db = DBHandler()
+            db = userDB
+            if db is None:
+                raise FileNotFoundError("Database file not found in base program directory")
             if db.insertNewUserData(firstname, lastname, username, email, password):
                 return redirect(url_for('accountCreated'))
         except FileNotFoundError as e:
@@ -100,6 +140,9 @@ def createAccount():
         except sqlite3.DataError as e:
             print(e)
             return render_template("createAccount.html")
+        except HashingBusyException as e:
+            print(e)
+            return make_response(render_template("createAccount.html"), 503)
     else:
         return render_template("createAccount.html")
 
@@ -110,18 +153,46 @@ def logout():
     return render_template("login.html", message=message)
 
 # (B2) ENDPOINT - GET EVENTS
+# format=columns answers in the columnar layout of app/wire.py, both layouts
+# are compressed when the client accepts it. resource=<id> limits the month
+# to one rink or room.
 @app.route("/get/", methods=["POST"])
 def get():
   data = dict(request.form)
-  events = evt.get(int(data["month"]), int(data["year"]), int(data["userID"]))
-  return "{}" if events is None else events
+  try:
+    month, year, userID = int(data["month"]), int(data["year"]), int(data["userID"])
+    resource = int(data["resource"]) if data.get("resource") else None
+    if data.get("format") == "columns":
+      body, headers = wire.encode(evt.getColumns(month, year, userID, resource), request.headers.get("Accept-Encoding"))
+      return make_response(body, 200, headers)
+    events = evt.get(month, year, userID, resource)
+  except (KeyError, ValueError) as e:
+    return make_response(f'Bad Request: {e}', 400)
+  except sqlite3.OperationalError as e:
+    print(e)
+    return make_response('Server Busy, Please Try Again', 503)
+  return "{}" if events is None else compressed(jsonify(wire.objects(events)))
+
+def compressed(response):
+  body, headers = wire.compress(response.get_data(), request.headers.get("Accept-Encoding"))
+  response.set_data(body)
+  response.headers.extend(headers)
+  return response
 
 # (B3) ENDPOINT - SAVE EVENT
+# r is the resource booked, the main rink if left out
 @app.route("/save/", methods=["POST"])
 def save():
   data = dict(request.form)
   print(data)
-  ok = evt.save(data["s"], data["e"], data["t"], data["c"], data["b"], data["uid"], data["id"] if "id" in data else None)
+  try:
+    ok = evt.save(data["s"], data["e"], data["t"], data["c"], data["b"], data["uid"], data["id"] if "id" in data else None,
+                  data.get("r") or evt.DEFAULT_RESOURCE)
+  except sqlite3.OperationalError as e:
+    print(e)
+    return make_response('Server Busy, Please Try Again', 503)
+  except ValueError as e:
+    return make_response(f'Bad Request: {e}', 400)
   msg = 'OK' if ok else 'Time Conflict'
   return make_response(msg, 200)
 
@@ -134,10 +205,228 @@ def delete():
   return make_response(msg, 200)
 
 
+# (B5) ENDPOINT - GET EVENTS IN A RANGE
+# GET /events/?userID=&from=&to= returns {"rev", "events": [[id, s, e, t, c, b]...]}
+# adding &since=<rev> returns only bookings changed after that revision plus
+# the ids deleted since in "deleted". the ETag is the user's revision, so an
+# unchanged calendar answers 304 after a single primary key lookup.
+# &format=columns sends events in the columnar layout of app/wire.py and
+# &resource=<id> only that rink or room's bookings.
+@app.route("/events/", methods=["GET"])
+def events():
+  args = request.args
+  try:
+    userID = int(args["userID"])
+    since = evt.parseSince(args["since"]) if "since" in args else None
+    resource = evt.checkResource(args["resource"]) if args.get("resource") else None
+    columnar = args.get("format") == "columns"
+    start = end = None
+    if since is None:
+      start = datetime.fromisoformat(args["from"]).strftime("%Y-%m-%d %H:%M")
+      end = datetime.fromisoformat(args["to"]).strftime("%Y-%m-%d %H:%M")
+  except (KeyError, ValueError) as e:
+    return make_response(f'Bad Request: {e}', 400)
+
+  # read the revision first, rows saved meanwhile are simply sent again next sync
+  rev = evt.revision(userID, resource)
+  etag = str(rev)
+  if request.if_none_match.contains(etag):
+    response = make_response('', 304)
+  else:
+    rows, deleted = evt.getRange(start, end, userID, since, resource)
+    payload = {"rev": rev, "events": wire.columns(rows) if columnar else rows}
+    if since is not None:
+      payload["deleted"] = deleted
+    if columnar:
+      body, headers = wire.encode(payload, request.headers.get("Accept-Encoding"))
+      response = make_response(body, 200, headers)
+    else:
+      response = compressed(jsonify(payload))
+  response.set_etag(etag)
+  response.headers["Cache-Control"] = "private, no-cache"
+  return response
+
+# (B6) ENDPOINT - SAVE RECURRING SERIES
+# same fields as /save/ plus freq (DAILY/WEEKLY), interval, byday ("0,2,4",
+# monday is 0) and until (YYYY-MM-DD) or count
+@app.route("/saveSeries/", methods=["POST"])
+def saveSeries():
+  data = dict(request.form)
+  try:
+    seriesID = evt.saveSeries(data["s"], data["e"], data["t"], data["c"], data["b"], data["uid"],
+                              data.get("freq", "WEEKLY"), data.get("interval", 1), data.get("byday"),
+                              data.get("until"), data.get("count"))
+  except (KeyError, ValueError) as e:
+    return make_response(f'Bad Request: {e}', 400)
+  except sqlite3.OperationalError as e:
+    print(e)
+    return make_response('Server Busy, Please Try Again', 503)
+  return make_response('Time Conflict' if seriesID is False else 'OK', 200)
+
+# (B7) ENDPOINT - DELETE RECURRING SERIES
+# a single occurrence is cancelled through /delete/ with its "s<series>:<start>" id
+@app.route("/deleteSeries/", methods=["POST"])
+def deleteSeries():
+  data = dict(request.form)
+  try:
+    ok = evt.deleteSeries(int(data["id"]))
+  except (KeyError, ValueError) as e:
+    return make_response(f'Bad Request: {e}', 400)
+  except sqlite3.OperationalError as e:
+    print(e)
+    return make_response('Server Busy, Please Try Again', 503)
+  return make_response("OK" if ok else "Not Found", 200)
+
+# (B11) ENDPOINT - OCCUPANCY HEATMAP
+# GET /occupancy/?from=YYYY-MM-DD&to=YYYY-MM-DD returns {"days": {day: [minutes taken in each hour]}}
+@app.route("/occupancy/", methods=["GET"])
+def occupancy():
+  args = request.args
+  try:
+    first, last = datetime.strptime(args["from"], "%Y-%m-%d"), datetime.strptime(args["to"], "%Y-%m-%d")
+    if not timedelta(days=1) <= last - first <= timedelta(days=366):
+      raise ValueError("the range must cover 1 to 366 days")
+    days = evt.occupancyMap(first.date().isoformat(), last.date().isoformat())
+  except (KeyError, ValueError) as e:
+    return make_response(f'Bad Request: {e}', 400)
+  except sqlite3.OperationalError as e:
+    print(e)
+    return make_response('Server Busy, Please Try Again', 503)
+  response = jsonify({"days": days})
+  response.headers["Cache-Control"] = "private, no-cache"
+  return response
+
+# (B12) ENDPOINT - LIVE CALENDAR CHANGES
+# GET /stream/?from=YYYY-MM-DD&to=YYYY-MM-DD is a Server-Sent Events stream of
+# the booking changes overlapping the range, see app/pubsub.py. the browser
+# reconnects by itself and sends Last-Event-ID to get what it missed. each
+# open stream holds one server thread here, app/asgi.py serves it without.
+@app.route("/stream/", methods=["GET"])
+def stream():
+  try:
+    first, last = pubsub.parseRange(request.args)
+  except (KeyError, ValueError) as e:
+    return make_response(f'Bad Request: {e}', 400)
+  subscription = pubsub.broker.subscribe(first, last, pubsub.parseSince(request.headers.get("Last-Event-ID")))
+  if subscription is None:
+    return make_response('Server Busy, Please Try Again', 503)
+
+  def events():
+    try:
+      yield pubsub.OPENING
+      while True:
+        yield pubsub.formatAll(subscription.wait(pubsub.KEEPALIVE)) or pubsub.PING
+    finally:
+      pubsub.broker.unsubscribe(subscription)
+
+  response = Response(events(), mimetype="text/event-stream")
+  response.headers["Cache-Control"] = "no-cache"
+  response.headers["X-Accel-Buffering"] = "no"
+  return response
+
+# (B13) ENDPOINT - RESOURCES
+# [[id, name]...] of the rinks and rooms a booking can hold, for /save/'s r
+@app.route("/resources/", methods=["GET"])
+def resources():
+  return jsonify(evt.resources())
+
+# (B8) ENDPOINT - CREATE SKATE SESSION
+# a session holds the rink like a booking but takes up to `capacity` reservations
+@app.route("/sessions/", methods=["POST"])
+def saveSession():
+  data = dict(request.form)
+  try:
+    sessionID = evt.saveSession(data["s"], data["e"], data.get("t", "Public Skate"), data["capacity"])
+  except (KeyError, ValueError) as e:
+    return make_response(f'Bad Request: {e}', 400)
+  except sqlite3.OperationalError as e:
+    print(e)
+    return make_response('Server Busy, Please Try Again', 503)
+  return make_response('Time Conflict' if sessionID is False else 'OK', 200)
+
+# (B9) ENDPOINT - SESSION AVAILABILITY
+# GET /availability/?month=&year=[&userID=] returns {"sessions": [[id, s, e, t, capacity, remaining, mine]...]}
+@app.route("/availability/", methods=["GET"])
+def availability():
+  args = request.args
+  try:
+    month, year = int(args["month"]), int(args["year"])
+    userID = int(args["userID"]) if "userID" in args else None
+    sessions = evt.availability(month, year, userID)
+  except (KeyError, ValueError) as e:
+    return make_response(f'Bad Request: {e}', 400)
+  response = jsonify({"sessions": sessions})
+  response.headers["Cache-Control"] = "private, no-cache"
+  return response
+
+# (B10) ENDPOINT - RESERVE / CANCEL SEATS IN A SESSION
+@app.route("/reserve/", methods=["POST"])
+def reserve():
+  data = dict(request.form)
+  try:
+    left = evt.reserve(int(data["sessionID"]), int(data["uid"]), int(data.get("seats", 1)))
+  except (KeyError, ValueError) as e:
+    return make_response(f'Bad Request: {e}', 400)
+  except sqlite3.OperationalError as e:
+    print(e)
+    return make_response('Server Busy, Please Try Again', 503)
+  return make_response('Session Full' if left is False else 'OK', 200)
+
+@app.route("/cancelReservation/", methods=["POST"])
+def cancelReservation():
+  data = dict(request.form)
+  try:
+    ok = evt.cancelReservation(int(data["sessionID"]), int(data["uid"]))
+  except (KeyError, ValueError) as e:
+    return make_response(f'Bad Request: {e}', 400)
+  except sqlite3.OperationalError as e:
+    print(e)
+    return make_response('Server Busy, Please Try Again', 503)
+  return make_response("OK" if ok else "Not Found", 200)
+
+
 @app.before_request
 def before_request():
-    session.permanent = True
-    app.permanent_session_lifetime = timedelta(minutes=30)
+    if Instrumentation.ENABLED:
+        g.requestStarted = time.perf_counter()
+
+
+@app.url_defaults
+def staticVersion(endpoint, values):
+    if endpoint == "static" and "v" not in values:
+        version = pageCache.staticVersion(values["filename"])
+        if version is not None:
+            values["v"] = version
+
+
+@app.after_request
+def after_request(response):
+    # a static file asked for by its current version never changes at that url, anything else revalidates
+    if request.endpoint == "static" and response.status_code in (200, 304) and request.args.get("v") is not None:
+        if request.args["v"] == pageCache.staticVersion(request.view_args["filename"]):
+            response.headers["Cache-Control"] = f"public, max-age={app.config['STATIC_MAX_AGE']}, immutable"
+    g.responseStatus = response.status_code
+    return response
+
+
+@app.teardown_request
+def teardown_request(exc):
+    # also runs for requests that raise, which after_request never sees
+    if Instrumentation.ENABLED and "requestStarted" in g:
+        status = 500 if exc is not None else g.get("responseStatus", 500)
+        Instrumentation.observeRequest(request.endpoint or "unmatched", request.method, status,
+                                       time.perf_counter() - g.requestStarted)
+
+
+# Prometheus text format, only served while config.METRICS is on
+@app.route("/metrics")
+def metrics():
+    if not Instrumentation.ENABLED:
+        return make_response("Not Found", 404)
+    response = make_response(Instrumentation.render(), 200)
+    response.headers["Content-Type"] = "text/plain; version=0.0.4; charset=utf-8"
+    response.headers["Cache-Control"] = "no-store"
+    return response
 
 
 @app.route("/booking")
@@ -0,0 +1,98 @@
+# (A) LOAD MODULES
+import gzip, json
+try:
+  import orjson
+except ImportError:
+  orjson = None
+try:
+  import brotli
+except ImportError:
+  brotli = None
+
+# (B) COLUMNAR EVENTS
+# /get/ and /events/ can answer with parallel arrays instead of one object
+# per event: {"id": [..], "s": [..], "e": [..], "t": [..], "p": [..],
+# "palette": [[color, bg]..]} where p[i] indexes the palette, so the
+# (color, bg) pair every booking repeats is sent once. S4B_calendar.js
+# cal.unpack() turns it back into the cal.events objects.
+def columns(rows):
+  """
+  :param rows: [id, start, end, text, color, bg, ...] rows, extra columns are ignored
+  :return: columnar dict, see above
+  """
+  if not rows:
+    return {"id": [], "s": [], "e": [], "t": [], "p": [], "palette": []}
+  ids, starts, ends, texts, colors, bgs = list(zip(*rows))[:6]
+  palette, index, p = [], {}, []
+  for pair in zip(colors, bgs):
+    n = index.get(pair)
+    if n is None:
+      n = index[pair] = len(palette)
+      palette.append(pair)
+    p.append(n)
+  return {"id": ids, "s": starts, "e": ends, "t": texts, "p": p, "palette": palette}
+
+
+# (C) SERIALIZE
+# orjson when installed, it is several times faster on these big arrays,
+# otherwise compact stdlib json. both send the same JSON, not the same bytes.
+_encoder = json.JSONEncoder(separators=(",", ":"), check_circular=False)
+
+def dumps(payload):
+  if orjson is not None:
+    return orjson.dumps(payload)
+  return _encoder.encode(payload).encode()
+
+# the object layout of S2_lib.get keyed by id. JSON keys are strings anyway,
+# and integer booking ids next to "s<series>:<start>" ids cannot be sorted
+def objects(events):
+  return {str(id): event for id, event in events.items()}
+
+
+# (D) COMPRESSION
+# negotiated on Accept-Encoding, br when the brotli package is installed,
+# then gzip. bodies under MIN_BYTES are sent as is, compressing them costs
+# more than it saves.
+MIN_BYTES = 1024
+LEVEL = 6
+
+def configure(minBytes, level):
+  global MIN_BYTES, LEVEL
+  MIN_BYTES = minBytes
+  LEVEL = level
+
+def negotiate(acceptEncoding):
+  """
+  :param acceptEncoding: Accept-Encoding header value, or None
+  :return: "br", "gzip" or None for identity
+  """
+  if not acceptEncoding:
+    return None
+  # only requests negotiate, S2_lib importers like BulkTransfer.py never load werkzeug
+  from werkzeug.http import parse_accept_header
+  accepted = parse_accept_header(acceptEncoding)
+  offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+  best = max(offered, key=lambda coding: accepted.quality(coding))
+  return best if accepted.quality(best) > 0 else None
+
+def compress(body, acceptEncoding):
+  """
+  :return: (body, headers) with headers to add to the response
+  """
+  coding = negotiate(acceptEncoding) if len(body) >= MIN_BYTES else None
+  if coding == "br":
+    body = brotli.compress(body, quality=min(LEVEL, 11))
+  elif coding == "gzip":
+    body = gzip.compress(body, compresslevel=LEVEL, mtime=0)
+  headers = [("Vary", "Accept-Encoding")]
+  if coding is not None:
+    headers.append(("Content-Encoding", coding))
+  return body, headers
+
+def encode(payload, acceptEncoding):
+  """
+  Columnar JSON response
+  :return: (body, headers), Content-Type included
+  """
+  body, headers = compress(dumps(payload), acceptEncoding)
+  return body, [("Content-Type", "application/json")] + headers
@@ -1 +1,42 @@
-DEBUG=False
\ No newline at end of file
+DEBUG=False
+# keep booked slots in an in-process interval index (single writer process only)
+CONFLICT_INDEX=False
+# password hashing pool, see PasswordHasher.py
+HASH_ROUNDS=29000
+HASH_WORKERS=2
+HASH_QUEUE_LIMIT=16
+HASH_PROCESSES=False
+# logged in user profiles kept in memory, see app/usercache.py
+USER_CACHE_SIZE=1024
+USER_CACHE_TTL=300
+# request, section and SQL timings served at /metrics, see Instrumentation.py
+METRICS=False
+SLOW_QUERY_MS=50
+# python run.py --asgi, see app/asgi.py. each worker process has its own pool of DB threads
+ASGI_WORKERS=2
+ASGI_DB_THREADS=4
+# open /stream/ connections allowed per process, each holds a thread under run.py, see app/pubsub.py
+STREAM_MAX_SUBSCRIBERS=500
+# /get/ and /events/ bodies at least this big are gzip (or br) compressed when the client accepts it, see app/wire.py
+COMPRESS_MIN_BYTES=1024
+COMPRESS_LEVEL=6
+# pricing and information are rendered once and re-rendered when a template changes, see app/pagecache.py
+PAGE_CACHE=True
+# seconds browsers may keep a static file requested with its current ?v= version
+STATIC_MAX_AGE=31536000
+# /login attempts per address and failed logins per username allowed in any LOGIN_LIMIT_SECONDS, see app/ratelimit.py
+LOGIN_RATE_LIMIT=True
+LOGIN_LIMIT_USER=5
+LOGIN_LIMIT_ADDRESS=30
+LOGIN_LIMIT_SECONDS=300
+LOGIN_LIMIT_KEYS=100000
+# database file to share the counts between worker processes, None keeps them in each process
+LOGIN_LIMIT_DB=None
+# server side sessions, see app/sessionstore.py. seconds a login lasts after it was last extended
+PERMANENT_SESSION_LIFETIME=1800
+SESSION_STORE_SIZE=10000
+# database file to share sessions between worker processes (needed for run.py --asgi with more than one worker), None keeps them in this process
+SESSION_DB=None
+# bookings of every resource but the main rink in a database file per resource, so saves on different rinks never wait
+# for one write lock, see app/S2_lib.py. their ids become "r<resource>:<id>"
+BOOKING_SHARDS=False
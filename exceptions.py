@@ -9,16 +9,25 @@ Created for CSI2999 Polyrhythm Skate semester project
 
 Change Log:
 5/27/2023 Initial version
+10/18/2026 Added HashingBusyException for the password hashing pool
+10/18/2026 Input exceptions carry the InputValidator.FieldError list of the fields that failed
 
 Future Task List:
 -
 """
 class BadPasswordException(Exception):
-    """Password does not meet requirements defined in DBUserHandler.py"""
-    def __init__(self, arg):
+    """Password does not meet requirements defined in InputValidator.py"""
+    def __init__(self, arg, errors=()):
         super().__init__(arg)
+        self.errors = list(errors)
 
 class UnsanitaryInputException(Exception):
-    """Input contains illegal characters. See requirements in DBUserHandler.py"""
+    """Input contains illegal characters. See requirements in InputValidator.py"""
+    def __init__(self, arg, errors=()):
+        super().__init__(arg)
+        self.errors = list(errors)
+
+class HashingBusyException(Exception):
+    """Password hashing pool is full. See PasswordHasher.py"""
     def __init__(self, arg):
         super().__init__(arg)
@@ -1,4 +1,24 @@
-from app import app
+import argparse, sys
+import config
+from app import createApp
 
 if __name__ == '__main__':
-    app.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Run the Polyrhythm Skate site')
+    parser.add_argument('--asgi', action='store_true', help='serve app.asgi:application with uvicorn instead of the Flask server')
+    parser.add_argument('--workers', type=int, default=config.ASGI_WORKERS, help='uvicorn worker processes')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    args = parser.parse_args()
+    if args.asgi:
+        try:
+            import uvicorn
+        except ImportError:
+            sys.exit('ASGI mode needs uvicorn, pip install -r requirements.txt')
+        if args.workers > 1 and config.SESSION_DB is None:
+            # each worker would only know the logins it served itself
+            print('SESSION_DB is not set in config.py, serving with one worker', file=sys.stderr)
+            args.workers = 1
+        # every worker builds its own app when it imports app.asgi, this process only supervises them
+        uvicorn.run('app.asgi:application', host=args.host, port=args.port, workers=args.workers, lifespan='on')
+    else:
+        createApp().run(host=args.host, port=args.port)